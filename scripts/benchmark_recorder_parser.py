@@ -0,0 +1,126 @@
+"""
+Бенчмарк разбора записей Playwright Recorder и генерации скриптов
+
+Строит большую синтетическую запись (вопросы с heading, fill из data_row,
+#pause / #optional / #retry, popup, xpath локаторы) и замеряет:
+- parse_recording: холодный кеш и повторный разбор
+- generate_script каждого провайдера: холодный кеш разбора и повторная генерация
+
+Запуск:
+    python scripts/benchmark_recorder_parser.py
+    python scripts/benchmark_recorder_parser.py --questions 1500 --repeat 5
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Добавляем путь к модулям проекта
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.providers.recorder_ir import clear_caches, parse_recording
+
+
+PROVIDERS = ['smart_dynamic', 'smart_wf', 'smart_no_api']
+
+HEADER = '''import re
+from playwright.sync_api import Playwright, sync_playwright, expect
+
+
+def run(playwright: Playwright) -> None:
+    browser = playwright.chromium.launch(headless=False)
+    context = browser.new_context()
+    page = context.new_page()
+    page.goto("https://example.com/start")
+    page.get_by_role("button", name="Get started").click()'''
+
+FOOTER = '''
+    # ---------------------
+    context.close()
+    browser.close()
+
+
+with sync_playwright() as playwright:
+    run(playwright)'''
+
+
+def build_recording(questions: int) -> str:
+    """Синтетическая запись: questions вопросов + popup с тем же числом действий"""
+    lines = [HEADER]
+    for q in range(questions):
+        lines.append(f'    page.get_by_role("heading", name="Question {q}: what\'s your answer?").click()')
+        if q % 3 == 0:
+            lines.append(f'    page.get_by_role("textbox", name="Field {q}").fill(data_row["Field{q}"])')
+            lines.append(f'    page.get_by_role("textbox", name="Field {q}").press("Tab")')
+        elif q % 3 == 1:
+            lines.append(f'    page.locator("xpath=//div[@id=\'q{q}\']//input").fill("value {q}")  # заполнить')
+        else:
+            lines.append(f'    page.get_by_test_id("option-{q}").click()')
+        if q % 10 == 0:
+            lines.append('    #pause2')
+        lines.append('    page.get_by_role("button", name="Next").click()')
+
+    lines.append('    #auto_conditional_popup')
+    lines.append('    with page.expect_popup() as page1_info:')
+    lines.append('        page.get_by_role("button", name="See offers").click()')
+    lines.append('    page1 = page1_info.value')
+    for q in range(questions):
+        if q % 4 == 0:
+            lines.append('    #optional')
+        elif q % 4 == 1:
+            lines.append('    #retry:3:10')
+        lines.append(f'    page1.get_by_role("button", name="Offer {q}").click()')
+        lines.append(f'    page1.locator("#input-{q}").fill("v{q}")  #pause1')
+    lines.append(FOOTER)
+    return '\n'.join(lines)
+
+
+def measure(func, repeat: int, cold: bool) -> float:
+    """Лучшее время из repeat запусков (cold - со сбросом кешей разбора перед каждым)"""
+    best = None
+    for _ in range(repeat):
+        if cold:
+            clear_caches()
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк разбора записей Playwright Recorder')
+    parser.add_argument('--questions', type=int, default=1000, help='Число вопросов в синтетической записи')
+    parser.add_argument('--repeat', type=int, default=5, help='Число повторов (берется лучшее время)')
+    args = parser.parse_args()
+
+    code = build_recording(args.questions)
+    print("=" * 60)
+    print(f"ЗАПИСЬ: {len(code.splitlines())} строк, {args.questions} вопросов")
+    print("=" * 60)
+
+    cold = measure(lambda: parse_recording(code).sections(), args.repeat, cold=True)
+    warm = measure(lambda: parse_recording(code).sections(), args.repeat, cold=False)
+    print(f"{'parse_recording':<32} cold {cold * 1000:8.1f} ms   warm {warm * 1000:8.2f} ms")
+
+    config = {'api_token': 'benchmark'}
+    for provider in PROVIDERS:
+        generator = importlib.import_module(f'src.providers.{provider}.generator').Generator()
+
+        def generate():
+            # Генераторы печатают отладку разбора - в бенчмарке она не нужна
+            with contextlib.redirect_stdout(io.StringIO()):
+                generator.generate_script(code, config)
+
+        cold = measure(generate, args.repeat, cold=True)
+        warm = measure(generate, args.repeat, cold=False)
+        print(f"{provider + '.generate_script':<32} cold {cold * 1000:8.1f} ms   warm {warm * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
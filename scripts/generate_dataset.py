@@ -0,0 +1,64 @@
+"""
+Генерация большого тестового набора данных в CSV (для нагрузочных прогонов)
+
+Колонки задаются заголовками (типы определяются как в Smart Fill) или берутся
+из существующего CSV. Строки пишутся в файл блоками по мере генерации.
+С одинаковым --seed результат повторяется при любом --workers.
+
+Запуск:
+    python scripts/generate_dataset.py --headers email first_name phone city --rows 100000 -o leads.csv
+    python scripts/generate_dataset.py --like data/leads.csv --rows 100000 --seed 42 --workers 4 -o leads.csv
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from pathlib import Path
+
+# Добавляем путь к модулям проекта
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.data_parser import SmartDataParser
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация тестового CSV для нагрузочных прогонов")
+    columns = parser.add_mutually_exclusive_group(required=True)
+    columns.add_argument('--headers', nargs='+', help="Заголовки колонок")
+    columns.add_argument('--like', help="CSV, из которого взять заголовки")
+    parser.add_argument('--rows', type=int, default=100000, help="Количество строк (по умолчанию 100000)")
+    parser.add_argument('--seed', type=int, default=None, help="Seed для воспроизводимого набора")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Процессов генерации")
+    parser.add_argument('-o', '--output', required=True, help="Путь к итоговому CSV")
+    args = parser.parse_args()
+
+    if args.like:
+        with open(args.like, 'r', encoding='utf-8-sig', newline='') as f:
+            headers = next(csv.reader(f), [])
+    else:
+        headers = args.headers
+
+    if not headers:
+        parser.error("Нет заголовков колонок")
+
+    from src.utils.bulk_generator import BulkDataGenerator
+
+    data_parser = SmartDataParser()
+    specs = [data_parser.column_spec_for_header(header) for header in headers]
+    generator = BulkDataGenerator(specs, seed=args.seed, workers=args.workers)
+
+    for header, (kind, param) in zip(headers, specs):
+        print(f"[BULK] {header}: {kind} {param}")
+    print(f"[BULK] Строк: {args.rows}, seed: {generator.seed}, процессов: {generator.workers}")
+
+    started = time.perf_counter()
+    written = generator.write_csv(args.output, headers, args.rows)
+    elapsed = time.perf_counter() - started
+    print(f"[BULK] Записано {written} строк в {args.output} за {elapsed:.1f}s ({written / max(elapsed, 1e-9):.0f} строк/с)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+"""
+Общий HTTP слой для Octobrowser API
+
+Один потокобезопасный requests.Session с keep-alive пулом соединений
+вместо нового TCP+TLS соединения на каждый запрос. Здесь же в одном месте:
+- таймауты по типу endpoint (create / start / stop / delete / ...)
+- retry с экспоненциальным backoff для 429 и 5xx (с учетом Retry-After);
+  неидемпотентные запросы (POST create) после 5xx не повторяются - сервер мог
+  уже создать профиль, повтор дал бы дубликат
+- общий RateGovernor для Cloud API: запросы с lane проходят через token bucket
+- счетчики запросов и переиспользования соединений
+
+Используется GUI клиентом (OctobrowserAPI) и runtime сгенерированных скриптов (src/runtime).
+"""
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from .rate_governor import RateGovernor
+
+
+# Таймауты (connect, read) по типу endpoint
+DEFAULT_TIMEOUTS = {
+    'default': (10, 30),
+    'create': (10, 60),
+    'start': (10, 120),
+    'stop': (10, 30),
+    'delete': (10, 30),
+    'update': (10, 30),
+    'list': (10, 30),
+    'local_check': (3, 5),
+}
+
+# Коды ответа, после которых запрос повторяется
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Методы, которые безопасно повторять после сетевой ошибки и 5xx
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+
+# Коды, при которых запрос точно не выполнен - повторяется и неидемпотентный запрос
+REJECTED_STATUS_CODES = (429,)
+
+
+class OctoHttpSession:
+    """Потокобезопасная keep-alive сессия с retry/backoff и счетчиками"""
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 3, backoff_base: float = 1.0,
+                 backoff_max: float = 30.0, timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+                 governor: 'RateGovernor' = None):
+        """
+        Args:
+            pool_size: Максимум keep-alive соединений на хост (≈ количество потоков)
+            max_retries: Количество повторов для 429/5xx
+            backoff_base: Базовая задержка backoff в секундах (1s, 2s, 4s, ...)
+            backoff_max: Максимальная задержка между повторами
+            timeouts: Переопределение таймаутов по типу endpoint
+            governor: Регулятор частоты Cloud API (acquire(lane) / feedback(status, headers))
+        """
+        self.pool_size = max(1, int(pool_size))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.governor = governor
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'retries': 0,
+            'errors': 0,
+            'backoff_seconds': 0.0,
+            'throttled_seconds': 0.0,
+        }
+
+        self.session = requests.Session()
+        self._retired_adapters = []  # Адаптеры до grow_pool (дорабатывают начатые запросы)
+        self._adapter = self._mount_adapter()
+
+    def _mount_adapter(self) -> HTTPAdapter:
+        """Новый адаптер с пулом pool_size на все схемы сессии"""
+        adapter = HTTPAdapter(
+            pool_connections=4,  # Хостов немного: cloud API, local API, 9Proxy
+            pool_maxsize=self.pool_size,
+            max_retries=0,  # Повторы делаем сами (нужен контроль 429 и Retry-After)
+            pool_block=False
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        return adapter
+
+    def grow_pool(self, pool_size: int):
+        """
+        Увеличить пул соединений без закрытия сессии
+
+        Новые запросы идут через новый адаптер. Старый не закрывается: запросы,
+        начатые через него в других потоках, дорабатывают на своих соединениях.
+        """
+        with self._stats_lock:
+            if pool_size <= self.pool_size:
+                return
+            self.pool_size = int(pool_size)
+            self._retired_adapters.append(self._adapter)
+            self._adapter = self._mount_adapter()
+
+    def _timeout_for(self, endpoint: str):
+        return self.timeouts.get(endpoint, self.timeouts['default'])
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Задержка перед повтором: Retry-After если есть, иначе экспоненциальный backoff"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        return min(self.backoff_base * (2 ** attempt), self.backoff_max)
+
+    def _count(self, key: str, value: float = 1):
+        with self._stats_lock:
+            self._stats[key] += value
+
+    def request(self, method: str, url: str, endpoint: str = 'default', timeout=None,
+                retry: bool = True, lane: Optional[str] = None, idempotent: Optional[bool] = None,
+                **kwargs) -> requests.Response:
+        """
+        Выполнить HTTP запрос через общий пул
+
+        Args:
+            method: HTTP метод
+            url: Полный URL
+            endpoint: Тип endpoint для выбора таймаута (create, start, stop, ...)
+            timeout: Явный таймаут (перекрывает таймаут endpoint)
+            retry: Повторять ли запрос при 429/5xx
+            lane: Полоса RateGovernor для Cloud API (provision / cleanup), None - без регулятора
+            idempotent: Можно ли повторять после сетевой ошибки и 5xx (по умолчанию - по методу;
+                POST повторяется только после 429)
+            **kwargs: Аргументы requests (headers, json, params, ...)
+
+        Returns:
+            requests.Response (последний ответ, если повторы исчерпаны)
+
+        Raises:
+            requests.exceptions.RequestException: если все попытки завершились сетевой ошибкой
+        """
+        method = method.upper()
+        timeout = timeout if timeout is not None else self._timeout_for(endpoint)
+        attempts = self.max_retries + 1 if retry else 1
+        governed = lane is not None and self.governor is not None
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        retry_codes = RETRY_STATUS_CODES if idempotent else REJECTED_STATUS_CODES
+
+        for attempt in range(attempts):
+            if governed:
+                waited = self.governor.acquire(lane)
+                self._count('throttled_seconds', waited)
+                if waited >= 0.05:
+                    print(f"[RATE] {method} {endpoint} ({lane}): ожидание в регуляторе {waited:.2f}s")
+
+            self._count('requests')
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.RequestException:
+                self._count('errors')
+                if attempt >= attempts - 1 or not idempotent:
+                    raise
+                delay = self._retry_delay(attempt, None)
+            else:
+                if governed:
+                    self.governor.feedback(response.status_code, response.headers)
+                if response.status_code not in retry_codes or attempt >= attempts - 1:
+                    return response
+                # 429 под регулятором: паузу выдерживает сам регулятор в acquire()
+                delay = 0.0 if governed and response.status_code == 429 else self._retry_delay(attempt, response)
+                print(f"[HTTP] {method} {endpoint}: HTTP {response.status_code}, повтор через {delay:.1f}s "
+                      f"({attempt + 1}/{attempts - 1})")
+
+            self._count('retries')
+            self._count('backoff_seconds', delay)
+            if delay > 0:
+                time.sleep(delay)
+
+        raise requests.exceptions.RetryError(f"{method} {url}: повторы исчерпаны")
+
+    def get(self, url: str, endpoint: str = 'default', **kwargs) -> requests.Response:
+        return self.request('GET', url, endpoint=endpoint, **kwargs)
+
+    def post(self, url: str, endpoint: str = 'default', **kwargs) -> requests.Response:
+        return self.request('POST', url, endpoint=endpoint, **kwargs)
+
+    def patch(self, url: str, endpoint: str = 'default', **kwargs) -> requests.Response:
+        return self.request('PATCH', url, endpoint=endpoint, **kwargs)
+
+    def put(self, url: str, endpoint: str = 'default', **kwargs) -> requests.Response:
+        return self.request('PUT', url, endpoint=endpoint, **kwargs)
+
+    def delete(self, url: str, endpoint: str = 'default', **kwargs) -> requests.Response:
+        return self.request('DELETE', url, endpoint=endpoint, **kwargs)
+
+    def get_stats(self) -> Dict:
+        """
+        Статистика пула
+
+        Returns:
+            requests, retries, errors, backoff_seconds,
+            connections_opened, connections_reused (по данным пулов urllib3)
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        opened = 0
+        pool_requests = 0
+        for adapter in self._retired_adapters + [self._adapter]:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened += getattr(pool, 'num_connections', 0)
+                pool_requests += getattr(pool, 'num_requests', 0)
+
+        stats['connections_opened'] = opened
+        stats['connections_reused'] = max(0, pool_requests - opened)
+        stats['backoff_seconds'] = round(stats['backoff_seconds'], 1)
+        stats['throttled_seconds'] = round(stats['throttled_seconds'], 1)
+        if self.governor is not None:
+            stats['governor'] = self.governor.get_stats()
+        return stats
+
+    def close(self):
+        """Закрыть все соединения пула"""
+        self.session.close()
+        for adapter in self._retired_adapters:
+            adapter.close()
+
+
+_shared_session: Optional[OctoHttpSession] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session(pool_size: int = 10) -> OctoHttpSession:
+    """
+    Общая сессия процесса (создается при первом вызове)
+
+    Если запрошен больший pool_size, чем у существующей сессии, пул растет
+    на месте (grow_pool): сессию уже держат другие клиенты и потоки.
+    """
+    global _shared_session
+
+    with _shared_session_lock:
+        if _shared_session is None:
+            from .rate_governor import RateGovernor
+            _shared_session = OctoHttpSession(pool_size=pool_size, governor=RateGovernor())
+        elif _shared_session.pool_size < pool_size:
+            _shared_session.grow_pool(pool_size)
+        return _shared_session
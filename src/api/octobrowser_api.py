@@ -5,20 +5,26 @@ import requests
 import json
 from typing import Dict, List, Optional, Any
 
+from .http_session import OctoHttpSession, get_shared_session
+from .profile_sweeper import ProfileSweeper
+
 
 class OctobrowserAPI:
     """Класс для взаимодействия с Octobrowser API"""
 
-    def __init__(self, api_token: str, base_url: str = "https://app.octobrowser.net/api/v2/automation"):
+    def __init__(self, api_token: str, base_url: str = "https://app.octobrowser.net/api/v2/automation",
+                 session: Optional[OctoHttpSession] = None):
         """
         Инициализация API клиента
 
         Args:
             api_token: API токен из настроек аккаунта
             base_url: Базовый URL API (по умолчанию /automation endpoint)
+            session: HTTP сессия (по умолчанию общая keep-alive сессия процесса)
         """
         self.api_token = api_token
         self.base_url = base_url.rstrip('/')
+        self.session = session or get_shared_session()
         # 🔥 ПРАВИЛЬНЫЙ заголовок согласно официальной документации!
         # https://docs.octobrowser.net/
         # > All requests require authentication via API token in the X-Octo-Api-Token header
@@ -43,13 +49,15 @@ class OctobrowserAPI:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
 
         try:
-            response = requests.request(
-                method=method,
-                url=url,
+            endpoint_kind = self._endpoint_kind(method, endpoint)
+            response = self.session.request(
+                method,
+                url,
+                endpoint=endpoint_kind,
+                lane='cleanup' if endpoint_kind in ('stop', 'delete') else 'provision',
                 headers=self.headers,
                 json=data,
-                params=params,
-                timeout=30
+                params=params
             )
             response.raise_for_status()
             return response.json() if response.text else {}
@@ -76,6 +84,34 @@ class OctobrowserAPI:
                 "method": method
             }
 
+    @staticmethod
+    def _endpoint_kind(method: str, endpoint: str) -> str:
+        """Тип endpoint для выбора таймаута в HTTP сессии"""
+        method = method.upper()
+        path = endpoint.strip('/')
+        if path.endswith('start'):
+            return 'start'
+        if path.endswith('stop') or path.endswith('force_stop'):
+            return 'stop'
+        if method == 'DELETE' or path.endswith('delete'):
+            return 'delete'
+        if method == 'POST' and path == 'profiles':
+            return 'create'
+        if method in ('PATCH', 'PUT'):
+            return 'update'
+        if method == 'GET' and path == 'profiles':
+            return 'list'
+        return 'default'
+
+    def get_connection_stats(self) -> Dict:
+        """
+        Статистика HTTP пула (запросы, повторы, открытые/переиспользованные соединения, регулятор)
+
+        Returns:
+            Словарь счетчиков OctoHttpSession
+        """
+        return self.session.get_stats()
+
     # ==================== PROFILES ====================
 
     def get_profiles(self, page: int = 0, page_len: int = 100, fields: Optional[str] = None) -> Dict:
@@ -554,6 +590,23 @@ class OctobrowserAPI:
         params = {'uuids': ','.join(profile_uuids)} if profile_uuids else {}
         return self._make_request('GET', '/profiles/export', params=params)
 
+    def sweep_orphan_profiles(self, min_age_minutes: float = 30, tags: Optional[List[str]] = None,
+                              delete: bool = False, workers: int = 4) -> Dict:
+        """
+        Остановить (и удалить) профили автоматизации, оставшиеся от прерванных прогонов
+
+        Args:
+            min_age_minutes: Минимальный возраст профиля ("Auto Profile ...")
+            tags: Дополнительные теги профилей автоматизации
+            delete: Удалить профили после остановки
+            workers: Количество параллельных запросов
+
+        Returns:
+            Отчет ProfileSweeper.sweep (slots_recovered, deleted, failed, ...)
+        """
+        sweeper = ProfileSweeper(self.session, self.base_url, self.api_token, workers=workers)
+        return sweeper.sweep(min_age_minutes=min_age_minutes, tags=tags, delete=delete)
+
     # ==================== BATCH OPERATIONS ====================
 
     def batch_start_profiles(self, profile_uuids: List[str]) -> Dict:
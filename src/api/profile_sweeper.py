@@ -0,0 +1,340 @@
+"""
+Очистка "осиротевших" профилей автоматизации
+
+Если прогон прерван (Runner.stop -> process.terminate()), профили, созданные
+process_task ("Auto Profile T{thread} #{iteration}"), остаются запущенными
+и занимают RAM и слоты одновременных запусков Octobrowser.
+
+Профили пула REUSE_PROFILES ("Pool Profile Slot {n}") живут весь прогон, поэтому
+по возрасту не отбираются: в теге pool-owner-<хост>-<PID>-<старт> записан владелец,
+и профиль считается сиротой, только если процесс-владелец на этом хосте завершен
+или (владелец на другом хосте) прогон старше pool_max_age_hours. Такие профили
+всегда удаляются - идущий прогон удаляет свои в конце сам.
+
+ProfileSweeper:
+- параллельно листает GET /profiles (страницы после первой - пулом потоков)
+- отбирает профили автоматизации по названию или тегу и возрасту
+- параллельно останавливает их (force_stop) и, если нужно, удаляет пачками
+- возвращает отчет: сколько слотов освобождено, сколько удалено, что не удалось
+
+Зависит только от OctoHttpSession - используется и runtime сгенерированных скриптов (src/runtime).
+"""
+import datetime
+import os
+import re
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+
+# Названия одноразовых профилей, которые создает сгенерированный скрипт
+# (только с суффиксом T<поток> #<итерация> - просто "Auto Profile" мог создать пользователь)
+AUTO_PROFILE_TITLE_RE = re.compile(r'^Auto Profile T\d+ #\d+$')
+
+# Профили пула REUSE_PROFILES и тег их владельца
+POOL_PROFILE_TITLE_RE = re.compile(r'^Pool Profile Slot \d+$')
+POOL_OWNER_TAG_RE = re.compile(r'^pool-owner-([A-Za-z0-9]+)-(\d+)-(\d+)$')
+
+# Поля профиля, по которым определяется возраст (в порядке приоритета)
+AGE_FIELDS = ('created_at', 'updated_at', 'last_active')
+
+
+def _host_id() -> str:
+    """Имя хоста для тега владельца (только буквы и цифры)"""
+    return re.sub(r'[^A-Za-z0-9]', '', socket.gethostname())[:32] or 'host'
+
+
+def pool_owner_tag(started: Optional[float] = None) -> str:
+    """Тег владельца профилей пула: хост, PID и время старта текущего процесса"""
+    return f"pool-owner-{_host_id()}-{os.getpid()}-{int(started if started is not None else time.time())}"
+
+
+def _owner_alive(pid: int, started: int) -> bool:
+    """
+    Жив ли процесс-владелец на этом хосте (при сомнении - жив)
+
+    С psutil проверяется и время старта процесса: PID мог достаться другому процессу.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).create_time() <= started + 5
+        except psutil.NoSuchProcess:
+            return False
+        except Exception:
+            return True
+
+    if os.name == 'nt':
+        # os.kill(pid, 0) на Windows завершает процесс - только OpenProcess
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return kernel32.GetLastError() == 5  # ERROR_ACCESS_DENIED - процесс есть
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class ProfileSweeper:
+    """Поиск и остановка/удаление профилей, оставшихся от прерванных прогонов"""
+
+    def __init__(self, session, base_url: str, api_token: str, workers: int = 4,
+                 page_len: int = 100, delete_chunk: int = 50, pool_max_age_hours: float = 24):
+        """
+        Args:
+            session: OctoHttpSession (общий keep-alive пул и регулятор Cloud API)
+            base_url: Базовый URL Cloud API
+            api_token: API токен Octobrowser
+            workers: Количество параллельных запросов
+            page_len: Профилей на страницу списка
+            delete_chunk: Профилей в одном запросе удаления
+            pool_max_age_hours: Возраст прогона-владельца с другого хоста, после которого
+                его профили пула считаются брошенными
+        """
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.headers = {
+            'X-Octo-Api-Token': api_token,
+            'Content-Type': 'application/json'
+        }
+        self.workers = max(1, workers)
+        self.page_len = page_len
+        self.delete_chunk = max(1, delete_chunk)
+        self.pool_max_age_hours = pool_max_age_hours
+
+    def _fetch_page(self, page: int) -> tuple:
+        """Одна страница списка профилей: (profiles, total_count или None)"""
+        response = self.session.get(
+            f"{self.base_url}/profiles",
+            endpoint='list',
+            lane='cleanup',
+            headers=self.headers,
+            params={'page': page, 'page_len': self.page_len, 'fields': 'title,tags,status,' + ','.join(AGE_FIELDS)}
+        )
+        response.raise_for_status()
+        result = response.json() if response.text else {}
+
+        profiles = result.get('data', []) if isinstance(result, dict) else []
+        total = result.get('total_count') if isinstance(result, dict) else None
+        return (profiles if isinstance(profiles, list) else []), total
+
+    def list_profiles(self) -> List[Dict]:
+        """
+        Все профили аккаунта
+
+        Первая страница дает total_count - остальные запрашиваются параллельно.
+        Если total_count нет, страницы читаются по очереди до неполной.
+        """
+        profiles, total = self._fetch_page(0)
+
+        if isinstance(total, int) and total > len(profiles):
+            pages = range(1, (total + self.page_len - 1) // self.page_len)
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for page_profiles, _ in executor.map(self._fetch_page, pages):
+                    profiles.extend(page_profiles)
+            return profiles
+
+        page = 0
+        last_page = profiles
+        while len(last_page) >= self.page_len:
+            page += 1
+            last_page, _ = self._fetch_page(page)
+            profiles.extend(last_page)
+
+        return profiles
+
+    @staticmethod
+    def _profile_age_seconds(profile: Dict, now: float) -> Optional[float]:
+        """Возраст профиля в секундах (None, если API не вернул дату)"""
+        for field in AGE_FIELDS:
+            value = profile.get(field)
+            if not value:
+                continue
+            try:
+                if isinstance(value, (int, float)):
+                    timestamp = value / 1000 if value > 1e11 else value
+                else:
+                    parsed = datetime.datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+                    if parsed.tzinfo is None:
+                        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+                    timestamp = parsed.timestamp()
+                return max(0.0, now - timestamp)
+            except (ValueError, TypeError, OverflowError):
+                continue
+        return None
+
+    @staticmethod
+    def _profile_tags(profile: Dict) -> List[str]:
+        tags = profile.get('tags') or []
+        return [tag.get('name', '') if isinstance(tag, dict) else str(tag) for tag in tags]
+
+    def _pool_owner_gone(self, profile: Dict, now: float) -> bool:
+        """Владелец профиля пула завершен (этот хост) или его прогон устарел (другой хост)"""
+        for tag in self._profile_tags(profile):
+            match = POOL_OWNER_TAG_RE.match(tag)
+            if not match:
+                continue
+            host, pid, started = match.group(1), int(match.group(2)), int(match.group(3))
+            if host == _host_id():
+                return not _owner_alive(pid, started)
+            return now - started > self.pool_max_age_hours * 3600
+        # Без тега владельца неизвестно, чей это профиль
+        return False
+
+    def find_orphans(self, min_age_minutes: float = 30, tags: Optional[List[str]] = None) -> tuple:
+        """
+        Найти профили автоматизации старше min_age_minutes
+
+        Args:
+            min_age_minutes: Минимальный возраст (защищает профили параллельного прогона)
+            tags: Теги, по которым профиль тоже считается автоматическим
+
+        Returns:
+            (список профилей-сирот, сколько профилей всего в аккаунте)
+        """
+        profiles = self.list_profiles()
+        now = time.time()
+        tags = set(tags or [])
+
+        orphans = []
+        for profile in profiles:
+            if not profile.get('uuid'):
+                continue
+            if POOL_PROFILE_TITLE_RE.match(profile.get('title') or ''):
+                # Профиль пула: решает владелец, а не возраст и теги
+                if self._pool_owner_gone(profile, now):
+                    orphans.append(profile)
+                continue
+            by_title = bool(AUTO_PROFILE_TITLE_RE.match(profile.get('title') or ''))
+            by_tag = bool(tags) and bool(tags.intersection(self._profile_tags(profile)))
+            if not (by_title or by_tag):
+                continue
+
+            age = self._profile_age_seconds(profile, now)
+            # Без даты возраст неизвестен - профиль может принадлежать идущему прогону
+            if age is None or age < min_age_minutes * 60:
+                continue
+            orphans.append(profile)
+
+        return orphans, len(profiles)
+
+    def _force_stop(self, profile_uuid: str) -> str:
+        """force_stop: 'stopped' (был запущен), 'not_running' или 'failed'"""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/profiles/{profile_uuid}/force_stop",
+                endpoint='stop',
+                lane='cleanup',
+                idempotent=True,
+                headers=self.headers,
+                json={'version': None}
+            )
+        except Exception as e:
+            print(f"[SWEEP] [WARN] force_stop {profile_uuid[:8]}...: {e}")
+            return 'failed'
+
+        if response.status_code == 200:
+            return 'stopped'
+        if response.status_code in (404, 409):
+            return 'not_running'
+        return 'failed'
+
+    def _delete_chunk(self, profile_uuids: List[str]) -> List[str]:
+        """Удалить пачку профилей одним запросом, вернуть удаленные uuid"""
+        try:
+            response = self.session.delete(
+                f"{self.base_url}/profiles",
+                endpoint='delete',
+                lane='cleanup',
+                headers=self.headers,
+                json={'uuids': profile_uuids}
+            )
+            if response.status_code == 200:
+                result = response.json()
+                return result.get('data', {}).get('deleted_uuids', []) if result.get('success') else []
+            print(f"[SWEEP] [WARN] HTTP {response.status_code} при удалении пачки из {len(profile_uuids)}")
+        except Exception as e:
+            print(f"[SWEEP] [WARN] Ошибка удаления пачки: {e}")
+        return []
+
+    def sweep(self, min_age_minutes: float = 30, tags: Optional[List[str]] = None, delete: bool = False) -> Dict:
+        """
+        Найти и очистить профили-сироты
+
+        Args:
+            min_age_minutes: Минимальный возраст профиля
+            tags: Дополнительные теги профилей автоматизации
+            delete: Удалить профили после остановки (иначе только остановка;
+                брошенные профили пула удаляются всегда)
+
+        Returns:
+            Отчет: total_profiles, orphans, slots_recovered, already_stopped,
+            deleted, failed (список uuid), seconds
+        """
+        started = time.time()
+        orphans, total = self.find_orphans(min_age_minutes, tags)
+        uuids = [profile['uuid'] for profile in orphans]
+        pool_uuids = {profile['uuid'] for profile in orphans
+                      if POOL_PROFILE_TITLE_RE.match(profile.get('title') or '')}
+
+        report = {
+            'total_profiles': total,
+            'orphans': len(uuids),
+            'slots_recovered': 0,
+            'already_stopped': 0,
+            'deleted': 0,
+            'failed': [],
+            'seconds': 0.0
+        }
+
+        if uuids:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                outcomes = list(executor.map(self._force_stop, uuids))
+
+                stoppable = []
+                for profile_uuid, outcome in zip(uuids, outcomes):
+                    if outcome == 'stopped':
+                        report['slots_recovered'] += 1
+                    elif outcome == 'not_running':
+                        report['already_stopped'] += 1
+                    else:
+                        report['failed'].append(profile_uuid)
+                        continue
+                    stoppable.append(profile_uuid)
+
+                deletable = stoppable if delete else [uuid for uuid in stoppable if uuid in pool_uuids]
+                if deletable:
+                    chunks = [deletable[i:i + self.delete_chunk] for i in range(0, len(deletable), self.delete_chunk)]
+                    deleted = set()
+                    for chunk_deleted in executor.map(self._delete_chunk, chunks):
+                        deleted.update(chunk_deleted)
+                    report['deleted'] = len(deleted)
+                    report['failed'].extend(uuid for uuid in deletable if uuid not in deleted)
+
+        report['seconds'] = round(time.time() - started, 1)
+        return report
+
+    @staticmethod
+    def format_report(report: Dict) -> str:
+        """Отчет одной строкой для лога / toast"""
+        return (f"Профилей в аккаунте: {report['total_profiles']}, сирот: {report['orphans']}, "
+                f"освобождено слотов: {report['slots_recovered']}, уже остановлены: {report['already_stopped']}, "
+                f"удалено: {report['deleted']}, ошибок: {len(report['failed'])} ({report['seconds']}s)")
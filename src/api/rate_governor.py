@@ -0,0 +1,182 @@
+"""
+Общий регулятор частоты запросов к Octobrowser Cloud API
+
+Token bucket на весь прогон вместо независимых sleep в каждом потоке:
+- скорость адаптируется по ответам (AIMD): 429 -> скорость x0.5 и пауза,
+  успешные ответы -> плавный рост до max_rate
+- пауза берется из Retry-After / X-RateLimit-Reset, если сервер их прислал
+- полосы приоритета (provision / cleanup) чередуются, когда ждут обе,
+  поэтому force_stop/delete не голодают из-за create и наоборот
+- время ожидания считается по каждому вызову и по полосам
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateGovernor:
+    """Адаптивный token bucket с полосами приоритета"""
+
+    LANES = ('provision', 'cleanup')
+
+    def __init__(self, rate: float = 0.8, burst: int = 5, min_rate: float = 0.1, max_rate: float = 3.0,
+                 increase_step: float = 0.05, decrease_factor: float = 0.5):
+        """
+        Args:
+            rate: Начальная скорость (запросов в секунду)
+            burst: Емкость корзины (сколько запросов можно сделать подряд)
+            min_rate: Нижняя граница скорости после серии 429
+            max_rate: Верхняя граница скорости
+            increase_step: Прибавка скорости после каждого успешного ответа
+            decrease_factor: Множитель скорости после 429
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.max_rate = max(rate, max_rate)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = {lane: 0 for lane in self.LANES}
+        self._last_lane = None
+
+        self._stats = {
+            'throttled_responses': 0,
+            'lanes': {lane: {'calls': 0, 'waited_seconds': 0.0, 'max_wait': 0.0} for lane in self.LANES}
+        }
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def _lane_turn(self, lane: str) -> bool:
+        """Уступить токен другой полосе, если она ждет, а предыдущий токен ушел этой"""
+        others_waiting = any(count > 0 for name, count in self._waiting.items() if name != lane)
+        return not (others_waiting and self._last_lane == lane)
+
+    def acquire(self, lane: str = 'provision') -> float:
+        """
+        Дождаться разрешения на запрос
+
+        Args:
+            lane: Полоса приоритета (provision - создание/обновление, cleanup - остановка/удаление)
+
+        Returns:
+            Сколько секунд запрос ждал в регуляторе
+        """
+        if lane not in self._waiting:
+            lane = 'provision'
+
+        started = time.monotonic()
+        with self._cond:
+            self._waiting[lane] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+
+                    if now < self._paused_until:
+                        wait = self._paused_until - now
+                    elif self._tokens >= 1 and self._lane_turn(lane):
+                        self._tokens -= 1
+                        self._last_lane = lane
+                        break
+                    elif self._tokens < 1:
+                        wait = (1 - self._tokens) / self.rate
+                    else:
+                        wait = 0.05  # Очередь другой полосы - будим ее
+                        self._cond.notify_all()
+
+                    self._cond.wait(timeout=max(wait, 0.01))
+            finally:
+                self._waiting[lane] -= 1
+                self._cond.notify_all()
+
+            waited = time.monotonic() - started
+            lane_stats = self._stats['lanes'][lane]
+            lane_stats['calls'] += 1
+            lane_stats['waited_seconds'] += waited
+            lane_stats['max_wait'] = max(lane_stats['max_wait'], waited)
+
+        return waited
+
+    @staticmethod
+    def _pause_from_headers(headers) -> Optional[float]:
+        """Пауза из Retry-After / X-RateLimit-Reset (секунды или unix timestamp)"""
+        if not headers:
+            return None
+
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+
+        if str(headers.get('X-RateLimit-Remaining', '')).strip() == '0':
+            reset = headers.get('X-RateLimit-Reset')
+            try:
+                reset = float(reset)
+            except (TypeError, ValueError):
+                return None
+            if reset > 1e9:  # Unix timestamp
+                reset -= time.time()
+            return max(0.0, reset)
+
+        return None
+
+    def feedback(self, status_code: int, headers=None):
+        """
+        Обратная связь по ответу сервера
+
+        Args:
+            status_code: HTTP код ответа
+            headers: Заголовки ответа (Retry-After, X-RateLimit-*)
+        """
+        pause = self._pause_from_headers(headers)
+
+        with self._cond:
+            now = time.monotonic()
+            if status_code == 429:
+                self._stats['throttled_responses'] += 1
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self._tokens = 0.0
+                self._last_refill = now
+                if pause is None:
+                    pause = 1.0 / self.rate
+                self._paused_until = max(self._paused_until, now + min(pause, 120.0))
+                print(f"[RATE] 429 от Cloud API: скорость -> {self.rate:.2f} req/s, пауза {pause:.1f}s")
+            elif 200 <= status_code < 300:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                if pause:
+                    # Сервер сообщил, что лимит окна исчерпан - ждем сброса заранее
+                    self._paused_until = max(self._paused_until, now + min(pause, 120.0))
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict:
+        """
+        Статистика регулятора
+
+        Returns:
+            rate, throttled_responses и по полосам: calls, waited_seconds, max_wait
+        """
+        with self._cond:
+            lanes = {
+                lane: {
+                    'calls': data['calls'],
+                    'waited_seconds': round(data['waited_seconds'], 1),
+                    'max_wait': round(data['max_wait'], 1)
+                }
+                for lane, data in self._stats['lanes'].items()
+            }
+            return {
+                'rate': round(self.rate, 2),
+                'throttled_responses': self._stats['throttled_responses'],
+                'lanes': lanes
+            }
@@ -1,39 +1,51 @@
 """
 Модуль для работы с источниками данных (CSV, Excel)
+
+Строки хранятся компактно: один кортеж заголовков и кортеж значений на строку
+(словарь строится только в get_row/get_all_rows). Excel читается потоково
+(openpyxl read_only), CSV в ленивом режиме (lazy=True) вообще не держит значения
+в памяти - только индекс смещений строк в файле для произвольного доступа.
 """
 import csv
-from typing import List, Dict, Optional
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
 
 class DataSource:
     """Класс для работы с табличными данными"""
 
-    def __init__(self, file_path: Optional[str] = None):
+    def __init__(self, file_path: Optional[str] = None, lazy: bool = False):
         """
         Инициализация источника данных
 
         Args:
             file_path: Путь к файлу с данными (CSV или Excel)
+            lazy: CSV не загружается в память - строки читаются с диска по индексу смещений
         """
         self.file_path = file_path
-        self.data = []
+        self.lazy = lazy
         self.headers = []
+        self._rows: List[Tuple] = []  # кортежи значений (обычный режим и Excel)
+        self._offsets: Optional[array] = None  # смещения строк CSV в файле (lazy)
 
         if file_path:
             self.load_data(file_path)
 
-    def load_data(self, file_path: str):
+    def load_data(self, file_path: str, lazy: Optional[bool] = None):
         """
         Загрузка данных из файла
 
         Args:
             file_path: Путь к файлу
+            lazy: Переопределить режим, заданный в конструкторе
 
         Raises:
             ValueError: Если формат файла не поддерживается
         """
         self.file_path = file_path
+        if lazy is not None:
+            self.lazy = lazy
         file_path_obj = Path(file_path)
 
         if not file_path_obj.exists():
@@ -42,6 +54,8 @@ class DataSource:
         # Определяем формат файла
         extension = file_path_obj.suffix.lower()
 
+        self._rows = []
+        self._offsets = None
         if extension == '.csv':
             self._load_csv(file_path)
         elif extension in ['.xlsx', '.xls']:
@@ -50,33 +64,118 @@ class DataSource:
             raise ValueError(f"Неподдерживаемый формат файла: {extension}")
 
     def _load_csv(self, file_path: str):
-        """Загрузка CSV файла"""
-        with open(file_path, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            self.headers = reader.fieldnames or []
-            self.data = list(reader)
+        """Загрузка CSV файла (в lazy режиме - только индекс смещений строк)"""
+        if self.lazy:
+            self._offsets = array('q')
+            records = self._scan_csv(file_path)
+            self.headers = next(records, (None, []))[1]
+            for offset, _ in records:
+                self._offsets.append(offset)
+            return
+
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            self.headers = next(reader, [])
+            # Пустые строки пропускаются, как в csv.DictReader
+            self._rows = [tuple(row) for row in reader if row]
 
     def _load_excel(self, file_path: str):
-        """Загрузка Excel файла"""
+        """Загрузка Excel файла (потоково, без объектов ячеек)"""
         try:
             import openpyxl
         except ImportError:
             raise ImportError("Для работы с Excel установите: pip install openpyxl")
 
-        workbook = openpyxl.load_workbook(file_path)
-        sheet = workbook.active
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            rows = sheet.iter_rows(values_only=True)
+
+            # Первая строка - заголовки
+            self.headers = [value for value in next(rows, ()) if value]
+
+            # Остальные строки - данные
+            width = len(self.headers)
+            self._rows = [row[:width] for row in rows if any(row)]  # Пропускаем пустые строки
+        finally:
+            # read_only держит файл открытым до close()
+            workbook.close()
+
+    # ==================== ЛЕНИВЫЙ CSV ====================
+
+    @staticmethod
+    def _scan_csv(file_path: str, start: int = 0) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Записи CSV вместе со смещением их начала в файле
+
+        csv.reader берет из генератора ровно столько физических строк, сколько
+        нужно на запись (поля с переводом строки в кавычках тоже), поэтому
+        смещение после очередной записи - начало следующей.
+        """
+        position = start
+
+        def lines(f):
+            nonlocal position
+            for raw in f:
+                position += len(raw)
+                yield raw.decode('utf-8')
+
+        with open(file_path, 'rb') as f:
+            if start:
+                f.seek(start)
+            elif f.read(3) != b'\xef\xbb\xbf':  # BOM (utf-8-sig)
+                f.seek(0)
+            position = f.tell()
+
+            reader = csv.reader(lines(f))
+            while True:
+                offset = position
+                row = next(reader, None)
+                if row is None:
+                    return
+                if row:  # Пустые строки пропускаются, как в csv.DictReader
+                    yield offset, row
+
+    def _read_csv_row(self, index: int) -> List[str]:
+        """Прочитать одну строку CSV по индексу смещений"""
+        return next(self._scan_csv(self.file_path, self._offsets[index]))[1]
+
+    # ==================== ДОСТУП К ДАННЫМ ====================
+
+    def _to_dict(self, values) -> Dict:
+        """Строка в виде словаря (как у csv.DictReader: недостающие значения - None)"""
+        row = dict(zip(self.headers, values))
+        if len(values) < len(self.headers):
+            for header in self.headers[len(values):]:
+                row[header] = None
+        elif len(values) > len(self.headers):
+            row[None] = list(values[len(self.headers):])
+        return row
+
+    def iter_values(self) -> Iterator[Tuple]:
+        """
+        Потоковый обход значений строк (кортежи в порядке get_headers)
+
+        В lazy режиме файл читается последовательно, без индекса.
+        """
+        if self._offsets is None:
+            yield from self._rows
+            return
+
+        records = self._scan_csv(self.file_path)
+        next(records, None)  # заголовки
+        for _, row in records:
+            yield tuple(row)
 
-        # Первая строка - заголовки
-        self.headers = [cell.value for cell in sheet[1] if cell.value]
+    def iter_rows(self) -> Iterator[Dict]:
+        """Потоковый обход строк в виде словарей"""
+        for values in self.iter_values():
+            yield self._to_dict(values)
 
-        # Остальные строки - данные
-        self.data = []
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            if any(row):  # Пропускаем пустые строки
-                row_dict = {}
-                for i, header in enumerate(self.headers):
-                    row_dict[header] = row[i] if i < len(row) else None
-                self.data.append(row_dict)
+    @property
+    def data(self) -> List[Dict]:
+        """Все строки словарями (материализуется при каждом обращении - используйте iter_rows)"""
+        return self.get_all_rows()
 
     def get_headers(self) -> List[str]:
         """
@@ -97,9 +196,11 @@ class DataSource:
         Returns:
             Словарь с данными строки
         """
-        if 0 <= index < len(self.data):
-            return self.data[index]
-        return {}
+        if not 0 <= index < self.get_row_count():
+            return {}
+        if self._offsets is not None:
+            return self._to_dict(self._read_csv_row(index))
+        return self._to_dict(self._rows[index])
 
     def get_all_rows(self) -> List[Dict]:
         """
@@ -108,7 +209,7 @@ class DataSource:
         Returns:
             Список словарей с данными
         """
-        return self.data
+        return list(self.iter_rows())
 
     def get_row_count(self) -> int:
         """
@@ -117,9 +218,11 @@ class DataSource:
         Returns:
             Количество строк
         """
-        return len(self.data)
+        if self._offsets is not None:
+            return len(self._offsets)
+        return len(self._rows)
 
-    def get_column_values(self, column_name: str) -> List:
+    def get_column_values(self, column_name: str) -> List[Any]:
         """
         Получить все значения из колонки
 
@@ -129,7 +232,10 @@ class DataSource:
         Returns:
             Список значений
         """
-        return [row.get(column_name) for row in self.data if column_name in row]
+        if column_name not in self.headers:
+            return []
+        column = self.headers.index(column_name)
+        return [values[column] if column < len(values) else None for values in self.iter_values()]
 
     def create_sample_csv(self, output_path: str):
         """
@@ -86,7 +86,8 @@ class DynamicField:
         Получить значение от SMS провайдера
 
         Args:
-            context: Контекст с SMS провайдером
+            context: Контекст с SMS провайдером (и, опционально, 'number_pool' -
+                PhoneNumberPool с заранее арендованными номерами)
 
         Returns:
             Значение поля
@@ -99,8 +100,12 @@ class DynamicField:
             if self._cached_value and self._activation_id:
                 return self._cached_value
 
-            # Получить новый номер
-            result = sms_provider.get_number(service, **self.metadata)
+            # Получить новый номер (из пула заранее арендованных, если он есть)
+            number_pool = context.get('number_pool')
+            if number_pool is not None:
+                result = number_pool.acquire(timeout=self.metadata.get('number_timeout', 120))
+            else:
+                result = sms_provider.get_number(service, **self.metadata)
 
             if result['success']:
                 self._cached_value = result['phone_number']
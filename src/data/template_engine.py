@@ -1,15 +1,95 @@
 """
 Движок шаблонов для замены переменных в коде
+
+Текст разбирается один раз (CompiledTemplate: литералы + имена переменных),
+дальше каждая строка данных - это один ''.join без регулярных выражений.
+Значения вставляются как есть: {{var}} внутри значения повторно не заменяется.
+Заменяется любой ключ словаря, в том числе не \w+ (заголовки CSV/Excel с пробелами,
+дефисами и точками: {{First Name}}), а find_variables/validate_variables, как и раньше,
+видят только имена \w+.
 """
 import re
-from typing import Dict, List, Tuple
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+
+# Паттерн для поиска переменных: {{variable_name}}
+VARIABLE_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# Любой плейсхолдер {{...}} - заменяется, если такой ключ есть в словаре значений
+PLACEHOLDER_RE = re.compile(r'\{\{([^{}]+?)\}\}')
+
+
+class CompiledTemplate:
+    """Шаблон, разобранный на литералы и переменные"""
+
+    __slots__ = ('text', 'names', '_pieces', '_slots')
+
+    def __init__(self, text: str):
+        """
+        Args:
+            text: Текст с переменными {{name}}
+        """
+        self.text = text
+        # split с группой: [литерал, имя, литерал, имя, ..., литерал]
+        parts = PLACEHOLDER_RE.split(text)
+        # Переменные для поиска/проверки - только \w+ (как VARIABLE_RE)
+        self.names: Tuple[str, ...] = tuple(name for name in parts[1::2] if VARIABLE_RE.fullmatch('{{' + name + '}}'))
+        # Заготовка результата: на местах переменных - исходный {{name}} (если значения нет)
+        self._pieces = [part if i % 2 == 0 else '{{' + part + '}}' for i, part in enumerate(parts)]
+        self._slots = tuple((i, part) for i, part in enumerate(parts) if i % 2)
+
+    @property
+    def variables(self) -> List[str]:
+        """Уникальные имена переменных в порядке первого появления"""
+        return list(dict.fromkeys(self.names))
+
+    def render(self, variables: Mapping[str, object]) -> str:
+        """
+        Подставить значения (None -> '', отсутствующая переменная остается {{name}})
+
+        Args:
+            variables: Словарь {имя_переменной: значение}
+
+        Returns:
+            Текст с замененными переменными
+        """
+        pieces = self._pieces.copy()
+        for slot, name in self._slots:
+            if name in variables:
+                value = variables[name]
+                pieces[slot] = '' if value is None else str(value)
+        return ''.join(pieces)
+
+    def render_many(self, rows: Iterable[Mapping[str, object]]) -> List[str]:
+        """
+        Отрендерить шаблон для каждой строки данных
+
+        Args:
+            rows: Строки данных (словари {колонка: значение})
+
+        Returns:
+            Список текстов в порядке rows
+        """
+        if not self._slots:
+            return [self.text for _ in rows]
+
+        render = self.render
+        return [render(row) for row in rows]
+
+
+@lru_cache(maxsize=128)
+def compile_template(text: str) -> CompiledTemplate:
+    """Разобранный шаблон (кэш по тексту: повторный разбор того же кода не нужен)"""
+    return CompiledTemplate(text)
 
 
 class TemplateEngine:
     """Класс для работы с шаблонами и переменными"""
 
     # Паттерн для поиска переменных: {{variable_name}}
-    VARIABLE_PATTERN = r'\{\{(\w+)\}\}'
+    VARIABLE_PATTERN = VARIABLE_RE.pattern
 
     def __init__(self):
         """Инициализация движка шаблонов"""
@@ -25,8 +105,7 @@ class TemplateEngine:
         Returns:
             Список названий переменных
         """
-        matches = re.findall(self.VARIABLE_PATTERN, text)
-        return list(set(matches))  # Уникальные значения
+        return compile_template(text).variables  # Уникальные значения
 
     def replace_variables(self, text: str, variables: Dict[str, str]) -> str:
         """
@@ -39,15 +118,33 @@ class TemplateEngine:
         Returns:
             Текст с замененными переменными
         """
-        result = text
+        return compile_template(text).render(variables)
+
+    def replace_variables_batch(self, text: str, rows: Iterable[Mapping[str, object]]) -> List[str]:
+        """
+        Заменить переменные для каждой строки данных (шаблон разбирается один раз)
+
+        Args:
+            text: Текст с переменными
+            rows: Строки данных (словари {имя_переменной: значение})
+
+        Returns:
+            Список текстов в порядке rows
+        """
+        return compile_template(text).render_many(rows)
 
-        for var_name, var_value in variables.items():
-            pattern = r'\{\{' + var_name + r'\}\}'
-            # Преобразуем значение в строку и экранируем кавычки
-            value_str = str(var_value) if var_value is not None else ''
-            result = re.sub(pattern, value_str, result)
+    @staticmethod
+    def compile(text: str) -> CompiledTemplate:
+        """
+        Разобрать шаблон для многократного рендера
 
-        return result
+        Args:
+            text: Текст с переменными
+
+        Returns:
+            CompiledTemplate
+        """
+        return compile_template(text)
 
     def validate_variables(self, text: str, available_columns: List[str]) -> Tuple[bool, List[str]]:
         """
@@ -60,7 +157,7 @@ class TemplateEngine:
         Returns:
             (True/False, список недостающих переменных)
         """
-        found_variables = self.find_variables(text)
+        found_variables = compile_template(text).variables
         missing_variables = [var for var in found_variables if var not in available_columns]
 
         return (len(missing_variables) == 0, missing_variables)
@@ -79,7 +176,7 @@ class TemplateEngine:
         def highlight_match(match):
             return f"[VAR:{match.group(1)}]"
 
-        return re.sub(self.VARIABLE_PATTERN, highlight_match, text)
+        return VARIABLE_RE.sub(highlight_match, text)
 
     def get_variable_usage_count(self, text: str) -> Dict[str, int]:
         """
@@ -91,13 +188,7 @@ class TemplateEngine:
         Returns:
             Словарь {имя_переменной: количество_использований}
         """
-        variables = re.findall(self.VARIABLE_PATTERN, text)
-        usage_count = {}
-
-        for var in variables:
-            usage_count[var] = usage_count.get(var, 0) + 1
-
-        return usage_count
+        return dict(Counter(compile_template(text).names))
 
     @staticmethod
     def escape_for_python_string(value: str) -> str:
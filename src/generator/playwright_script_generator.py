@@ -3,6 +3,7 @@
 """
 
 import json
+from pathlib import Path
 from typing import Dict, List
 
 
@@ -131,6 +132,8 @@ USE_SMS_PROVIDER = {use_sms}
 SMS_API_KEY = "{sms_api_key}"
 SMS_SERVICE = "{sms_service}"  # ds=Discord, go=Google, wa=WhatsApp, tg=Telegram
 SMS_API_BASE_URL = "https://daisysms.com/stubs/handler_api.php"
+SMS_PREFETCH_NUMBERS = {int(sms_config.get('prefetch_numbers', 1))}  # Номеров, арендованных заранее (0 - выкл)
+SMS_NUMBER_MAX_AGE = {int(sms_config.get('number_max_age', 600))}  # Секунд до отмены невыданного номера
 '''
 
         config += '\n\n'
@@ -319,6 +322,78 @@ def check_local_api() -> bool:
 
     def _generate_sms_functions(self, sms_config: Dict) -> str:
         """Генерирует функции для работы с SMS API"""
+        return self._generate_sms_api_functions() + self._generate_number_pool()
+
+    def _generate_number_pool(self) -> str:
+        """Генерирует пул заранее арендованных номеров (PhoneNumberPool встраивается как есть)"""
+        pool_source = (Path(__file__).resolve().parents[1] / 'sms' / 'number_pool.py').read_text(encoding='utf-8')
+
+        return f'''# ============================================================
+# ПУЛ НОМЕРОВ (аренда заранее, пока идет предыдущая итерация)
+# ============================================================
+
+{pool_source}
+
+class _ScriptSMSProvider:
+    """Адаптер функций SMS API скрипта к интерфейсу провайдера для PhoneNumberPool"""
+
+    def get_number(self, service: str, **params) -> Dict:
+        sms_data = get_phone_number()
+        if not sms_data:
+            return {{'success': False, 'error': 'Номер не получен'}}
+        return {{'activation_id': sms_data['activation_id'], 'phone_number': sms_data['phone_number'],
+                'service': service, 'success': True, 'error': None}}
+
+    def cancel_activation(self, activation_id: str) -> Dict:
+        return {{'success': cancel_sms_activation(activation_id), 'error': None}}
+
+
+_number_pool = None
+
+
+def start_number_pool():
+    """Запустить фоновую аренду номеров (SMS_PREFETCH_NUMBERS > 0)"""
+    global _number_pool
+    if SMS_PREFETCH_NUMBERS <= 0 or _number_pool is not None:
+        return
+    _number_pool = PhoneNumberPool(_ScriptSMSProvider(), SMS_SERVICE, size=SMS_PREFETCH_NUMBERS,
+                                   max_age=SMS_NUMBER_MAX_AGE)
+    _number_pool.start()
+    print(f"[SMS POOL] Запущен: {{SMS_PREFETCH_NUMBERS}} номер(ов) заранее, автоотмена через {{SMS_NUMBER_MAX_AGE}}s")
+
+
+def acquire_phone_number() -> Optional[Dict]:
+    """Номер из пула (готовый - без ожидания API), без пула - get_phone_number_with_retry"""
+    if _number_pool is None:
+        return get_phone_number_with_retry(max_retries=5)
+
+    result = _number_pool.acquire(timeout=120)
+    if not result.get('success'):
+        print(f"[SMS POOL] {{result.get('error')}} - прямой запрос номера")
+        return get_phone_number_with_retry(max_retries=5)
+
+    print(f"[SMS POOL] Номер {{result['phone_number']}} выдан из пула (ожидание {{result['waited']:.1f}}s)")
+    return {{'activation_id': result['activation_id'], 'phone_number': result['phone_number']}}
+
+
+def stop_number_pool():
+    """Остановить пул, отменить невыданные номера и вывести статистику"""
+    global _number_pool
+    if _number_pool is None:
+        return
+    cancelled = _number_pool.stop(cancel_unused=True)
+    stats = _number_pool.get_stats()
+    _number_pool = None
+    print(f"[SMS POOL] Арендовано: {{stats['rented']}}, выдано: {{stats['acquired']}} "
+          f"(готовыми: {{stats['hits']}}), отменено по возрасту: {{stats['expired']}}, при остановке: {{cancelled}}")
+    print(f"[SMS POOL] Аренда номера: в среднем {{stats['avg_rent']}}s (макс {{stats['max_rent']}}s), "
+          f"ожидание итерации: в среднем {{stats['avg_wait']}}s (макс {{stats['max_wait']}}s)")
+
+
+'''
+
+    def _generate_sms_api_functions(self) -> str:
+        """Генерирует функции SMS API (DaisySMS)"""
         return '''# ============================================================
 # ФУНКЦИИ SMS ПРОВАЙДЕРА (DaisySMS)
 # ============================================================
@@ -631,8 +706,8 @@ def update_csv_row(filename: str = None, row_index: int = 0, phone_number: Optio
         if USE_SMS_PROVIDER:
             print("[SMS] === НАЧИНАЕМ ПОЛУЧЕНИЕ НОМЕРА ===")
 
-            # Получить номер с RETRY (до 5 попыток с экспоненциальной задержкой)
-            sms_data = get_phone_number_with_retry(max_retries=5)
+            # Номер из пула заранее арендованных (иначе - RETRY до 5 попыток с экспоненциальной задержкой)
+            sms_data = acquire_phone_number()
 
             if sms_data:
                 sms_activation_id = sms_data['activation_id']
@@ -807,6 +882,9 @@ def main():
 
         print(f"\\nЗапуск автоматизации для {total_iterations} строк данных\\n")
 
+        if USE_SMS_PROVIDER:
+            start_number_pool()
+
         # Запуск для каждой строки
         for i, data_row in enumerate(data_rows, start=1):
             success = run_automation_iteration(i, data_row)
@@ -836,6 +914,9 @@ def main():
         print(f"\\n[ERROR] Критическая ошибка: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if USE_SMS_PROVIDER:
+            stop_number_pool()
 
 
 if __name__ == "__main__":
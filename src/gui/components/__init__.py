@@ -1,12 +1,21 @@
 """
 🧩 Modern UI Components для auto2tesst v2
+
+DataTab, ProxyTab и OctoAPITab импортируются при первом обращении: они тянут
+requests, 9Proxy менеджер и парсер данных, которые не нужны до открытия вкладки.
 """
 
+import importlib
+
 from .toast import ToastManager
 from .collapsible_frame import CollapsibleFrame
-from .data_tab import DataTab
-from .proxy_tab import ProxyTab
-from .octo_api_tab import OctoAPITab
+
+# Имя компонента -> модуль, из которого он импортируется лениво
+_LAZY_COMPONENTS = {
+    'DataTab': '.data_tab',
+    'ProxyTab': '.proxy_tab',
+    'OctoAPITab': '.octo_api_tab'
+}
 
 __all__ = [
     'ToastManager',
@@ -15,3 +24,13 @@ __all__ = [
     'ProxyTab',
     'OctoAPITab'
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_COMPONENTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    component = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = component
+    return component
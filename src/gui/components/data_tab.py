@@ -7,6 +7,8 @@
 - Import/Export CSV
 - Smart Fill
 - Right-click меню с альтернативами
+- Виртуализацией: данные в колоночном DataStore, виджеты создаются только
+  для видимых строк и переиспользуются при прокрутке
 """
 
 import customtkinter as ctk
@@ -21,20 +23,78 @@ from ..themes import ModernTheme
 from ...utils.data_parser import SmartDataParser
 
 
+# Высота строки таблицы (px): по ней считается, сколько строк помещается в окно
+ROW_HEIGHT = 44  # entry 32 + pady 4+4 + отступ строки 2+2
+# Лимит Smart Fill (виджеты создаются только для видимых строк)
+MAX_SMART_FILL_ROWS = 10000
+
+
+class DataStore:
+    """
+    Колоночное хранилище данных таблицы
+
+    Значения живут здесь, а не в виджетах: таблица рисует только видимые строки,
+    правки ячеек сразу пишутся в хранилище.
+    """
+
+    def __init__(self, headers: Optional[List[str]] = None, rows: Optional[List[List[str]]] = None):
+        self.headers: List[str] = []
+        self.columns: List[List[str]] = []
+        self.replace(headers or [], rows or [])
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def replace(self, headers: List[str], rows: List[List[str]]):
+        """Заменить все данные (короткие строки дополняются пустыми значениями)"""
+        self.headers = list(headers)
+        width = len(self.headers)
+        self.columns = [[] for _ in range(width)]
+        for row in rows:
+            self.append_row(row)
+
+    def append_row(self, values: List[str]):
+        values = list(values)[:len(self.columns)]
+        values += [""] * (len(self.columns) - len(values))
+        for column, value in zip(self.columns, values):
+            column.append(value)
+
+    def delete_row(self, row_index: int):
+        for column in self.columns:
+            del column[row_index]
+
+    def get_row(self, row_index: int) -> List[str]:
+        return [column[row_index] for column in self.columns]
+
+    def set_row(self, row_index: int, values: List[str]):
+        for column, value in zip(self.columns, values):
+            column[row_index] = value
+
+    def set_value(self, row_index: int, col_index: int, value: str):
+        self.columns[col_index][row_index] = value
+
+    def rows(self) -> List[List[str]]:
+        """Все строки (для экспорта и get_data)"""
+        return [list(row) for row in zip(*self.columns)] if self.columns else []
+
+
 class DataTableRow(ctk.CTkFrame):
     """
-    Одна строка таблицы данных
+    Переиспользуемая строка таблицы данных
+
+    Виджет не привязан к строке навсегда: при прокрутке DataTab перепривязывает
+    его к другой строке хранилища через bind_row().
     """
 
-    def __init__(self, parent, headers: List[str], values: List[str], row_index: int,
-                 on_delete: Callable, on_edit: Callable, theme: Dict):
-        super().__init__(parent, fg_color="transparent")
+    def __init__(self, parent, headers: List[str], on_delete: Callable, on_edit: Callable,
+                 on_cell_change: Callable, theme: Dict):
+        super().__init__(parent, fg_color="transparent", height=ROW_HEIGHT)
 
         self.headers = headers
-        self.values = values
-        self.row_index = row_index
+        self.row_index = -1
         self.on_delete = on_delete
         self.on_edit = on_edit
+        self.on_cell_change = on_cell_change
         self.theme = theme
         self.entries = []
 
@@ -43,17 +103,17 @@ class DataTableRow(ctk.CTkFrame):
     def create_widgets(self):
         """Создать виджеты строки"""
         # Row number
-        row_num_label = ctk.CTkLabel(
+        self.row_num_label = ctk.CTkLabel(
             self,
-            text=str(self.row_index + 1),
+            text="",
             width=40,
             font=(ModernTheme.FONT['family'], ModernTheme.FONT['size_sm']),
             text_color=self.theme['text_secondary']
         )
-        row_num_label.grid(row=0, column=0, padx=4, pady=4)
+        self.row_num_label.grid(row=0, column=0, padx=4, pady=4)
 
         # Data cells
-        for col, (header, value) in enumerate(zip(self.headers, self.values), start=1):
+        for col, header in enumerate(self.headers, start=1):
             entry = ctk.CTkEntry(
                 self,
                 width=150,
@@ -64,11 +124,12 @@ class DataTableRow(ctk.CTkFrame):
                 border_color=self.theme['border_primary'],
                 font=(ModernTheme.FONT['family'], ModernTheme.FONT['size_sm'])
             )
-            entry.insert(0, value)
             entry.grid(row=0, column=col, padx=4, pady=4, sticky="ew")
 
             # Bind right-click для контекстного меню
             entry.bind("<Button-3>", lambda e, c=col-1: self.show_context_menu(e, c))
+            # Правка ячейки сразу уходит в хранилище (виджет может уехать на другую строку)
+            entry.bind("<KeyRelease>", lambda e, c=col-1: self.commit_cell(c))
 
             self.entries.append(entry)
 
@@ -86,6 +147,28 @@ class DataTableRow(ctk.CTkFrame):
         )
         delete_btn.grid(row=0, column=len(self.headers) + 1, padx=4, pady=4)
 
+    def bind_row(self, row_index: int, values: List[str]):
+        """Показать в виджете строку row_index хранилища"""
+        if row_index != self.row_index:
+            self.row_index = row_index
+            self.row_num_label.configure(text=str(row_index + 1))
+
+        for entry, value in zip(self.entries, values):
+            if entry.get() != value:
+                entry.delete(0, 'end')
+                entry.insert(0, value)
+
+    def set_cell(self, col_index: int, value: str):
+        """Записать значение в ячейку и в хранилище"""
+        self.entries[col_index].delete(0, 'end')
+        self.entries[col_index].insert(0, value)
+        self.commit_cell(col_index)
+
+    def commit_cell(self, col_index: int):
+        """Передать значение ячейки в хранилище"""
+        if self.row_index >= 0:
+            self.on_cell_change(self.row_index, col_index, self.entries[col_index].get())
+
     def show_context_menu(self, event, col_index):
         """Показать контекстное меню"""
         menu = tk.Menu(self, tearoff=0)
@@ -104,8 +187,7 @@ class DataTableRow(ctk.CTkFrame):
         header = self.headers[col_index]
         field_type = parser.detect_field_type('', header)
         new_value = parser.generate_value(field_type, count=1)[0]
-        self.entries[col_index].delete(0, 'end')
-        self.entries[col_index].insert(0, new_value)
+        self.set_cell(col_index, new_value)
 
     def copy_cell(self, col_index):
         """Копировать содержимое ячейки"""
@@ -117,8 +199,7 @@ class DataTableRow(ctk.CTkFrame):
         """Вставить в ячейку"""
         try:
             value = self.clipboard_get()
-            self.entries[col_index].delete(0, 'end')
-            self.entries[col_index].insert(0, value)
+            self.set_cell(col_index, value)
         except:
             pass
 
@@ -143,10 +224,10 @@ class DataTab(ctk.CTkFrame):
         self.toast = toast_manager
         self.parser = SmartDataParser()
 
-        # Данные таблицы
-        self.headers = []
-        self.rows = []
-        self.row_widgets = []
+        # Данные таблицы: значения в колоночном хранилище, виджеты - только для видимых строк
+        self.store = DataStore()
+        self.row_widgets: List[DataTableRow] = []  # пул виджетов, слот i = строка first_row + i
+        self.first_row = 0
 
         self.create_widgets()
 
@@ -256,23 +337,42 @@ class DataTab(ctk.CTkFrame):
 
         self.table_header_container = table_header_frame
 
-        # Scrollable table
-        self.table_scroll = ctk.CTkScrollableFrame(
-            table_container,
-            corner_radius=0,
-            fg_color=self.theme['bg_primary']
-        )
-        self.table_scroll.grid(row=1, column=0, sticky="nsew", padx=24, pady=24)
-        self.table_scroll.grid_columnconfigure(0, weight=1)
+        # Виртуализированная таблица: окно строк + вертикальный скроллбар
+        table_body = ctk.CTkFrame(table_container, corner_radius=0, fg_color=self.theme['bg_primary'])
+        table_body.grid(row=1, column=0, sticky="nsew", padx=24, pady=24)
+        table_body.grid_columnconfigure(0, weight=1)
+        table_body.grid_rowconfigure(0, weight=1)
+
+        self.table_viewport = ctk.CTkFrame(table_body, corner_radius=0, fg_color=self.theme['bg_primary'])
+        self.table_viewport.grid(row=0, column=0, sticky="nsew")
+        self.table_viewport.grid_columnconfigure(0, weight=1)
+        self.table_viewport.grid_propagate(False)
+        self.table_viewport.bind("<Configure>", lambda e: self._render_rows())
+
+        self.table_scrollbar = ctk.CTkScrollbar(table_body, command=self._on_scrollbar)
+        self.table_scrollbar.grid(row=0, column=1, sticky="ns")
+
+        # Колесо мыши над таблицей (Windows/macOS - MouseWheel, Linux - Button-4/5)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.table_viewport.bind_all(sequence, self._on_mousewheel, add="+")
 
         # Placeholder
         self.placeholder = ctk.CTkLabel(
-            self.table_scroll,
+            self.table_viewport,
             text="📊 No data yet. Import code or CSV to get started!",
             font=(ModernTheme.FONT['family'], ModernTheme.FONT['size_lg']),
             text_color=self.theme['text_tertiary']
         )
-        self.placeholder.pack(expand=True, pady=100)
+        self.placeholder.grid(row=0, column=0, pady=100)
+
+    @property
+    def headers(self) -> List[str]:
+        return self.store.headers
+
+    @property
+    def rows(self) -> List[List[str]]:
+        """Текущие строки (копия из хранилища)"""
+        return self.store.rows()
 
     def set_data(self, headers: List[str], rows: List[List[str]]):
         """
@@ -282,13 +382,11 @@ class DataTab(ctk.CTkFrame):
             headers: Заголовки столбцов
             rows: Строки данных
         """
-        self.headers = headers
-
-        # Очистить таблицу (очищает self.rows!)
-        self.clear_table()
-
-        # ПОСЛЕ очистки заполнить self.rows (копия для безопасности)
-        self.rows = [row.copy() if isinstance(row, list) else list(row) for row in rows]
+        # Пул виджетов строк пересоздается только при смене колонок
+        if list(headers) != self.store.headers:
+            self._destroy_row_widgets()
+        self.store.replace(headers, rows)
+        self.first_row = 0
 
         # Обновить информацию о полях (Шаг 2)
         if headers:
@@ -308,16 +406,11 @@ class DataTab(ctk.CTkFrame):
         # Создать заголовки
         self.create_header_row()
 
-        # Создать виджеты строк
-        for row_data in self.rows:
-            self._add_row_widget(row_data)
-
-        # Скрыть placeholder
-        if self.rows:
-            self.placeholder.pack_forget()
+        # Отрисовать видимые строки
+        self._render_rows()
 
         if self.toast:
-            self.toast.success(f"Загружено {len(self.rows)} строк с {len(headers)} колонками")
+            self.toast.success(f"Загружено {len(self.store)} строк с {len(headers)} колонками")
 
     def create_header_row(self):
         """Создать строку заголовков"""
@@ -356,19 +449,80 @@ class DataTab(ctk.CTkFrame):
         )
         actions_label.grid(row=0, column=len(self.headers) + 1, padx=4, pady=12)
 
-    def _add_row_widget(self, row_data: List[str]):
-        """Добавить виджет строки"""
-        row_widget = DataTableRow(
-            self.table_scroll,
-            self.headers,
-            row_data,
-            len(self.row_widgets),
-            self.delete_row,
-            self.edit_row,
-            self.theme
-        )
-        row_widget.pack(fill="x", pady=2)
-        self.row_widgets.append(row_widget)
+    # ==================== ВИРТУАЛИЗАЦИЯ ====================
+
+    def _visible_count(self) -> int:
+        """Сколько строк помещается в окно таблицы"""
+        height = self.table_viewport.winfo_height()
+        return max(1, height // ROW_HEIGHT + 1)
+
+    def _render_rows(self):
+        """Привязать виджеты пула к видимым строкам хранилища"""
+        total = len(self.store)
+        if not total:
+            for row_widget in self.row_widgets:
+                row_widget.grid_remove()
+            self.placeholder.grid()
+            self.table_scrollbar.set(0.0, 1.0)
+            return
+        self.placeholder.grid_remove()
+
+        visible = self._visible_count()
+        self.first_row = max(0, min(self.first_row, total - visible + 1))
+
+        # Пул растет до размера окна (виджеты не уничтожаются при прокрутке)
+        while len(self.row_widgets) < min(visible, total):
+            row_widget = DataTableRow(
+                self.table_viewport,
+                self.store.headers,
+                self.delete_row,
+                self.edit_row,
+                self.store.set_value,
+                self.theme
+            )
+            self.row_widgets.append(row_widget)
+
+        for slot, row_widget in enumerate(self.row_widgets):
+            row_index = self.first_row + slot
+            if slot < visible and row_index < total:
+                row_widget.bind_row(row_index, self.store.get_row(row_index))
+                row_widget.grid(row=slot, column=0, sticky="ew", pady=2)
+            else:
+                row_widget.row_index = -1
+                row_widget.grid_remove()
+
+        self.table_scrollbar.set(self.first_row / total, min(1.0, (self.first_row + visible) / total))
+
+    def _scroll_to(self, first_row: int):
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self._render_rows()
+
+    def _on_scrollbar(self, *args):
+        """Команда скроллбара: ('moveto', доля) или ('scroll', n, 'units'|'pages')"""
+        total = len(self.store)
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * total))
+        elif args[0] == 'scroll':
+            step = self._visible_count() - 1 if args[2] == 'pages' else 1
+            self._scroll_to(max(0, self.first_row + int(args[1]) * step))
+
+    def _on_mousewheel(self, event):
+        """Прокрутка колесом, если курсор над таблицей"""
+        if not str(event.widget).startswith(str(self.table_viewport)):
+            return
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            direction = -1
+        else:
+            direction = 1
+        self._scroll_to(max(0, self.first_row + direction * 3))
+
+    def _destroy_row_widgets(self):
+        for row_widget in self.row_widgets:
+            row_widget.destroy()
+        self.row_widgets = []
+
+    # ==================== ОПЕРАЦИИ НАД ДАННЫМИ ====================
 
     def add_row(self):
         """Добавить новую строку"""
@@ -379,36 +533,23 @@ class DataTab(ctk.CTkFrame):
 
         # Генерировать умную строку
         new_row = self.parser.smart_fill_row(self.headers)
-        self.rows.append(new_row)
-        self._add_row_widget(new_row)
+        self.store.append_row(new_row)
 
-        # Скрыть placeholder
-        self.placeholder.pack_forget()
+        # Прокрутить к новой строке
+        self.first_row = len(self.store)
+        self._render_rows()
 
         if self.toast:
             self.toast.success("Добавлена новая строка")
 
     def delete_row(self, row_index: int):
         """Удалить строку"""
-        # Проверить валидность индекса для ОБОИХ списков
-        if 0 <= row_index < len(self.row_widgets) and 0 <= row_index < len(self.rows):
-            # Удалить из rows ДО удаления виджета
-            self.rows.pop(row_index)
-
-            # Удалить виджет
-            self.row_widgets[row_index].destroy()
-            self.row_widgets.pop(row_index)
-
-            # Обновить индексы ВСЕХ оставшихся виджетов
-            for i, row_widget in enumerate(self.row_widgets):
-                row_widget.row_index = i
+        if 0 <= row_index < len(self.store):
+            self.store.delete_row(row_index)
+            self._render_rows()
 
             if self.toast:
                 self.toast.success("Строка удалена")
-
-            # Показать placeholder если пусто
-            if not self.rows:
-                self.placeholder.pack(expand=True, pady=100)
         else:
             # Защита от десинхронизации
             if self.toast:
@@ -416,13 +557,9 @@ class DataTab(ctk.CTkFrame):
 
     def edit_row(self, row_index: int, action: str):
         """Редактировать строку"""
-        if action == 'regenerate' and 0 <= row_index < len(self.row_widgets):
-            new_row = self.parser.smart_fill_row(self.headers)
-            row_widget = self.row_widgets[row_index]
-
-            for entry, value in zip(row_widget.entries, new_row):
-                entry.delete(0, 'end')
-                entry.insert(0, value)
+        if action == 'regenerate' and 0 <= row_index < len(self.store):
+            self.store.set_row(row_index, self.parser.smart_fill_row(self.headers))
+            self._render_rows()
 
             if self.toast:
                 self.toast.success("Строка перегенерирована")
@@ -444,22 +581,16 @@ class DataTab(ctk.CTkFrame):
         if num_rows_str:
             try:
                 num_rows = int(num_rows_str)
-                if num_rows <= 0 or num_rows > 1000:
+                if num_rows <= 0 or num_rows > MAX_SMART_FILL_ROWS:
                     if self.toast:
-                        self.toast.error("Введите число от 1 до 1000")
+                        self.toast.error(f"Введите число от 1 до {MAX_SMART_FILL_ROWS}")
                     return
 
-                # Очистить текущие данные
-                self.clear_table()
-
-                # Генерировать строки
-                for _ in range(num_rows):
-                    row = self.parser.smart_fill_row(self.headers)
-                    self.rows.append(row)
-                    self._add_row_widget(row)
-
-                # Скрыть placeholder
-                self.placeholder.pack_forget()
+                # Генерировать строки прямо в хранилище (bulk генерация по колонкам, заменяя текущие данные)
+                headers = self.headers
+                self.store.replace(headers, self.parser.generate_rows(headers, num_rows))
+                self.first_row = 0
+                self._render_rows()
 
                 if self.toast:
                     self.toast.success(f"Сгенерировано {num_rows} строк с реалистичными данными!")
@@ -488,15 +619,13 @@ class DataTab(ctk.CTkFrame):
 
     def export_csv(self):
         """Экспортировать в CSV файл"""
-        if not self.headers or not self.rows:
+        if not self.headers or not len(self.store):
             if self.toast:
                 self.toast.warning("Нет данных для экспорта")
             return
 
-        # Получить актуальные значения из виджетов
-        current_rows = []
-        for row_widget in self.row_widgets:
-            current_rows.append(row_widget.get_values())
+        # Правки ячеек уже в хранилище
+        current_rows = self.store.rows()
 
         filepath = filedialog.asksaveasfilename(
             title="Save CSV file",
@@ -515,11 +644,9 @@ class DataTab(ctk.CTkFrame):
 
     def clear_table(self):
         """Очистить таблицу"""
-        for row_widget in self.row_widgets:
-            row_widget.destroy()
-
-        self.row_widgets = []
-        self.rows = []
+        self.store.replace(self.headers, [])
+        self.first_row = 0
+        self._render_rows()
 
     def get_data(self) -> Tuple[List[str], List[List[str]]]:
         """
@@ -528,8 +655,4 @@ class DataTab(ctk.CTkFrame):
         Returns:
             (headers, rows)
         """
-        current_rows = []
-        for row_widget in self.row_widgets:
-            current_rows.append(row_widget.get_values())
-
-        return self.headers, current_rows
+        return self.headers, self.store.rows()
@@ -7,6 +7,8 @@
 - Default Plugins (upload .zip or folder)
 - Fingerprint overrides (OS, WebRTC, Canvas, Fonts, etc.)
 - Notes field
+- Launch profile (headless, window size, Chromium flags, benchmark)
+- Orphan sweep (очистка профилей прерванных прогонов)
 - Profile templates
 """
 
@@ -16,8 +18,12 @@ from tkinter import filedialog
 from typing import Dict, List, Optional
 from pathlib import Path
 import json
+import threading
 import requests
 
+from src.api.octobrowser_api import OctobrowserAPI
+from src.api.profile_sweeper import ProfileSweeper
+
 
 class OctoAPITab(ctk.CTkScrollableFrame):
     """
@@ -332,10 +338,96 @@ class OctoAPITab(ctk.CTkScrollableFrame):
         )
         self.notes_textbox.pack(fill="both", padx=16, pady=16)
 
+        # === LAUNCH PROFILE ===
+        launch_section = self.create_collapsible_section(
+            "🚀 Launch Profile (headless / rendering)",
+            row=7
+        )
+
+        mode_frame = ctk.CTkFrame(launch_section, fg_color="transparent")
+        mode_frame.pack(fill="x", padx=16, pady=(16, 8))
+
+        ctk.CTkLabel(
+            mode_frame,
+            text="Launch Mode:",
+            font=('Segoe UI', 11),
+            text_color=self.theme['text_secondary'],
+            width=150,
+            anchor="w"
+        ).pack(side="left", padx=(0, 8))
+
+        self.launch_mode_var = tk.StringVar(value="Headed")
+        launch_mode_segment = ctk.CTkSegmentedButton(
+            mode_frame,
+            values=["Headed", "Headless"],
+            variable=self.launch_mode_var,
+            fg_color=self.theme['bg_tertiary'],
+            selected_color=self.theme['accent_primary'],
+            font=('Segoe UI', 10)
+        )
+        launch_mode_segment.pack(side="left", fill="x", expand=True)
+        launch_mode_segment.set("Headed")
+
+        window_frame = ctk.CTkFrame(launch_section, fg_color="transparent")
+        window_frame.pack(fill="x", padx=16, pady=8)
+
+        ctk.CTkLabel(
+            window_frame,
+            text="Window Size:",
+            font=('Segoe UI', 11),
+            text_color=self.theme['text_secondary'],
+            width=150,
+            anchor="w"
+        ).pack(side="left", padx=(0, 8))
+
+        self.window_size_entry = ctk.CTkEntry(
+            window_frame,
+            placeholder_text="1280x720 (пусто = по fingerprint)",
+            height=36,
+            font=('Consolas', 10)
+        )
+        self.window_size_entry.pack(side="left", fill="x", expand=True)
+
+        # Disable GPU
+        self.disable_gpu_var = tk.BooleanVar(value=False)
+        ctk.CTkSwitch(
+            launch_section,
+            text="Disable GPU (--disable-gpu)",
+            variable=self.disable_gpu_var,
+            font=('Segoe UI', 11)
+        ).pack(anchor="w", padx=16, pady=8)
+
+        # Disable background throttling
+        self.disable_throttling_var = tk.BooleanVar(value=False)
+        ctk.CTkSwitch(
+            launch_section,
+            text="Disable Background Throttling",
+            variable=self.disable_throttling_var,
+            font=('Segoe UI', 11)
+        ).pack(anchor="w", padx=16, pady=8)
+
+        # Launch benchmark
+        self.launch_benchmark_var = tk.BooleanVar(value=False)
+        ctk.CTkSwitch(
+            launch_section,
+            text="Benchmark Launches (start latency + RSS → launch_benchmark.csv)",
+            variable=self.launch_benchmark_var,
+            font=('Segoe UI', 11)
+        ).pack(anchor="w", padx=16, pady=(8, 4))
+
+        ctk.CTkLabel(
+            launch_section,
+            text="💡 Headless + Disable GPU снимают нагрузку с композитора при 20+ параллельных профилях",
+            font=('Segoe UI', 9),
+            text_color=self.theme.get('text_muted', '#888888'),
+            anchor="w",
+            wraplength=600
+        ).pack(anchor="w", padx=16, pady=(0, 16))
+
         # === ADVANCED SETTINGS ===
         advanced_section = self.create_collapsible_section(
             "⚙️ Advanced Settings",
-            row=7
+            row=8
         )
 
         # OTP Handler Enable/Disable
@@ -360,7 +452,7 @@ class OctoAPITab(ctk.CTkScrollableFrame):
         # === TEST SECTION ===
         test_section = self.create_collapsible_section(
             "🧪 Тестирование API (отладка)",
-            row=8
+            row=9
         )
 
         # Информация о тестировании
@@ -401,6 +493,18 @@ class OctoAPITab(ctk.CTkScrollableFrame):
             font=('Segoe UI', 12, 'bold')
         ).grid(row=0, column=1, padx=(6, 0), pady=4, sticky="ew")
 
+        # Orphan sweep button
+        self.sweep_btn = ctk.CTkButton(
+            test_buttons_frame,
+            text="🧹 Остановить профили прерванных прогонов",
+            command=self.sweep_orphan_profiles,
+            height=40,
+            fg_color=self.theme['accent_warning'],
+            hover_color=self.theme['bg_hover'],
+            font=('Segoe UI', 12, 'bold')
+        )
+        self.sweep_btn.grid(row=1, column=0, columnspan=2, pady=4, sticky="ew")
+
         # Статус тестового профиля
         self.test_profile_status = ctk.CTkLabel(
             test_section,
@@ -413,7 +517,7 @@ class OctoAPITab(ctk.CTkScrollableFrame):
 
         # === BUTTONS FRAME ===
         buttons_frame = ctk.CTkFrame(self, fg_color="transparent")
-        buttons_frame.grid(row=9, column=0, padx=32, pady=32, sticky="ew")
+        buttons_frame.grid(row=10, column=0, padx=32, pady=32, sticky="ew")
         buttons_frame.grid_columnconfigure(0, weight=1)
 
         # Save button
@@ -645,6 +749,46 @@ class OctoAPITab(ctk.CTkScrollableFrame):
             if self.toast:
                 self.toast.error(f"❌ Ошибка: {str(e)}")
 
+    def sweep_orphan_profiles(self):
+        """🧹 Остановить "Auto Profile ..." старше 30 минут, оставшиеся от прерванных прогонов"""
+        token = self.token_entry.get().strip()
+        base_url = self.base_url_entry.get().strip()
+
+        if not token:
+            if self.toast:
+                self.toast.warning("⚠️ Введите API Token")
+            return
+
+        if self.toast:
+            self.toast.info("🧹 Ищу профили прерванных прогонов...")
+        self.sweep_btn.configure(state="disabled")
+
+        def sweep_thread():
+            try:
+                api = OctobrowserAPI(token, base_url)
+                report = api.sweep_orphan_profiles(min_age_minutes=30)
+                message = ProfileSweeper.format_report(report)
+                print(f"[SWEEP] {message}")
+                for profile_uuid in report['failed']:
+                    print(f"[SWEEP] [FAIL]   {profile_uuid}")
+
+                if self.toast:
+                    notify = self.toast.success if not report['failed'] else self.toast.warning
+                    self.after(0, lambda: notify(
+                        f"🧹 Освобождено слотов: {report['slots_recovered']}\n"
+                        f"Найдено: {report['orphans']}, ошибок: {len(report['failed'])}"
+                    ))
+            except Exception as e:
+                print(f"[SWEEP] ❌ Exception: {e}")
+                if self.toast:
+                    error_msg = str(e)
+                    self.after(0, lambda m=error_msg: self.toast.error(f"❌ Ошибка очистки: {m}"))
+            finally:
+                self.after(0, lambda: self.sweep_btn.configure(state="normal"))
+
+        thread = threading.Thread(target=sweep_thread, daemon=True)
+        thread.start()
+
     def test_start_profile(self):
         """🧪 Тестовый запуск профиля через Local API"""
         import time
@@ -685,7 +829,21 @@ class OctoAPITab(ctk.CTkScrollableFrame):
                 self.toast.info("⏳ Ожидание синхронизации Cloud → Local...")
             time.sleep(5)
 
-            # ШАГ 3: Запуск профиля
+            # ШАГ 3: Запуск профиля (с текущим профилем запуска)
+            launch = self.get_launch_config()
+            launch_flags = []
+            window_size = launch['window_size'].lower().replace(' ', '')
+            if 'x' in window_size:
+                launch_flags.append(f"--window-size={window_size.replace('x', ',')}")
+            if launch['disable_gpu']:
+                launch_flags.append('--disable-gpu')
+            if launch['disable_throttling']:
+                launch_flags += [
+                    '--disable-background-timer-throttling',
+                    '--disable-backgrounding-occluded-windows',
+                    '--disable-renderer-backgrounding'
+                ]
+
             max_retries = 8
             for attempt in range(max_retries):
                 try:
@@ -715,8 +873,9 @@ class OctoAPITab(ctk.CTkScrollableFrame):
                         json={
                             "uuid": self.test_profile_uuid,
                             "debug_port": True,
-                            "headless": False,
+                            "headless": launch['headless'],
                             "only_local": True,
+                            "flags": launch_flags,
                             "timeout": 120
                         },
                         timeout=120
@@ -824,6 +983,9 @@ class OctoAPITab(ctk.CTkScrollableFrame):
         self.config['geolocation']['latitude'] = self.lat_entry.get().strip()
         self.config['geolocation']['longitude'] = self.lon_entry.get().strip()
 
+        # Launch profile
+        self.config['launch_profile'] = self.get_launch_config()
+
         # OTP Handler
         self.config.setdefault('otp', {})
         self.config['otp']['enabled'] = self.otp_enabled_var.get()
@@ -889,6 +1051,16 @@ class OctoAPITab(ctk.CTkScrollableFrame):
             if lon:
                 self.lon_entry.insert(0, lon)
 
+        # Launch profile
+        launch = self.config.get('launch_profile', {})
+        if launch:
+            self.launch_mode_var.set("Headless" if launch.get('headless') else "Headed")
+            if launch.get('window_size'):
+                self.window_size_entry.insert(0, launch['window_size'])
+            self.disable_gpu_var.set(launch.get('disable_gpu', False))
+            self.disable_throttling_var.set(launch.get('disable_throttling', False))
+            self.launch_benchmark_var.set(launch.get('benchmark', False))
+
         # OTP Handler
         otp_config = self.config.get('otp', {})
         otp_enabled = otp_config.get('enabled', False)
@@ -937,4 +1109,22 @@ class OctoAPITab(ctk.CTkScrollableFrame):
             except:
                 pass
 
+        # Профиль запуска браузера
+        config['launch'] = self.get_launch_config()
+
         return config
+
+    def get_launch_config(self) -> Dict:
+        """
+        Получить профиль запуска браузера (headless, размер окна, флаги, бенчмарк)
+
+        Returns:
+            Словарь с настройками запуска
+        """
+        return {
+            'headless': self.launch_mode_var.get() == "Headless",
+            'window_size': self.window_size_entry.get().strip(),
+            'disable_gpu': self.disable_gpu_var.get(),
+            'disable_throttling': self.disable_throttling_var.get(),
+            'benchmark': self.launch_benchmark_var.get()
+        }
@@ -4,7 +4,7 @@
 Функции:
 - Добавление/удаление прокси
 - Import from file (txt with proxy list)
-- Test proxy connection
+- Test proxy connection (массовая проверка ограниченным пулом, сортировка по латентности)
 - Random rotation per thread
 - Support for HTTP, HTTPS, SOCKS5
 - 🔥 9Proxy API интеграция для динамической ротации
@@ -22,6 +22,14 @@ import threading
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.utils.proxy_manager import NineProxyManager
+from src.utils.proxy_tester import BulkProxyTester
+
+# Размер пула потоков массовой проверки прокси
+PROXY_TEST_WORKERS = 64
+
+# Период опроса результатов проверки (мс) и максимум строк за одно обновление UI
+PROXY_TEST_PUMP_MS = 100
+PROXY_TEST_PUMP_BATCH = 200
 
 
 class ProxyRow(ctk.CTkFrame):
@@ -36,20 +44,21 @@ class ProxyRow(ctk.CTkFrame):
         self.on_delete = on_delete
         self.on_test = on_test
         self.theme = theme
+        self.latency = None  # Измеренная латентность (секунды), None - не проверен или ошибка
 
         self.create_widgets()
 
     def create_widgets(self):
         """Создать виджеты строки"""
         # Row number
-        row_num = ctk.CTkLabel(
+        self.row_num = ctk.CTkLabel(
             self,
             text=str(self.row_index + 1),
             width=40,
             font=('Consolas', 11),
             text_color=self.theme['text_secondary']
         )
-        row_num.pack(side="left", padx=4)
+        self.row_num.pack(side="left", padx=4)
 
         # Proxy string entry
         self.proxy_entry = ctk.CTkEntry(
@@ -68,7 +77,7 @@ class ProxyRow(ctk.CTkFrame):
         self.status_label = ctk.CTkLabel(
             self,
             text="⚪ Not tested",
-            width=100,
+            width=180,
             font=('Consolas', 10),
             text_color=self.theme['text_tertiary']
         )
@@ -105,6 +114,24 @@ class ProxyRow(ctk.CTkFrame):
         proxy_string = self.proxy_entry.get()
         self.on_test(self.row_index, proxy_string, self.update_status)
 
+    def set_row_index(self, row_index: int):
+        """Обновить индекс и номер строки (после удаления/сортировки)"""
+        self.row_index = row_index
+        self.row_num.configure(text=str(row_index + 1))
+
+    def set_testing(self):
+        """Пометить строку как проверяемую"""
+        self.latency = None
+        self.status_label.configure(text="⏳ Testing...", text_color=self.theme['text_tertiary'])
+
+    def apply_result(self, result: Dict):
+        """Показать результат BulkProxyTester.test_one"""
+        self.latency = result['latency'] if result['ok'] else None
+        if result['ok']:
+            self.update_status(True, f"{result['latency'] * 1000:.0f} ms · {result['exit_ip']}")
+        else:
+            self.update_status(False, result['error'] or "Failed")
+
     def update_status(self, success: bool, message: str):
         """Обновить статус тестирования"""
         if success:
@@ -148,6 +175,10 @@ class ProxyTab(ctk.CTkFrame):
         self.nine_proxy_manager = None
         self.nine_proxy_enabled = False
 
+        # 🔥 Массовая проверка прокси (результаты забирает один after() цикл)
+        self.proxy_tester = None
+        self._test_targets = {}
+
         self.create_widgets()
 
         # Загрузить сохраненные прокси
@@ -185,6 +216,7 @@ class ProxyTab(ctk.CTkFrame):
             ("📂 Import File", self.import_proxies, self.theme['accent_secondary']),
             ("💾 Save", self.save_proxies, self.theme['accent_primary']),
             ("🔍 Test All", self.test_all_proxies, self.theme['accent_info']),
+            ("⏱ Sort by Latency", self.sort_by_latency, self.theme['accent_secondary']),
             ("🗑️ Clear All", self.clear_all, self.theme['accent_error'])
         ]
 
@@ -932,7 +964,7 @@ class ProxyTab(ctk.CTkFrame):
 
             # Обновить индексы
             for i, widget in enumerate(self.proxy_widgets):
-                widget.row_index = i
+                widget.set_row_index(i)
 
             self.update_count()
 
@@ -980,23 +1012,34 @@ class ProxyTab(ctk.CTkFrame):
             proxy_string: Прокси строка
             callback: Функция обратного вызова для обновления статуса
         """
-        # TODO: Реализовать реальное тестирование через requests
-        # Пока что - заглушка
-        import threading
-        import time
+        tester = BulkProxyTester(workers=1, timeout=self._get_test_timeout())
+        if 0 <= row_index < len(self.proxy_widgets):
+            self.proxy_widgets[row_index].set_testing()
 
         def test_thread():
-            time.sleep(1)  # Симуляция теста
-            # Простая валидация формата
-            is_valid = self._validate_proxy_format(proxy_string)
-            if is_valid:
-                callback(True, "Valid")
-            else:
-                callback(False, "Invalid format")
+            result = tester.test_one(proxy_string)
+            self.after(0, lambda: self._apply_single_result(row_index, proxy_string, result, callback))
 
         thread = threading.Thread(target=test_thread, daemon=True)
         thread.start()
 
+    def _apply_single_result(self, row_index: int, proxy_string: str, result: Dict, callback: Callable):
+        """Показать результат проверки одной строки (в главном потоке)"""
+        widget = self.proxy_widgets[row_index] if 0 <= row_index < len(self.proxy_widgets) else None
+        if widget is not None and widget.get_proxy() == proxy_string:
+            widget.apply_result(result)
+        elif widget is None or not widget.winfo_exists():
+            return  # Строку удалили, пока шла проверка
+        elif result['ok']:
+            callback(True, f"{result['latency'] * 1000:.0f} ms · {result['exit_ip']}")
+        else:
+            callback(False, result['error'] or "Failed")
+
+    def _get_test_timeout(self) -> int:
+        """Таймаут проверки одного прокси из настроек"""
+        value = self.timeout_entry.get().strip()
+        return int(value) if value.isdigit() and int(value) > 0 else 10
+
     def _validate_proxy_format(self, proxy_string: str) -> bool:
         """Валидация формата прокси"""
         # Поддерживаемые форматы:
@@ -1019,23 +1062,89 @@ class ProxyTab(ctk.CTkFrame):
         return False
 
     def test_all_proxies(self):
-        """Тестировать все прокси"""
+        """
+        Тестировать все прокси
+
+        Проверка идет в BulkProxyTester (ограниченный пул потоков, дубликаты
+        проверяются один раз), результаты пачками применяются в _pump_test_results.
+        """
         if not self.proxy_widgets:
             if self.toast:
                 self.toast.warning("Нет прокси для тестирования")
             return
 
-        if self.toast:
-            self.toast.info(f"Тестирую {len(self.proxy_widgets)} прокси...")
+        if self.proxy_tester and self.proxy_tester.is_running():
+            if self.toast:
+                self.toast.warning("Проверка уже идет")
+            return
 
+        # Строка прокси -> виджеты с ней (результат дубликата применяется ко всем)
+        self._test_targets = {}
         for widget in self.proxy_widgets:
-            widget.test_proxy()
+            self._test_targets.setdefault(widget.get_proxy().strip(), []).append(widget)
+            widget.set_testing()
+
+        self.proxy_tester = BulkProxyTester(workers=PROXY_TEST_WORKERS, timeout=self._get_test_timeout())
+        self.proxy_tester.start(list(self._test_targets.keys()))
+
+        if self.toast:
+            message = f"Тестирую {self.proxy_tester.total} прокси..."
+            if self.proxy_tester.duplicates:
+                message += f" (дубликатов: {self.proxy_tester.duplicates})"
+            self.toast.info(message)
+
+        self.after(PROXY_TEST_PUMP_MS, self._pump_test_results)
+
+    def _pump_test_results(self):
+        """Забрать готовые результаты проверки и обновить строки (главный поток)"""
+        tester = self.proxy_tester
+        if tester is None:
+            return
+
+        for result in tester.drain(PROXY_TEST_PUMP_BATCH):
+            for proxy_string in result.get('proxies', [result['proxy']]):
+                for widget in self._test_targets.get(proxy_string, []):
+                    if widget.winfo_exists():
+                        widget.apply_result(result)
+
+        if tester.is_running():
+            self.count_label.configure(text=f"Tested: {tester.done}/{tester.total}")
+            self.after(PROXY_TEST_PUMP_MS, self._pump_test_results)
+            return
+
+        self._test_targets = {}
+        self.update_count()
+        working = sum(1 for widget in self.proxy_widgets if widget.latency is not None)
+        if self.toast:
+            self.toast.success(f"Проверка завершена: рабочих {working} из {len(self.proxy_widgets)}")
+
+    def sort_by_latency(self):
+        """Отсортировать список по измеренной латентности (непроверенные и нерабочие - в конце)"""
+        if not self.proxy_widgets:
+            return
+
+        if self.proxy_tester and self.proxy_tester.is_running():
+            if self.toast:
+                self.toast.warning("Дождитесь окончания проверки")
+            return
+
+        self.proxy_widgets.sort(key=lambda widget: (widget.latency is None, widget.latency or 0))
+        self.proxies = [widget.get_proxy() for widget in self.proxy_widgets]
+
+        for i, widget in enumerate(self.proxy_widgets):
+            widget.pack_forget()
+            widget.set_row_index(i)
+            widget.pack(fill="x", pady=2)
 
     def clear_all(self):
         """Очистить все прокси"""
         if not self.proxy_widgets:
             return
 
+        if self.proxy_tester:
+            self.proxy_tester.cancel()
+        self._test_targets = {}
+
         for widget in self.proxy_widgets:
             widget.destroy()
 
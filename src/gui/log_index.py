@@ -0,0 +1,202 @@
+"""
+🔎 Log Index - индекс строк лога прогона
+
+Строки разбираются по мере поступления (LogPump.push), а текст лежит
+в полном логе на диске. В памяти только:
+- смещение каждой строки в файле лога
+- posting-списки номеров строк: поток, итерация, тег ([DYNAMIC_QA], [9PROXY]...),
+  уровень (ERROR / WARNING / SUCCESS / INFO) и слова (для поиска)
+
+Фильтр по потоку/итерации пересекает списки, поиск по тексту сначала сужает
+кандидатов по словарю слов и только их перечитывает с диска для проверки -
+весь лог заново не сканируется. Слова словаря, содержащие слово запроса,
+находятся через триграммы словаря, а не перебором всех слов.
+
+Ограничения:
+- индексируются слова от 3 символов: запрос только из коротких слов ("OK", "id")
+  не сужается, и LogPump.search проверяет строки с конца лога подряд
+- индекс растет с логом: LogPump сбрасывает его при очистке логов и по лимиту
+  строк (более ранние строки остаются только в файле)
+"""
+
+import re
+import threading
+from array import array
+from typing import Dict, List, Optional, Set
+
+
+# Префикс строк worker потоков из runtime (ThreadTaggedStdout): [T3 #1234]
+_PREFIX_RE = re.compile(r'\[T(\d+) #(\d+)\] ')
+# Строки без префикса: заголовок задачи и теги с номерами
+_HEADER_RE = re.compile(r'# THREAD (\d+) \| ITERATION (\d+)')
+_THREAD_RE = re.compile(r'\[THREAD (\d+)\]')
+_ITERATION_RE = re.compile(r'\[ITERATION (\d+)\]')
+# Тег строки: первый [ЗАГЛАВНЫЙ_ТЕГ] после времени и префикса потока
+_TAG_RE = re.compile(r'\[([A-Z0-9][A-Z0-9_ ]*[A-Z_])(?: \d+)?\]')
+_WORD_RE = re.compile(r'\w{3,}')
+
+_ERROR_MARKERS = ('[ERROR]', '[FAIL', 'Traceback', '[X]')
+_WARNING_MARKERS = ('[WARN', '[!]')
+_SUCCESS_MARKERS = ('[OK]', '[SUCCESS]', '[DONE]')
+
+LEVELS = ('INFO', 'SUCCESS', 'WARNING', 'ERROR')
+
+
+class LogIndex:
+    """Индекс строк лога: поток, итерация, тег, уровень, слова -> номера строк"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.offsets = array('q')  # номер строки -> смещение в файле лога
+        self.gui_tags: List[str] = []  # номер строки -> тег цвета в GUI
+        self.by_thread: Dict[int, array] = {}
+        self.by_iteration: Dict[int, array] = {}
+        self.by_tag: Dict[str, array] = {}
+        self.by_level: Dict[str, array] = {}
+        self.words: Dict[str, array] = {}
+        self._grams: Dict[str, Set[str]] = {}  # триграмма -> слова словаря с ней
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def add(self, offset: int, formatted: str, gui_tag: str = "INFO") -> int:
+        """
+        Проиндексировать строку
+
+        Args:
+            offset: Смещение строки в файле лога
+            formatted: Строка как в логе ("[HH:MM:SS] сообщение\\n")
+            gui_tag: Тег цвета из append_log (INFO, ERROR, ...)
+
+        Returns:
+            Номер строки
+        """
+        thread_id, iteration = self._parse_context(formatted)
+        match = _TAG_RE.search(formatted, 11)  # после "[HH:MM:SS] "
+        tag = match.group(1) if match else None
+        level = self._parse_level(formatted, gui_tag)
+        words = set(_WORD_RE.findall(formatted[11:].lower()))
+
+        with self._lock:
+            line = len(self.offsets)
+            self.offsets.append(offset)
+            self.gui_tags.append(level if gui_tag == "INFO" and level != "INFO" else gui_tag)
+            if thread_id is not None:
+                self._post(self.by_thread, thread_id, line)
+            if iteration is not None:
+                self._post(self.by_iteration, iteration, line)
+            if tag:
+                self._post(self.by_tag, tag, line)
+            self._post(self.by_level, level, line)
+            for word in words:
+                if word not in self.words:
+                    for gram in self._trigrams(word):
+                        self._grams.setdefault(gram, set()).add(word)
+                self._post(self.words, word, line)
+        return line
+
+    def query(self, thread: Optional[int] = None, iteration: Optional[int] = None, tag: Optional[str] = None,
+              level: Optional[str] = None, text: str = '') -> Optional[List[int]]:
+        """
+        Номера строк, подходящих под все фильтры (по возрастанию)
+
+        Текст ищется по словарю: строка-кандидат содержит слово, в которое входит
+        каждое слово запроса. Точное вхождение всей фразы проверяет LogPump.search.
+
+        Returns:
+            Список номеров строк или None, если сузить нечем (кандидат - весь лог)
+        """
+        with self._lock:
+            postings = []
+            for mapping, key in ((self.by_thread, thread), (self.by_iteration, iteration),
+                                 (self.by_tag, tag), (self.by_level, level)):
+                if key is not None:
+                    postings.append(set(mapping.get(key, ())))
+            for word in set(_WORD_RE.findall(text.lower())):
+                matched = set()
+                for token in self._tokens_containing(word):
+                    matched.update(self.words[token])
+                postings.append(matched)
+
+        if not postings:
+            return None
+        postings.sort(key=len)
+        result = postings[0]
+        for other in postings[1:]:
+            result = result & other
+            if not result:
+                break
+        return sorted(result)
+
+    def tail(self, count: int, start: int = 0) -> List[int]:
+        """Номера последних count строк (не раньше start)"""
+        total = len(self.offsets)
+        return list(range(max(start, total - count), total))
+
+    def threads(self) -> List[int]:
+        with self._lock:
+            return sorted(self.by_thread)
+
+    def tags(self) -> List[str]:
+        with self._lock:
+            return sorted(self.by_tag)
+
+    def clear(self):
+        with self._lock:
+            self.offsets = array('q')
+            self.gui_tags = []
+            for mapping in (self.by_thread, self.by_iteration, self.by_tag, self.by_level, self.words, self._grams):
+                mapping.clear()
+
+    # ==================== ВНУТРЕННЕЕ ====================
+
+    @staticmethod
+    def _trigrams(word: str) -> Set[str]:
+        return {word[i:i + 3] for i in range(len(word) - 2)}
+
+    def _tokens_containing(self, word: str) -> Set[str]:
+        """Слова словаря, содержащие word (пересечение по триграммам + проверка). Вызывается под _lock"""
+        tokens = None
+        for gram in sorted(self._trigrams(word), key=lambda g: len(self._grams.get(g, ()))):
+            with_gram = self._grams.get(gram)
+            if not with_gram:
+                return set()
+            tokens = set(with_gram) if tokens is None else tokens & with_gram
+            if not tokens:
+                return set()
+        return {token for token in tokens if word in token} if tokens else set()
+
+    @staticmethod
+    def _post(mapping: Dict, key, line: int):
+        postings = mapping.get(key)
+        if postings is None:
+            postings = mapping[key] = array('I')
+        postings.append(line)
+
+    @staticmethod
+    def _parse_context(formatted: str):
+        """(поток, итерация) строки: префикс runtime, заголовок задачи или [THREAD n] / [ITERATION n]"""
+        match = _PREFIX_RE.search(formatted, 11)
+        if match:
+            return int(match.group(1)), int(match.group(2))
+
+        match = _HEADER_RE.search(formatted)
+        if match:
+            return int(match.group(1)), int(match.group(2))
+
+        thread_match = _THREAD_RE.search(formatted)
+        iteration_match = _ITERATION_RE.search(formatted)
+        return (int(thread_match.group(1)) if thread_match else None,
+                int(iteration_match.group(1)) if iteration_match else None)
+
+    @staticmethod
+    def _parse_level(formatted: str, gui_tag: str) -> str:
+        if gui_tag in ('ERROR', 'WARNING', 'SUCCESS'):
+            return gui_tag
+        if any(marker in formatted for marker in _ERROR_MARKERS):
+            return 'ERROR'
+        if any(marker in formatted for marker in _WARNING_MARKERS):
+            return 'WARNING'
+        if any(marker in formatted for marker in _SUCCESS_MARKERS):
+            return 'SUCCESS'
+        return 'INFO'
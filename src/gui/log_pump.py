@@ -0,0 +1,238 @@
+"""
+📋 Log Pump - потокобезопасная доставка логов в GUI пачками
+
+Runner читает stdout скрипта в своем потоке и раньше вставлял каждую строку
+прямо в CTkTextbox (insert + see на строку, вне главного потока Tk).
+Теперь:
+- push() из любого потока: строка сразу пишется в полный лог на диске
+  и кладется в ограниченную очередь (старые строки вытесняются, если GUI отстал)
+- главный поток Tk раз в interval_ms забирает всю очередь через after()
+  и отдает ее sink одной пачкой
+- виджет держит только последние строки (кольцевой буфер), полный лог - в файле
+- каждая строка индексируется (LogIndex: поток, итерация, тег, уровень, слова ->
+  смещения в файле) - фильтры и поиск во вкладке Логи читают с диска только
+  найденные строки
+- индекс и строки без диска освобождаются при очистке логов (clear) и сбрасываются
+  по лимиту max_index_lines - память не растет за всю сессию GUI
+"""
+
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .log_index import LogIndex
+
+
+DEFAULT_LOG_DIR = Path(__file__).resolve().parents[2] / 'logs'
+
+
+class LogPump:
+    """Очередь строк лога от любых потоков -> пачки в главном потоке Tk"""
+
+    def __init__(self, root, sink: Callable[[List[Tuple[str, str]]], None], max_pending: int = 5000,
+                 interval_ms: int = 100, log_dir: Optional[Path] = DEFAULT_LOG_DIR,
+                 max_index_lines: int = 200_000):
+        """
+        Args:
+            root: Tk виджет, через after() которого идет опрос очереди
+            sink: Обработчик пачки [(строка, тег)] - вызывается только в главном потоке
+            max_pending: Сколько строк ждет отрисовки (лишние вытесняются, на диске остаются)
+            interval_ms: Период опроса очереди
+            log_dir: Папка полного лога (None - без записи на диск)
+            max_index_lines: Строк в индексе до сброса (более ранние - только в файле лога)
+        """
+        self.root = root
+        self.sink = sink
+        self.max_pending = max_pending
+        self.interval_ms = interval_ms
+        self.log_dir = Path(log_dir) if log_dir else None
+        self.log_path: Optional[Path] = None
+        self.max_index_lines = max(1, max_index_lines)
+        self.index = LogIndex()
+
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._dropped = 0
+        self._file = None
+        self._file_failed = False
+        self._offset = 0
+        # Строки без диска (log_dir=None или ошибка записи): смещение в индексе -(номер + 1)
+        self._memory_lines: List[bytes] = []
+        self._running = False
+        self._after_id = None
+
+    def start(self):
+        """Начать опрос очереди (вызывать из главного потока)"""
+        if not self._running:
+            self._running = True
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        """Остановить опрос, отрисовать остаток и закрыть файл лога"""
+        self._running = False
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._drain()
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def push(self, message: str, tag: str = "INFO"):
+        """Добавить сообщение в лог (потокобезопасно)"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        formatted = f"[{timestamp}] {message}\n"
+
+        with self._lock:
+            if len(self.index) >= self.max_index_lines:
+                self._reset_index()
+                print(f"[LOG PUMP] Индекс лога сброшен после {self.max_index_lines} строк "
+                      f"(ранние строки - в файле {self.log_path or '-'})")
+            offset = self._write_disk(formatted)
+            self.index.add(offset, formatted, tag)
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self._dropped += 1
+            self._pending.append((formatted, tag))
+
+    def clear(self):
+        """Сбросить неотрисованные строки и индекс (полный лог на диске остается)"""
+        with self._lock:
+            self._pending.clear()
+            self._dropped = 0
+            self._reset_index()
+
+    def tail(self, count: int) -> List[Tuple[str, str]]:
+        """
+        Последние count строк лога для возврата вкладки в живой режим
+
+        Очередь сбрасывается вместе со снимком индекса: строки из очереди уже
+        попали в снимок и не должны отрисоваться второй раз.
+        """
+        with self._lock:
+            self._pending.clear()
+            self._dropped = 0
+            numbers = self.index.tail(count)
+        return self.read_lines(numbers)
+
+    def search(self, limit: int, text: str = '', **filters) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        Строки лога под фильтры индекса и текст (последние limit совпадений)
+
+        Текст из одних коротких слов (< 3 символов) индекс не сужает - строки
+        проверяются с конца лога, пока не наберется limit совпадений.
+
+        Args:
+            limit: Сколько последних совпадений вернуть
+            text: Подстрока без учета регистра
+            filters: thread, iteration, tag, level - см. LogIndex.query
+
+        Returns:
+            ([(строка, тег)] по возрастанию, сколько строк прочитано с диска)
+        """
+        candidates = self.index.query(text=text, **filters)
+        if candidates is None:
+            candidates = range(len(self.index))
+
+        if not text:
+            return self.read_lines(candidates[-limit:]), min(len(candidates), limit)
+
+        # Проверяем фразу целиком на кандидатах с конца, пока не наберем limit
+        needle = text.lower()
+        found, scanned, end = [], 0, len(candidates)
+        while end > 0 and len(found) < limit:
+            chunk = candidates[max(0, end - 500):end]
+            end -= len(chunk)
+            scanned += len(chunk)
+            matched = [line for line in self.read_lines(chunk) if needle in line[0].lower()]
+            found[:0] = matched
+        return found[-limit:], scanned
+
+    def read_lines(self, numbers: Sequence[int]) -> List[Tuple[str, str]]:
+        """
+        Прочитать строки лога по номерам из индекса
+
+        Returns:
+            [(строка, тег)] в порядке numbers
+        """
+        index = self.index
+        result = []
+        with self._lock:
+            if self._file:
+                self._file.flush()
+            reader = open(self.log_path, 'rb') if self.log_path and self.log_path.exists() else None
+        try:
+            for number in numbers:
+                offset = index.offsets[number]
+                if offset < 0:
+                    raw = self._memory_lines[-offset - 1]
+                elif reader:
+                    reader.seek(offset)
+                    raw = reader.readline()
+                else:
+                    continue
+                result.append((raw.decode('utf-8', errors='replace'), index.gui_tags[number]))
+        finally:
+            if reader:
+                reader.close()
+        return result
+
+    # ==================== ВНУТРЕННЕЕ ====================
+
+    def _reset_index(self):
+        """Новый пустой индекс и освобождение строк без диска (вызывается под _lock)"""
+        self.index.clear()
+        self._memory_lines = []
+
+    def _drain(self):
+        """Забрать всю очередь и отдать sink одной пачкой (главный поток)"""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+            if self._file:
+                self._file.flush()
+
+        if dropped:
+            where = f" - полный лог: {self.log_path}" if self.log_path else ""
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            batch.insert(0, (f"[{timestamp}] [LOG] GUI не успевал, пропущено {dropped} строк{where}\n", "WARNING"))
+
+        if batch:
+            try:
+                self.sink(batch)
+            except Exception as e:
+                print(f"[LOG PUMP] Ошибка отрисовки пачки: {e}")
+
+        if self._running:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def _write_disk(self, formatted: str) -> int:
+        """
+        Записать строку в полный лог сессии (вызывается под _lock)
+
+        Returns:
+            Смещение строки в файле (отрицательное - строка хранится в памяти)
+        """
+        data = formatted.encode('utf-8')
+        if self.log_dir and not self._file_failed:
+            try:
+                if self._file is None:
+                    self.log_dir.mkdir(parents=True, exist_ok=True)
+                    self.log_path = self.log_dir / f"gui_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+                    self._file = open(self.log_path, 'ab')
+                    self._offset = self._file.tell()
+                    print(f"[LOG PUMP] Полный лог: {self.log_path}")
+                self._file.write(data)
+                offset = self._offset
+                self._offset += len(data)
+                return offset
+            except OSError as e:
+                self._file_failed = True
+                print(f"[LOG PUMP] Запись лога на диск отключена: {e}")
+
+        self._memory_lines.append(data)
+        return -len(self._memory_lines)
@@ -12,6 +12,9 @@
 - Статусбар с прогрессом
 """
 
+# ⏱️ Трассировка запуска начинается до остальных импортов (фаза "Импорт модулей GUI")
+from ..utils.startup_trace import STARTUP_TRACE
+
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog
@@ -19,25 +22,26 @@ import json
 import os
 import threading
 import importlib
+import time
+from collections import deque
+from functools import cached_property
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Literal
+from typing import Optional, Literal, TYPE_CHECKING
 
 # Импорты из проекта
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.api.octobrowser_api import OctobrowserAPI
-from src.utils.script_parser import ScriptParser
-from src.utils.selenium_ide_parser import SeleniumIDEParser
-from src.utils.playwright_parser import PlaywrightParser
-from src.utils.data_parser import SmartDataParser
-from src.sms.provider_manager import ProviderManager
-from src.data.dynamic_field import DynamicFieldManager
+# 🔥 Парсеры, SMS менеджер, Faker, requests и вкладки импортируются лениво (при первом обращении)
+if TYPE_CHECKING:
+    from src.api.octobrowser_api import OctobrowserAPI
 
 # Modern UI Components
 from .themes import ModernTheme, ButtonStyles
-from .components import ToastManager, DataTab, ProxyTab, OctoAPITab
+from .components import ToastManager
+from .log_pump import LogPump
+from .log_index import LEVELS as LOG_LEVELS
 
 
 def discover_providers():
@@ -62,8 +66,22 @@ class ModernAppV3(ctk.CTk):
     Коммерческий уровень за $499!
     """
 
+    # Вкладки CTkTabview
+    TAB_EDIT = "🚀 Автоматизация"
+    TAB_DATA = "📊 Data"
+    TAB_PROXIES = "🌐 Proxies"
+    TAB_OCTO = "🐙 Octo API"
+    TAB_LOGS = "📋 Logs"
+
+    # Пункты "без фильтра" во вкладке Logs
+    LOG_ALL_THREADS = "Все потоки"
+    LOG_ALL_TAGS = "Все теги"
+    LOG_ALL_LEVELS = "Все уровни"
+
     def __init__(self):
+        STARTUP_TRACE.mark("Импорт модулей GUI")
         super().__init__()
+        STARTUP_TRACE.mark("Окно CTk")
 
         # === НАСТРОЙКИ ОКНА ===
         self.title("auto2tesst v3.0 EPIC - Modern Playwright Automation")
@@ -78,20 +96,14 @@ class ModernAppV3(ctk.CTk):
         # === ДАННЫЕ ===
         self.config = {}
         self.load_config()
+        STARTUP_TRACE.mark("config.json")
 
         # === КОМПОНЕНТЫ ===
-        self.api: Optional[OctobrowserAPI] = None
+        # Парсеры и менеджеры - cached_property, создаются при первом обращении
+        self.api: Optional['OctobrowserAPI'] = None
         self.available_providers = discover_providers()
         self.current_provider = 'smart_wf' if 'smart_wf' in self.available_providers else self.available_providers[0]
-        self.parser = ScriptParser()
-        self.side_parser = SeleniumIDEParser()
-        otp_enabled = self.config.get('otp', {}).get('enabled', False)
-        self.playwright_parser = PlaywrightParser(otp_enabled=otp_enabled)
-        if not otp_enabled:
-            print("[OTP] OTP handler disabled by config")
-        self.data_parser = SmartDataParser()
-        self.sms_provider_manager = ProviderManager()
-        self.dynamic_field_manager = DynamicFieldManager()
+        self._generator_mtimes = {}  # provider -> mtime generator.py при последней загрузке
 
         # Данные импорта
         self.imported_data = None
@@ -99,12 +111,32 @@ class ModernAppV3(ctk.CTk):
         self.csv_file_path = None  # 🔥 Путь к загруженному CSV
         self.csv_embed_mode = True  # 🔥 Режим встраивания CSV в скрипт (True = встроить данные, False = использовать путь)
 
+        # Ленивые вкладки: строятся при первом открытии
+        self._tab_builders = {
+            self.TAB_DATA: self.setup_data_tab,
+            self.TAB_PROXIES: self.setup_proxies_tab,
+            self.TAB_OCTO: self.setup_octo_tab,
+            self.TAB_LOGS: self.setup_logs_tab
+        }
+        self._built_tabs = set()
+
+        # 📋 Логи: append_log из любого потока -> очередь -> пачки в главном потоке Tk,
+        # виджет держит последние log_max_lines строк, полный лог пишется в logs/
+        self.log_max_lines = int(self.config.get('ui_settings', {}).get('log_max_lines', 5000))
+        self._pending_logs = deque(maxlen=self.log_max_lines)  # (строка, тег) до сборки вкладки Logs
+        # Фильтр/поиск во вкладке Logs: пока он активен, новые строки не отрисовываются (только индексируются)
+        self._log_view_filtered = False
+        self._log_filter_sizes = (0, 0)  # (потоков, тегов) в выпадающих списках фильтра
+        self.log_pump = LogPump(self, self._render_log_batch, max_pending=self.log_max_lines)
+        self.log_pump.start()
+
         # === TOAST MANAGER (создаём ДО create_ui!) ===
         self.toast = ToastManager(self)
         self.toast.place_container(relx=0.98, rely=0.98, anchor="se")
 
         # === СОЗДАНИЕ UI ===
         self.create_ui()
+        STARTUP_TRACE.mark("Каркас окна + вкладка Автоматизация")
 
         # 🔥 КРИТИЧНО: Поднять toast контейнер ПОСЛЕ создания всех виджетов!
         # Иначе CTkTabview и другие виджеты закрывают toast
@@ -119,10 +151,57 @@ class ModernAppV3(ctk.CTk):
 
         # 🔥 АВТОСОХРАНЕНИЕ ПРИ ЗАКРЫТИИ ОКНА
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        STARTUP_TRACE.mark("Таймауты и горячие клавиши")
+
+        # ⏱️ Итог трассировки - когда mainloop отрисовал окно
+        self.after_idle(self._report_startup)
 
         # Показать приветствие (увеличен delay для полной отрисовки окна)
         self.after(1000, lambda: self.toast.success("🚀 auto2tesst v3 EPIC загружен!", duration=3000))
 
+    def _report_startup(self):
+        """Первая отрисовка окна: напечатать разбивку времени запуска"""
+        self.update_idletasks()
+        STARTUP_TRACE.mark("Первая отрисовка окна")
+        STARTUP_TRACE.report()
+
+    # ========================================================================
+    # ЛЕНИВЫЕ КОМПОНЕНТЫ
+    # ========================================================================
+
+    @cached_property
+    def parser(self):
+        from src.utils.script_parser import ScriptParser
+        return ScriptParser()
+
+    @cached_property
+    def side_parser(self):
+        from src.utils.selenium_ide_parser import SeleniumIDEParser
+        return SeleniumIDEParser()
+
+    @cached_property
+    def playwright_parser(self):
+        from src.utils.playwright_parser import PlaywrightParser
+        otp_enabled = self.config.get('otp', {}).get('enabled', False)
+        if not otp_enabled:
+            print("[OTP] OTP handler disabled by config")
+        return PlaywrightParser(otp_enabled=otp_enabled)
+
+    @cached_property
+    def data_parser(self):
+        from src.utils.data_parser import SmartDataParser
+        return SmartDataParser()
+
+    @cached_property
+    def sms_provider_manager(self):
+        from src.sms.provider_manager import ProviderManager
+        return ProviderManager()
+
+    @cached_property
+    def dynamic_field_manager(self):
+        from src.data.dynamic_field import DynamicFieldManager
+        return DynamicFieldManager()
+
     # ========================================================================
     # КОНФИГУРАЦИЯ
     # ========================================================================
@@ -194,6 +273,7 @@ class ModernAppV3(ctk.CTk):
         """Обработчик закрытия окна - автосохранение"""
         print("[MAIN] === ЗАКРЫТИЕ ОКНА - АВТОСОХРАНЕНИЕ ===")
         self.save_config()
+        self.log_pump.stop()
         print("[MAIN] Уничтожаю окно...")
         self.destroy()
 
@@ -306,23 +386,38 @@ class ModernAppV3(ctk.CTk):
             segmented_button_selected_hover_color=self.theme['bg_hover'],
             segmented_button_unselected_color=self.theme['bg_tertiary'],
             segmented_button_unselected_hover_color=self.theme['bg_hover'],
-            text_color=self.theme['text_primary']
+            text_color=self.theme['text_primary'],
+            command=self.on_tab_changed
         )
         self.tabview.grid(row=0, column=0, sticky="nsew", padx=24, pady=24)
 
         # Добавить вкладки
-        self.tab_edit = self.tabview.add("🚀 Автоматизация")
-        self.tab_data = self.tabview.add("📊 Data")
-        self.tab_proxies = self.tabview.add("🌐 Proxies")
-        self.tab_octo = self.tabview.add("🐙 Octo API")
-        self.tab_logs = self.tabview.add("📋 Logs")
+        self.tab_edit = self.tabview.add(self.TAB_EDIT)
+        self.tab_data = self.tabview.add(self.TAB_DATA)
+        self.tab_proxies = self.tabview.add(self.TAB_PROXIES)
+        self.tab_octo = self.tabview.add(self.TAB_OCTO)
+        self.tab_logs = self.tabview.add(self.TAB_LOGS)
 
-        # Настроить вкладки
+        # Настроить стартовую вкладку, остальные - при первом открытии (ensure_tab)
         self.setup_edit_tab()
-        self.setup_data_tab()
-        self.setup_proxies_tab()
-        self.setup_octo_tab()
-        self.setup_logs_tab()
+
+    def on_tab_changed(self):
+        """Переключение вкладки: построить ее, если открыта впервые"""
+        self.ensure_tab(self.tabview.get())
+
+    def ensure_tab(self, name: str):
+        """Построить ленивую вкладку name, если она еще не построена"""
+        builder = self._tab_builders.get(name)
+        if builder is None or name in self._built_tabs:
+            return
+
+        with STARTUP_TRACE.timed(f"Вкладка {name} построена"):
+            builder()
+            self.update_idletasks()
+        self._built_tabs.add(name)
+
+        # Новые виджеты вкладки перекрывают toast - поднять контейнер снова (как после create_ui)
+        self.toast.container.lift()
 
     def setup_edit_tab(self):
         """Настроить главную вкладку Автоматизация"""
@@ -635,6 +730,15 @@ class ModernAppV3(ctk.CTk):
         # 🗑️ Одноразовые профили
         self.disposable_profiles_var = tk.BooleanVar(value=False)  # По умолчанию выключено
 
+        # ♻️ Пул переиспользуемых профилей
+        self.reuse_profiles_var = tk.BooleanVar(value=False)  # По умолчанию выключено
+
+        # 📦 Пакетное создание профилей
+        self.batch_provisioning_var = tk.BooleanVar(value=False)  # По умолчанию выключено
+
+        # 🧹 Очистка профилей прерванных прогонов перед стартом
+        self.orphan_sweep_var = tk.BooleanVar(value=True)  # По умолчанию включено
+
         # Симуляция ввода текста
         self.simulate_typing_var = tk.BooleanVar(value=True)  # По умолчанию включено
         simulate_typing_checkbox = ctk.CTkCheckBox(
@@ -757,6 +861,87 @@ class ModernAppV3(ctk.CTk):
             text_color=self.theme['accent_warning']
         ).grid(row=6, column=3, columnspan=3, padx=(5, 15), pady=10, sticky="w")
 
+        # ♻️ Пул переиспользуемых профилей
+        reuse_profiles_checkbox = ctk.CTkCheckBox(
+            timeouts_frame,
+            text="♻️ Пул профилей (один профиль на поток, сброс cookies между строками)",
+            variable=self.reuse_profiles_var,
+            font=(ModernTheme.FONT['family'], 11, 'bold'),
+            text_color=self.theme['text_primary'],
+            fg_color=self.theme['accent_success'],
+            hover_color=self.theme['accent_secondary']
+        )
+        reuse_profiles_checkbox.grid(row=7, column=0, columnspan=3, padx=(15, 5), pady=10, sticky="w")
+
+        ctk.CTkLabel(
+            timeouts_frame,
+            text="💡 ~1 API запрос на строку вместо 3-5; профили пула удаляются в конце прогона",
+            font=(ModernTheme.FONT['family'], 9),
+            text_color=self.theme['text_secondary']
+        ).grid(row=7, column=3, columnspan=3, padx=(5, 15), pady=10, sticky="w")
+
+        # 🚦 Лимит Cloud API (общий регулятор на все потоки)
+        ctk.CTkLabel(
+            timeouts_frame,
+            text="🚦 Cloud API, запросов/мин:",
+            font=(ModernTheme.FONT['family'], 11),
+            text_color=self.theme['text_primary']
+        ).grid(row=8, column=0, padx=(15, 5), pady=10, sticky="w")
+
+        self.cloud_api_rpm_var = tk.StringVar(value="50")
+        cloud_api_rpm_entry = ctk.CTkEntry(
+            timeouts_frame,
+            textvariable=self.cloud_api_rpm_var,
+            width=60,
+            font=(ModernTheme.FONT['family'], 11)
+        )
+        cloud_api_rpm_entry.grid(row=8, column=1, padx=5, pady=10, sticky="ew")
+
+        ctk.CTkLabel(
+            timeouts_frame,
+            text="стартовая скорость; при 429 снижается автоматически",
+            font=(ModernTheme.FONT['family'], 9),
+            text_color=self.theme['text_secondary']
+        ).grid(row=8, column=2, columnspan=3, padx=(5, 15), pady=10, sticky="w")
+
+        # 📦 Пакетное создание профилей
+        batch_provisioning_checkbox = ctk.CTkCheckBox(
+            timeouts_frame,
+            text="📦 Пакетное создание профилей (пачками по числу потоков)",
+            variable=self.batch_provisioning_var,
+            font=(ModernTheme.FONT['family'], 11, 'bold'),
+            text_color=self.theme['text_primary'],
+            fg_color=self.theme['accent_success'],
+            hover_color=self.theme['accent_secondary']
+        )
+        batch_provisioning_checkbox.grid(row=9, column=0, columnspan=3, padx=(15, 5), pady=10, sticky="w")
+
+        ctk.CTkLabel(
+            timeouts_frame,
+            text="💡 Меньше запросов к Cloud API; при сбое пакета - обычное создание по одному",
+            font=(ModernTheme.FONT['family'], 9),
+            text_color=self.theme['text_secondary']
+        ).grid(row=9, column=3, columnspan=3, padx=(5, 15), pady=10, sticky="w")
+
+        # 🧹 Очистка профилей прерванных прогонов
+        orphan_sweep_checkbox = ctk.CTkCheckBox(
+            timeouts_frame,
+            text="🧹 Остановить профили прерванных прогонов перед стартом",
+            variable=self.orphan_sweep_var,
+            font=(ModernTheme.FONT['family'], 11, 'bold'),
+            text_color=self.theme['text_primary'],
+            fg_color=self.theme['accent_success'],
+            hover_color=self.theme['accent_secondary']
+        )
+        orphan_sweep_checkbox.grid(row=10, column=0, columnspan=3, padx=(15, 5), pady=10, sticky="w")
+
+        ctk.CTkLabel(
+            timeouts_frame,
+            text="💡 \"Auto Profile ...\" старше 30 мин; с одноразовыми - еще и удаление",
+            font=(ModernTheme.FONT['family'], 9),
+            text_color=self.theme['text_secondary']
+        ).grid(row=10, column=3, columnspan=3, padx=(5, 15), pady=10, sticky="w")
+
         # ========== КНОПКИ ДЕЙСТВИЙ (АДАПТИВНЫЙ LAYOUT 2x3) ==========
         btn_frame = ctk.CTkFrame(tab, fg_color="transparent")
         btn_frame.grid(row=4, column=0, sticky="ew", padx=24, pady=(8, 24))
@@ -855,11 +1040,15 @@ class ModernAppV3(ctk.CTk):
 
     def setup_data_tab(self):
         """Настроить вкладку Data"""
+        from .components import DataTab
+
         self.data_tab_widget = DataTab(self.tab_data, self.theme, self.toast)
         self.data_tab_widget.pack(fill="both", expand=True)
 
     def setup_proxies_tab(self):
         """Настроить вкладку Proxies"""
+        from .components import ProxyTab
+
         # 🔥 Передаём callback для централизованного сохранения
         self.proxy_tab_widget = ProxyTab(
             self.tab_proxies,
@@ -872,6 +1061,8 @@ class ModernAppV3(ctk.CTk):
 
     def setup_octo_tab(self):
         """Настроить вкладку Octo API"""
+        from .components import OctoAPITab
+
         print(f"[MAIN] setup_octo_tab(): config id = {id(self.config)}")
         token = self.config.get('octobrowser', {}).get('api_token', '')
         print(f"[MAIN] Передаю config с токеном: {token[:10]}..." if token else "[MAIN] Передаю config с пустым токеном")
@@ -907,6 +1098,92 @@ class ModernAppV3(ctk.CTk):
             font=(ModernTheme.FONT['family'], 12, 'bold')
         ).pack(side="right")
 
+        # Фильтры по индексу лога (поток, итерация, тег, уровень) и поиск по тексту
+        filter_font = (ModernTheme.FONT['family'], 11)
+
+        self.log_thread_var = tk.StringVar(value=self.LOG_ALL_THREADS)
+        self.log_thread_combo = ctk.CTkComboBox(
+            btn_frame,
+            values=[self.LOG_ALL_THREADS],
+            variable=self.log_thread_var,
+            width=120,
+            height=32,
+            font=filter_font
+        )
+        self.log_thread_combo.pack(side="left", padx=(0, 6))
+
+        self.log_iteration_var = tk.StringVar(value="")
+        ctk.CTkEntry(
+            btn_frame,
+            textvariable=self.log_iteration_var,
+            placeholder_text="Итерация",
+            width=80,
+            height=32,
+            font=filter_font
+        ).pack(side="left", padx=6)
+
+        self.log_tag_var = tk.StringVar(value=self.LOG_ALL_TAGS)
+        self.log_tag_combo = ctk.CTkComboBox(
+            btn_frame,
+            values=[self.LOG_ALL_TAGS],
+            variable=self.log_tag_var,
+            width=140,
+            height=32,
+            font=filter_font
+        )
+        self.log_tag_combo.pack(side="left", padx=6)
+
+        self.log_level_var = tk.StringVar(value=self.LOG_ALL_LEVELS)
+        ctk.CTkComboBox(
+            btn_frame,
+            values=[self.LOG_ALL_LEVELS, *LOG_LEVELS],
+            variable=self.log_level_var,
+            width=120,
+            height=32,
+            font=filter_font
+        ).pack(side="left", padx=6)
+
+        self.log_search_var = tk.StringVar(value="")
+        search_entry = ctk.CTkEntry(
+            btn_frame,
+            textvariable=self.log_search_var,
+            placeholder_text="Поиск в логе...",
+            width=180,
+            height=32,
+            font=filter_font
+        )
+        search_entry.pack(side="left", padx=6)
+        search_entry.bind("<Return>", lambda event: self.apply_log_filter())
+
+        ctk.CTkButton(
+            btn_frame,
+            text="🔎 Найти",
+            command=self.apply_log_filter,
+            height=32,
+            width=90,
+            corner_radius=10,
+            font=(ModernTheme.FONT['family'], 11, 'bold')
+        ).pack(side="left", padx=6)
+
+        ctk.CTkButton(
+            btn_frame,
+            text="↺ Live",
+            command=self.show_live_logs,
+            height=32,
+            width=70,
+            corner_radius=10,
+            fg_color=self.theme['bg_secondary'],
+            font=(ModernTheme.FONT['family'], 11, 'bold')
+        ).pack(side="left", padx=6)
+
+        self.log_filter_label = ctk.CTkLabel(
+            btn_frame,
+            text="Live",
+            font=(ModernTheme.FONT['family'], 10),
+            text_color=self.theme['text_secondary']
+        )
+        self.log_filter_label.pack(side="left", padx=6)
+
         # Logs display
         log_container = ctk.CTkFrame(
             tab,
@@ -932,6 +1209,11 @@ class ModernAppV3(ctk.CTk):
         # Configure tags for colored logs
         self.setup_log_tags()
 
+        # Сообщения, пришедшие до первого открытия вкладки
+        self._insert_log_lines(list(self._pending_logs))
+        self._pending_logs.clear()
+        self._refresh_log_filter_values()
+
     def setup_log_tags(self):
         """Настроить теги для цветных логов"""
         self.log_textbox.tag_config("INFO", foreground=self.theme['log_info'])
@@ -1066,6 +1348,7 @@ class ModernAppV3(ctk.CTk):
             headers, rows = self.data_parser.generate_csv_data(fields, num_rows=10)
 
             # Установить в Data Tab
+            self.ensure_tab(self.TAB_DATA)
             self.data_tab_widget.set_data(headers, rows)
 
             self.append_log(f"[DATA] Сгенерировано {len(rows)} строк с {len(headers)} полями", "DATA")
@@ -1143,12 +1426,33 @@ class ModernAppV3(ctk.CTk):
 
         return result
 
+    def _load_generator_module(self, provider: str):
+        """Модуль генератора провайдера (reload только при изменении mtime generator.py)"""
+        module_name = f"src.providers.{provider}.generator"
+        already_loaded = module_name in sys.modules
+        generator_module = importlib.import_module(module_name)
+
+        try:
+            mtime = os.path.getmtime(generator_module.__file__)
+        except OSError:
+            mtime = None
+
+        known_mtime = self._generator_mtimes.get(provider)
+        if (known_mtime is None and already_loaded) or (known_mtime is not None and mtime != known_mtime):
+            print(f"[GENERATOR] {provider}: generator.py изменен - перезагрузка модуля")
+            generator_module = importlib.reload(generator_module)
+
+        self._generator_mtimes[provider] = mtime
+        return generator_module
+
     def generate_playwright_script(self):
         """Генерация Playwright скрипта"""
         print("[DEBUG] generate_playwright_script() вызван")  # DEBUG
 
         try:
-            # 🔥 ПОЛУЧИТЬ НАСТРОЙКИ ПРОФИЛЯ ИЗ OCTO API TAB
+            # 🔥 ПОЛУЧИТЬ НАСТРОЙКИ ПРОФИЛЯ ИЗ OCTO API TAB (вкладки Octo API и Proxies строятся, если еще не открывались)
+            self.ensure_tab(self.TAB_OCTO)
+            self.ensure_tab(self.TAB_PROXIES)
             profile_config = self.octo_tab_widget.get_profile_config()
 
             # Собрать конфигурацию из всех табов
@@ -1245,7 +1549,15 @@ class ModernAppV3(ctk.CTk):
                 'nine_proxy_strategy': nine_proxy_strategy,
                 'nine_proxy_auto_rotate': nine_proxy_auto_rotate,
                 # 🗑️ ОДНОРАЗОВЫЕ ПРОФИЛИ
-                'disposable_profiles': self.disposable_profiles_var.get()
+                'disposable_profiles': self.disposable_profiles_var.get(),
+                # ♻️ ПУЛ ПЕРЕИСПОЛЬЗУЕМЫХ ПРОФИЛЕЙ
+                'reuse_profiles': self.reuse_profiles_var.get(),
+                # 📦 ПАКЕТНОЕ СОЗДАНИЕ ПРОФИЛЕЙ
+                'batch_provisioning': self.batch_provisioning_var.get(),
+                # 🧹 ОЧИСТКА ПРОФИЛЕЙ ПРЕРВАННЫХ ПРОГОНОВ
+                'orphan_sweep': self.orphan_sweep_var.get(),
+                # 🚦 ЛИМИТ CLOUD API
+                'cloud_api_rpm': int(self.cloud_api_rpm_var.get()) if self.cloud_api_rpm_var.get().strip().isdigit() else 50
             }
 
             print(f"[DEBUG] API Token: {config['api_token'][:10]}..." if config['api_token'] else "[DEBUG] API Token: пуст")
@@ -1285,9 +1597,8 @@ class ModernAppV3(ctk.CTk):
             self.append_log(f"[INFO] Генерация Playwright скрипта (Provider: {selected_provider})...", "INFO")
 
             try:
-                # Принудительная перезагрузка модуля (для применения изменений без перезапуска GUI)
-                generator_module = importlib.import_module(f"src.providers.{selected_provider}.generator")
-                importlib.reload(generator_module)  # Перезагрузить модуль с диска
+                # Модуль перезагружается с диска только если generator.py изменился (правки без перезапуска GUI)
+                generator_module = self._load_generator_module(selected_provider)
                 generator = generator_module.Generator()
                 generated_script = generator.generate_script(user_code, config)
             except Exception as e:
@@ -1503,19 +1814,109 @@ class ModernAppV3(ctk.CTk):
         """
         Добавить сообщение в лог с цветом
 
+        Потокобезопасно: Runner вызывает из потока чтения stdout, строка уходит
+        в LogPump и отрисовывается пачкой в главном потоке.
+
         Args:
             message: Сообщение
             tag: Тег для цвета (INFO, SUCCESS, ERROR, WARNING, DATA, API, SMART)
         """
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted = f"[{timestamp}] {message}\n"
+        self.log_pump.push(message, tag)
+
+    def _render_log_batch(self, batch: list):
+        """Пачка строк от LogPump (главный поток)"""
+        # Вкладка Logs еще не открывалась - копим до ее сборки (последние log_max_lines)
+        if self.TAB_LOGS not in self._built_tabs:
+            self._pending_logs.extend(batch)
+            return
+
+        self._refresh_log_filter_values()
+        # Открыт результат фильтра - новые строки только в индексе, вернуться: "Live"
+        if self._log_view_filtered:
+            return
+
+        self._insert_log_lines(batch)
+
+    def _insert_log_lines(self, batch: list):
+        """Вставить пачку [(строка, тег)] одним insert на серию с одинаковым тегом и обрезать лог"""
+        if not batch:
+            return
+
+        run_tag = batch[0][1]
+        run_lines = []
+        for formatted, tag in batch:
+            if tag != run_tag:
+                self.log_textbox.insert("end", ''.join(run_lines), run_tag)
+                run_tag, run_lines = tag, []
+            run_lines.append(formatted)
+        self.log_textbox.insert("end", ''.join(run_lines), run_tag)
+
+        # Кольцевой буфер: в виджете только последние log_max_lines строк
+        line_count = int(self.log_textbox.index("end-1c").split('.')[0])
+        if line_count > self.log_max_lines:
+            self.log_textbox.delete("1.0", f"{line_count - self.log_max_lines + 1}.0")
 
-        self.log_textbox.insert("end", formatted, tag)
         self.log_textbox.see("end")
 
+    def _refresh_log_filter_values(self):
+        """Обновить списки потоков и тегов фильтра, если в индексе появились новые"""
+        index = self.log_pump.index
+        sizes = (len(index.by_thread), len(index.by_tag))
+        if sizes == self._log_filter_sizes:
+            return
+        self._log_filter_sizes = sizes
+        self.log_thread_combo.configure(
+            values=[self.LOG_ALL_THREADS] + [f"Поток {thread_id}" for thread_id in index.threads()])
+        self.log_tag_combo.configure(values=[self.LOG_ALL_TAGS] + index.tags())
+
+    def apply_log_filter(self):
+        """Показать строки лога под фильтры и поиск (по индексу, без пересканирования текста)"""
+        thread = self.log_thread_var.get()
+        iteration = self.log_iteration_var.get().strip()
+        tag = self.log_tag_var.get()
+        level = self.log_level_var.get()
+        text = self.log_search_var.get().strip()
+
+        if iteration and not iteration.isdigit():
+            self.toast.warning("Итерация - это номер")
+            return
+
+        filters = {
+            'thread': int(thread.split()[-1]) if thread.split()[-1].isdigit() else None,
+            'iteration': int(iteration) if iteration else None,
+            'tag': tag if tag != self.LOG_ALL_TAGS else None,
+            'level': level if level in LOG_LEVELS else None
+        }
+        if not text and not any(value is not None for value in filters.values()):
+            self.show_live_logs()
+            return
+
+        started = time.perf_counter()
+        lines, scanned = self.log_pump.search(self.log_max_lines, text=text, **filters)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self._log_view_filtered = True
+        self.log_textbox.delete("1.0", "end")
+        self._insert_log_lines(lines)
+        self.log_filter_label.configure(
+            text=f"Найдено: {len(lines)} (прочитано {scanned} из {len(self.log_pump.index)}) · {elapsed_ms:.0f} ms")
+
+    def show_live_logs(self):
+        """Вернуть вкладку Logs в живой режим: последние log_max_lines строк из полного лога"""
+        self._log_view_filtered = False
+        self.log_textbox.delete("1.0", "end")
+        self._insert_log_lines(self.log_pump.tail(self.log_max_lines))
+        self.log_filter_label.configure(text="Live")
+
     def clear_logs(self):
         """Очистить логи"""
-        self.log_textbox.delete("1.0", "end")
+        # Индекс сбрасывается, полный лог на диске остается
+        self.log_pump.clear()
+        self._pending_logs.clear()
+        self._log_view_filtered = False
+        if self.TAB_LOGS in self._built_tabs:
+            self.log_textbox.delete("1.0", "end")
+            self.log_filter_label.configure(text="Live")
         self.toast.info("Логи очищены")
 
     # ========================================================================
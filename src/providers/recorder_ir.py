@@ -0,0 +1,513 @@
+"""
+Общий разбор кода Playwright Recorder для генераторов провайдеров
+
+Код записи разбирается один раз в промежуточное представление (IR):
+- Statement - факты об одной строке: вид (действие, with, присваивание,
+  спец. команда #...), страница (page/page1/...), вызванные методы,
+  локатор (get_by_role / locator / get_by_test_id ...), heading, popup
+- Recording - строки записи + разметка вопросов (pre / questions / post)
+  и popup блоки
+
+Провайдеры (smart_dynamic, smart_wf, smart_no_api) генерируют код из IR,
+а не сканируют каждую строку подстроками и регулярками на каждом проходе.
+
+Разбор строки кешируется по ее тексту: повторные проходы по pre/post секциям,
+одинаковые строки (#pause, #optional, ...) и повторная генерация того же кода
+не разбираются заново.
+"""
+
+import ast
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+# Виды строк
+BLANK = 'blank'
+IMPORT = 'import'
+COMMENT = 'comment'      # Обычный комментарий
+COMMAND = 'command'      # Спец. команда: #pause10, #optional:2, #retry:3:30, ...
+WITH = 'with'            # with page.expect_popup() as page1_info:
+ASSIGN = 'assign'        # page1 = page1_info.value
+ACTION = 'action'        # page.get_by_role(...).click()
+CODE = 'code'            # Любой другой код
+
+# Методы Playwright, которые считаются действиями
+ACTION_METHODS = frozenset([
+    'click', 'fill', 'press', 'press_sequentially', 'type',
+    'select_option', 'check', 'uncheck', 'set_checked',
+])
+
+# Спец. команды без аргументов
+SIMPLE_COMMANDS = frozenset([
+    'scroll', 'scrolldown', 'scrollup', 'scrollmid', 'scroll_search',
+    'toggle_switches', 'auto_conditional_popup',
+])
+
+_CALL_RE = re.compile(r'\b(\w++)\(')
+_PAGE_RE = re.compile(r'(page\d*)\.')
+_ASSIGN_RE = re.compile(r'([A-Za-z_]\w*)\s*=(?!=)\s*(.*)$')
+_POPUP_VALUE_RE = re.compile(r'(\w+_info)\.value\b')
+_WITH_RE = re.compile(r'with\s+([\w.]+)\.(\w+)\((.*)\)\s*(?:as\s+(\w+)\s*)?:')
+_STRING = r'''(?:"([^"\\]*+(?:\\.[^"\\]*+)*+)"|'([^'\\]*+(?:\\.[^'\\]*+)*+)')'''
+_LOCATOR_RE = re.compile(r'\.(get_by_\w+|locator)\(\s*' + _STRING + '?')
+_NAME_KWARG_RE = re.compile(r'\s*,\s*name\s*=\s*' + _STRING)
+# Типичная строка записи: page.get_by_role("button", name="Next").click() - разбирается одним match
+_SIMPLE_ACTION_RE = re.compile(
+    r'(page\d*)\.(get_by_\w+|locator)\(\s*' + _STRING + r'\s*(?:,\s*name\s*=\s*' + _STRING + r')?'
+    r'(?:\s*,\s*exact\s*=\s*(?:True|False))?\s*\)'
+    r'''\.(\w+)\(((?:[^()"'\\]++|"[^"\\]*+(?:\\.[^"\\]*+)*+"|'[^'\\]*+(?:\\.[^'\\]*+)*+')*+)\)$'''
+)
+_DATA_KEY_RE = re.compile(r'data_row\[["\']([^"\']+)["\']\]')
+# Код до комментария: всё, кроме '#', строки целиком
+_CODE_PART_RE = re.compile(r'''(?:[^'"#\\]++|\\.|"[^"\\]*+(?:\\.[^"\\]*+)*+"|'[^'\\]*+(?:\\.[^'\\]*+)*+')*+''')
+
+# Строки Playwright Recorder, которые не переносятся в сценарий (обертка run(), запуск браузера, close)
+_BOILERPLATE_RE = re.compile('|'.join(re.escape(pattern) for pattern in [
+    'def run(',
+    'browser = playwright.',
+    'context = browser.',
+    'page = context.',
+    'with sync_playwright()',
+    'run(playwright)',
+    'with page.context.expect_page()',
+    '.close()',
+    '# -----------',
+]))
+
+# Начало реального сценария (всё до первой такой строки - boilerplate записи)
+_FLOW_START_RE = re.compile('|'.join(re.escape(pattern) for pattern in [
+    'page.goto(',
+    'page.get_by_role(',
+    'page.get_by_text(',
+    'page.get_by_label(',
+    'page.locator(',
+    'page.fill(',
+    'page.click(',
+    '#pause',
+]))
+
+_PAUSE_RE = re.compile(r'#\s*pause\s*(\d+)')
+_OPTIONAL_RE = re.compile(r'#\s*optional(?::(\d+))?$')
+_RETRY_RE = re.compile(r'#\s*retry(?::(\d+))?(?::(\d+))?(?::(\w+))?$')
+
+# Разбор строк по тексту (общий для всех записей)
+_STATEMENT_CACHE: Dict[str, 'Statement'] = {}
+_LINE_CACHE: Dict[str, 'Line'] = {}
+_CACHE_LIMIT = 50000
+
+_UNSET = object()
+
+
+def py_str(value: str) -> str:
+    """Строковый литерал в двойных кавычках для вставки в генерируемый код"""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _literal(double_quoted: Optional[str], single_quoted: Optional[str]) -> Optional[str]:
+    """Значение строкового литерала по группам _STRING (тело в двойных / одинарных кавычках)"""
+    if double_quoted is not None:
+        body, quote = double_quoted, '"'
+    elif single_quoted is not None:
+        body, quote = single_quoted, "'"
+    else:
+        return None
+    if '\\' not in body:
+        return body
+    try:
+        return ast.literal_eval(quote + body + quote)
+    except (ValueError, SyntaxError):
+        return body
+
+
+def _split_comment(text: str) -> Tuple[str, Optional[str]]:
+    """Отделить комментарий в конце строки кода ('#' внутри строк не считается)"""
+    end = _CODE_PART_RE.match(text).end()
+    if end < len(text) and text[end] == '#':
+        return text[:end].rstrip(), text[end:].strip()
+    return text, None
+
+
+def _call_args(text: str, start: int) -> str:
+    """Исходный текст аргументов вызова, открывающая скобка которого на позиции start - 1"""
+    depth = 1
+    quote = None
+    escaped = False
+    for pos in range(start, len(text)):
+        char = text[pos]
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif quote:
+            if char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return text[start:pos]
+    return text[start:]
+
+
+def _lex_command(text: str) -> Tuple[Optional[str], tuple]:
+    """Спец. команда из комментария: (имя, аргументы) или (None, ())"""
+    lower = text.lower()
+
+    match = _PAUSE_RE.match(lower)
+    if match:
+        return 'pause', (match.group(1),)
+
+    match = _OPTIONAL_RE.match(lower)
+    if match:
+        return 'optional', (match.group(1),)
+
+    match = _RETRY_RE.match(lower)
+    if match:
+        return 'retry', match.groups()
+
+    name = lower[1:].strip()
+    if name in SIMPLE_COMMANDS:
+        return name, ()
+    name = name.replace(' ', '')
+    if name in SIMPLE_COMMANDS:
+        return name, ()
+
+    return None, ()
+
+
+class Statement:
+    """
+    Разобранная строка записи (без отступа, общая для одинаковых строк)
+
+    Значения по умолчанию - атрибуты класса, в экземпляре хранятся только
+    найденные поля (строку с отступом Line копирует одним update).
+    """
+
+    code = ''
+    comment = None
+    kind = CODE
+    command = None
+    command_args = ()
+    calls = frozenset()
+    action = None
+    page_var = None
+    locator = None
+    locator_arg = None
+    name = None
+    target = None
+    popup_info = None
+    with_receiver = None
+    with_method = None
+    with_as = None
+    boilerplate = False
+    starts_flow = False
+    _action_args = _UNSET
+
+    def __init__(self, text: str):
+        self.text = text
+
+        if not text:
+            self.kind = BLANK
+            return
+
+        if _BOILERPLATE_RE.search(text):
+            self.boilerplate = True
+        if _FLOW_START_RE.search(text):
+            self.starts_flow = True
+
+        if text[0] == '#':
+            self.comment = text
+            command, command_args = _lex_command(text)
+            if command:
+                self.command, self.command_args = command, command_args
+                self.kind = COMMAND
+            else:
+                self.kind = COMMENT
+            return
+
+        if text.startswith('import ') or text.startswith('from '):
+            self.code = text
+            self.kind = IMPORT
+            return
+
+        code = text
+        if '#' in text:
+            code, comment = _split_comment(text)
+            if comment:
+                self.comment = comment
+        self.code = code
+
+        match = _SIMPLE_ACTION_RE.match(code)
+        if match:
+            page_var, locator, arg_dq, arg_sq, name_dq, name_sq, method, args = match.groups()
+            self.page_var = page_var
+            self.locator = locator
+            self.locator_arg = _literal(arg_dq, arg_sq)
+            if name_dq is not None or name_sq is not None:
+                self.name = _literal(name_dq, name_sq)
+            self.calls = frozenset((locator, method))
+            if method in ACTION_METHODS:
+                self.action = method
+                self._action_args = args
+                self.kind = ACTION
+            return
+
+        calls = _CALL_RE.findall(code)
+        if calls:
+            self.calls = frozenset(calls)
+            for method in reversed(calls):
+                if method in ACTION_METHODS:
+                    self.action = method
+                    break
+
+            match = _LOCATOR_RE.search(code)
+            if match:
+                self.locator = match.group(1)
+                self.locator_arg = _literal(match.group(2), match.group(3))
+                name_match = _NAME_KWARG_RE.match(code, match.end())
+                if name_match:
+                    self.name = _literal(*name_match.groups())
+
+        match = _PAGE_RE.match(code)
+        if match:
+            self.page_var = match.group(1)
+
+        if code.startswith('with '):
+            self.kind = WITH
+            match = _WITH_RE.match(code)
+            if match:
+                self.with_receiver, self.with_method, _, self.with_as = match.groups()
+            return
+
+        match = _ASSIGN_RE.match(code)
+        if match:
+            self.kind = ASSIGN
+            self.target = match.group(1)
+            value_match = _POPUP_VALUE_RE.match(match.group(2))
+            if value_match:
+                self.popup_info = value_match.group(1)
+            return
+
+        if self.action:
+            self.kind = ACTION
+
+    @property
+    def action_args(self) -> Optional[str]:
+        """Исходный текст аргументов последнего действия (разбирается при первом обращении)"""
+        if self._action_args is _UNSET:
+            args = None
+            if self.action:
+                start = self.code.rfind('.' + self.action + '(')
+                if start != -1:
+                    args = _call_args(self.code, start + len(self.action) + 2)
+            self._action_args = args
+        return self._action_args
+
+    @property
+    def role(self) -> Optional[str]:
+        return self.locator_arg if self.locator == 'get_by_role' else None
+
+    @property
+    def selector(self) -> Optional[str]:
+        return self.locator_arg if self.locator == 'locator' else None
+
+    @property
+    def test_id(self) -> Optional[str]:
+        return self.locator_arg if self.locator == 'get_by_test_id' else None
+
+    @property
+    def heading(self) -> Optional[str]:
+        """Текст вопроса, если строка - маркер heading (heading с .click() - обычное действие)"""
+        if self.locator == 'get_by_role' and self.locator_arg == 'heading' and self.action != 'click':
+            return self.name
+        return None
+
+    @property
+    def opens_popup(self) -> bool:
+        return self.kind == WITH and self.with_method == 'expect_popup'
+
+    @property
+    def data_key(self) -> Optional[str]:
+        """Колонка CSV из fill(data_row["..."])"""
+        action_args = self.action_args
+        if not action_args:
+            return None
+        match = _DATA_KEY_RE.search(action_args)
+        return match.group(1) if match else None
+
+    def __repr__(self):
+        return f"Statement({self.kind}, {self.text!r})"
+
+
+class Line(Statement):
+    """Строка записи: Statement + исходный текст с отступом"""
+
+    def __init__(self, raw: str):
+        unindented = raw.lstrip()
+        stripped = unindented.rstrip()
+        # Разбор берется из кеша по тексту без отступа (строки секций после смены отступа не разбираются заново)
+        self.__dict__.update(analyze(stripped).__dict__)
+        self.raw = raw
+        self.indent = len(raw) - len(unindented) if stripped else 0
+
+    def __repr__(self):
+        return f"Line({self.indent}, {self.kind}, {self.text!r})"
+
+
+def analyze(text: str) -> Statement:
+    """Разобрать одну строку (text - без отступа), с кешем по тексту"""
+    stmt = _STATEMENT_CACHE.get(text)
+    if stmt is None:
+        if len(_STATEMENT_CACHE) >= _CACHE_LIMIT:
+            _STATEMENT_CACHE.clear()
+        stmt = _STATEMENT_CACHE[text] = Statement(text)
+    return stmt
+
+
+def analyze_line(raw: str) -> Line:
+    """Разобрать строку записи с отступом, с кешем по тексту"""
+    line = _LINE_CACHE.get(raw)
+    if line is None:
+        if len(_LINE_CACHE) >= _CACHE_LIMIT:
+            _LINE_CACHE.clear()
+        line = _LINE_CACHE[raw] = Line(raw)
+    return line
+
+
+class Recording:
+    """Запись Playwright Recorder в виде списка разобранных строк"""
+
+    def __init__(self, code: str):
+        self.code = code
+        self.lines: List[Line] = list(map(analyze_line, code.split('\n')))
+
+    def next_code_line(self, index: int) -> Optional[int]:
+        """Индекс следующей непустой строки после index"""
+        for next_index in range(index + 1, len(self.lines)):
+            if self.lines[next_index].kind != BLANK:
+                return next_index
+        return None
+
+    def popup_block(self, index: int, lookahead: int = 9) -> Dict:
+        """
+        Разобрать popup блок, начинающийся с with ... expect_popup() на строке index
+
+        Returns:
+            Dict: receiver, info_var, button (имя кнопки клика внутри блока),
+                  page (переменная popup страницы из "pageN = pageN_info.value")
+        """
+        opener = self.lines[index]
+        block = {'receiver': opener.with_receiver, 'info_var': opener.with_as, 'button': None, 'page': None}
+        for line in self.lines[index + 1:index + 1 + lookahead]:
+            if block['button'] is None and line.action == 'click' and line.role == 'button' and line.name:
+                block['button'] = line.name
+            if line.kind == ASSIGN and line.popup_info == opener.with_as:
+                block['page'] = line.target
+                break
+        return block
+
+    # ==================== РАЗМЕТКА ВОПРОСОВ ====================
+
+    def sections(self) -> Tuple[Dict[str, List[Line]], List[str], List[str]]:
+        """
+        Разбить запись на код до вопросов, вопросы (heading -> действия) и код после
+
+        Вопрос начинается со строки heading без .click(); первый popup
+        (with page.expect_popup() / page1 = page1_info.value) начинает post секцию.
+
+        Returns:
+            Tuple[{вопрос: [Line действий]}, pre_lines, post_lines]
+        """
+        lines = self.lines
+        questions: Dict[str, List[Line]] = {}
+        pre_lines: List[str] = []
+        post_lines: List[str] = []
+        current_question = None
+        current_actions: List[Line] = []
+        in_questions_section = False
+        in_post_section = False
+        skip_boilerplate = True  # Пропускаем всё до первого реального действия
+
+        for i, line in enumerate(lines):
+            kind = line.kind
+            if kind == BLANK or kind == IMPORT or line.boilerplate:
+                continue
+
+            if skip_boilerplate:
+                if not line.starts_flow:
+                    continue
+                skip_boilerplate = False
+
+            opens_popup = line.opens_popup and line.with_receiver == 'page'
+
+            # Popup окна - всё дальше идет в post секцию
+            if opens_popup or line.popup_info == 'page1_info':
+                in_post_section = True
+                in_questions_section = False
+
+                # #auto_conditional_popup перед popup относится к popup, а не к вопросу
+                if current_question and current_actions and current_actions[-1].command == 'auto_conditional_popup':
+                    marker = current_actions.pop()
+                    print(f"[PARSER] DEBUG: Перемещаю #auto_conditional_popup из вопроса '{current_question}' в post_questions_lines")
+                    post_lines.append(marker.text)
+
+                # Клик по той же кнопке, что внутри with блока - дубликат, он должен быть только в with блоке
+                if current_question and current_actions and opens_popup:
+                    next_index = self.next_code_line(i)
+                    if next_index is not None:
+                        button_in_with = lines[next_index].name if lines[next_index].role == 'button' else None
+                        last_action = current_actions[-1]
+                        if button_in_with and last_action.action == 'click' and button_in_with in last_action.text:
+                            print(f"[PARSER] DEBUG: Удаляю дубликат клика '{button_in_with}' из вопроса '{current_question}'")
+                            current_actions.pop()
+
+                if current_question and current_actions:
+                    questions[current_question] = current_actions
+                    current_question = None
+                    current_actions = []
+
+            if in_post_section:
+                # Playwright Recorder иногда записывает клик в with блоке без .click()
+                if (line.role == 'button' and line.action != 'click'
+                        and i > 0 and lines[i - 1].opens_popup and lines[i - 1].with_receiver == 'page'):
+                    post_lines.append(line.raw.rstrip() + '.click()')
+                    continue
+                post_lines.append(line.raw)
+                continue
+
+            # heading без .click() - маркер нового вопроса
+            if line.role == 'heading' and line.action != 'click':
+                if current_question and current_actions:
+                    questions[current_question] = current_actions
+                if line.name:
+                    current_question = line.name
+                    current_actions = []
+                    in_questions_section = True
+                continue
+
+            if in_questions_section and current_question:
+                current_actions.append(line)
+            elif not in_questions_section:
+                pre_lines.append(line.raw)
+
+        if current_question and current_actions:
+            questions[current_question] = current_actions
+
+        return questions, pre_lines, post_lines
+
+
+@lru_cache(maxsize=32)
+def parse_recording(code: str) -> Recording:
+    """Разобрать код записи (результат кешируется по тексту кода)"""
+    return Recording(code)
+
+
+def clear_caches():
+    """Сбросить кеши разбора (строк и записей)"""
+    _STATEMENT_CACHE.clear()
+    _LINE_CACHE.clear()
+    parse_recording.cache_clear()
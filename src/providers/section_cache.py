@@ -0,0 +1,174 @@
+"""
+Кеш секций генерируемых скриптов
+
+Скрипт провайдера собирается из секций (imports, config, прокси, Octobrowser
+функции, helpers, QUESTIONS_POOL, итерация, worker, main). Каждая секция
+адресуется хешем своих входных данных:
+- имя провайдера и секции
+- аргументы секции (настройки из config, вопросы, код итерации)
+- отпечаток исходников, из которых секция собирается (генератор и встраиваемые модули)
+
+Неизменившиеся секции берутся из памяти (LRU) или с диска (.cache/script_sections),
+поэтому смена числа потоков или одного вопроса не пересобирает весь скрипт.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / '.cache' / 'script_sections'
+
+
+def source_fingerprint(*paths) -> str:
+    """
+    Отпечаток исходных файлов (путь + mtime + размер)
+
+    Меняется при любом сохранении файла - секции, собранные из старой версии
+    генератора или встраиваемого модуля, больше не совпадают по ключу.
+    """
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class SectionCache:
+    """Кеш секций скрипта: память (LRU) + диск"""
+
+    def __init__(self, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR, max_memory_entries: int = 256,
+                 max_disk_entries: int = 2048):
+        """
+        Args:
+            cache_dir: Папка для секций на диске (None - только память)
+            max_memory_entries: Сколько секций держать в памяти
+            max_disk_entries: Сколько файлов секций держать на диске (старые удаляются)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, str]' = OrderedDict()
+        self._disk_writes = 0
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def make_key(namespace: str, section: str, inputs: tuple) -> str:
+        """Ключ секции: sha256 от провайдера, имени секции и repr входных данных"""
+        payload = f"{namespace}\n{section}\n{inputs!r}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_or_build(self, namespace: str, section: str, inputs: tuple, build: Callable[[], str]) -> str:
+        """
+        Вернуть секцию из кеша или собрать ее
+
+        Args:
+            namespace: Провайдер (например, 'smart_dynamic')
+            section: Имя секции
+            inputs: Всё, от чего зависит текст секции (должно иметь стабильный repr)
+            build: Функция сборки секции при промахе
+
+        Returns:
+            Текст секции
+        """
+        key = self.make_key(namespace, section, inputs)
+
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return text
+
+        text = self._read_disk(key)
+        if text is not None:
+            with self._lock:
+                self._stats['disk_hits'] += 1
+                self._remember(key, text)
+            return text
+
+        text = build()
+        with self._lock:
+            self._stats['misses'] += 1
+            self._remember(key, text)
+        self._write_disk(key, text)
+        return text
+
+    def clear(self, disk: bool = False):
+        """Очистить кеш в памяти (и на диске при disk=True)"""
+        with self._lock:
+            self._memory.clear()
+        if disk and self.cache_dir and self.cache_dir.exists():
+            for path in self.cache_dir.glob('*.txt'):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict:
+        """memory_hits, disk_hits, misses, memory_entries"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        return stats
+
+    # ==================== ВНУТРЕННЕЕ ====================
+
+    def _remember(self, key: str, text: str):
+        """Положить секцию в память (вызывается под _lock)"""
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        try:
+            return (self.cache_dir / f"{key}.txt").read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, text: str):
+        if not self.cache_dir:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / f"{key}.txt"
+            # Запись через временный файл - параллельная генерация не прочитает половину секции
+            tmp_path = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(text, encoding='utf-8')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[SECTION CACHE] Не удалось сохранить секцию на диск: {e}")
+            return
+
+        with self._lock:
+            self._disk_writes += 1
+            prune = self._disk_writes % 64 == 0
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Удалить самые старые файлы секций сверх max_disk_entries"""
+        try:
+            files = sorted(self.cache_dir.glob('*.txt'), key=lambda path: path.stat().st_mtime)
+        except OSError:
+            return
+        for path in files[:max(0, len(files) - self.max_disk_entries)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+# Общий кеш на процесс (переживает importlib.reload генераторов)
+SECTION_CACHE = SectionCache()
@@ -5,7 +5,19 @@ Provider: smart_no_api
 """
 
 import json
-from typing import Dict, List
+import re
+from typing import Dict, List, Optional
+
+from ..recorder_ir import ASSIGN, BLANK, COMMAND, COMMENT, IMPORT, WITH, Statement, analyze, parse_recording, py_str
+
+# Переменные страниц записи (основная + popup окна)
+_PAGE_VARS = ('page', 'page1', 'page2', 'page3')
+
+# Вызовы, которые должны выполниться (не оборачиваются в try-except)
+_CRITICAL_CALLS = frozenset(['goto', 'check_heading', 'wait_for_navigation'])
+
+# Спец. команды, которые _clean_user_code сохраняет (остальные комментарии удаляются)
+_KEPT_COMMANDS = frozenset(['pause', 'scrolldown', 'scroll', 'scrollup', 'scrollmid', 'toggle_switches'])
 
 
 class Generator:
@@ -279,10 +291,19 @@ def get_proxy_for_thread(thread_id: int, iteration_number: int) -> Optional[Dict
         tags_json = json.dumps(tags, ensure_ascii=False)
         geolocation_json = json.dumps(geolocation, ensure_ascii=False) if geolocation else 'None'
 
+        # 🔥 Профиль запуска (headless, размер окна, флаги Chromium)
+        launch = self._build_launch_profile(profile_config.get('launch'))
+        launch_flags_json = json.dumps(launch['flags'], ensure_ascii=False)
+
         return f'''# ============================================================
 # OCTOBROWSER API ФУНКЦИИ
 # ============================================================
 
+# Профиль запуска браузера
+LAUNCH_PROFILE_NAME = "{launch['name']}"
+LAUNCH_HEADLESS = {launch['headless']}
+LAUNCH_FLAGS = {launch_flags_json}
+
 def create_profile(title: str = "Auto Profile", proxy_dict: Optional[Dict] = None) -> Optional[str]:
     """
     Создать профиль через Octobrowser API с прокси
@@ -429,8 +450,9 @@ def start_profile(profile_uuid: str) -> Optional[Dict]:
                 json={{
                     "uuid": profile_uuid,
                     "debug_port": True,
-                    "headless": False,
+                    "headless": LAUNCH_HEADLESS,
                     "only_local": True,
+                    "flags": LAUNCH_FLAGS,
                     "timeout": 120
                 }},
                 timeout=120
@@ -439,7 +461,7 @@ def start_profile(profile_uuid: str) -> Optional[Dict]:
 
             if response.status_code == 200:
                 data = response.json()
-                print(f"[PROFILE] [OK] Профиль запущен, CDP endpoint получен")
+                print(f"[PROFILE] [OK] Профиль запущен ({{LAUNCH_PROFILE_NAME}}), CDP endpoint получен")
                 return data
             elif response.status_code == 404:
                 # Profile not synced yet - retry
@@ -483,6 +505,48 @@ def delete_profile(profile_uuid: str):
 
 '''
 
+    def _build_launch_profile(self, launch_config: Optional[Dict]) -> Dict:
+        """
+        Собирает профиль запуска браузера из настроек вкладки Octo API
+
+        Args:
+            launch_config: {'headless', 'window_size', 'disable_gpu', 'disable_throttling'}
+
+        Returns:
+            Dict с name (тип профиля), headless, flags
+        """
+        if not isinstance(launch_config, dict):
+            launch_config = {}
+
+        headless = bool(launch_config.get('headless', False))
+        window_size = str(launch_config.get('window_size', '') or '').lower().replace(' ', '')
+
+        flags = []
+        name_parts = ['headless' if headless else 'headed']
+
+        if re.match(r'^\d+[x,]\d+$', window_size):
+            width, height = re.split(r'[x,]', window_size)
+            flags.append(f'--window-size={width},{height}')
+            name_parts.append(f'{width}x{height}')
+
+        if launch_config.get('disable_gpu'):
+            flags.append('--disable-gpu')
+            name_parts.append('nogpu')
+
+        if launch_config.get('disable_throttling'):
+            flags += [
+                '--disable-background-timer-throttling',
+                '--disable-backgrounding-occluded-windows',
+                '--disable-renderer-backgrounding'
+            ]
+            name_parts.append('nothrottle')
+
+        return {
+            'name': '+'.join(name_parts),
+            'headless': headless,
+            'flags': flags
+        }
+
     def _generate_helpers(self) -> str:
         return '''# ============================================================
 # ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ
@@ -745,92 +809,68 @@ def load_csv_data() -> List[Dict]:
 
         Оставляет только действия пользователя (page.goto, page.get_by_role, etc.)
         """
-        import re
-
         # CRITICAL FIX: Normalize tabs to spaces BEFORE processing
         # This prevents TabError and IndentationError when user copies code with mixed tabs/spaces
         user_code = user_code.replace('\t', '    ')  # Replace all tabs with 4 spaces
 
-        lines = user_code.split('\n')
+        lines = parse_recording(user_code).lines
         cleaned_lines = []
         in_run_function = False
         base_indent = None
 
-        for line in lines:
-            stripped = line.strip()
+        for ir_line in lines:
+            line = ir_line.raw
+            stripped = ir_line.text
 
             # Skip empty lines
-            if not stripped:
+            if ir_line.kind == BLANK:
                 continue
 
-            # Check if comment is a special command - if yes, keep it
-            if stripped.startswith('#'):
-                comment_lower = stripped.lower()
-                # Special commands that should be preserved
-                is_special_command = (
-                    re.match(r'#\s*pause\s*\d+', comment_lower) or  # #pause10
-                    comment_lower in ['#scrolldown', '#scroll', '#scrollup', '#scrollmid', '#toggle_switches', '#optional']
+            # Keep special commands, skip regular comments
+            if ir_line.kind in (COMMAND, COMMENT):
+                is_special_command = ir_line.command in _KEPT_COMMANDS or (
+                    ir_line.command == 'optional' and ir_line.command_args == (None,)
                 )
                 if not is_special_command:
-                    # Skip regular comments
                     continue
                 # If it's a special command, DON'T continue - let it be processed through indentation handling below
 
             # Skip imports
-            if stripped.startswith('import ') or stripped.startswith('from '):
+            if ir_line.kind == IMPORT:
                 continue
 
             # Skip def run(playwright) line
-            if 'def run(' in stripped and 'playwright' in stripped:
+            if stripped.startswith('def run(') and 'playwright' in stripped:
                 in_run_function = True
                 continue
 
             # Skip browser/context/page setup
-            if any(pattern in stripped for pattern in [
-                'browser = playwright.chromium.launch',
-                'context = browser.new_context',
-                'page = context.new_page',
-                'browser.launch(',
-                'new_context(',
-                'new_page('
-            ]):
+            if ir_line.calls & {'launch', 'new_context', 'new_page'}:
                 continue
 
             # Skip browser/context close
-            if any(pattern in stripped for pattern in [
-                'context.close()',
-                'browser.close()',
-                '.close()'
-            ]) and 'page' not in stripped:
+            if 'close' in ir_line.calls and 'page' not in stripped:
                 continue
 
             # Skip with sync_playwright wrapper
-            if 'with sync_playwright()' in stripped:
+            if ir_line.kind == WITH and 'sync_playwright' in ir_line.calls:
                 continue
             if stripped == 'run(playwright)':
                 continue
 
-            # Skip separator comments
-            if stripped.startswith('# -----'):
-                continue
-
             # Transform heading clicks into check_heading() calls
-            if 'get_by_role("heading"' in stripped or "get_by_role('heading'" in stripped:
-                # Extract heading text using regex
-                # Patterns: page.get_by_role("heading", name="TEXT").click()
-                #           page.get_by_role('heading', name='TEXT').click()
-                match = re.search(r'get_by_role\(["\']heading["\']\s*,\s*name=["\']([^"\']+)["\']', stripped)
-                if match:
-                    heading_text = match.group(1)
+            if ir_line.role == 'heading':
+                heading_text = ir_line.name
+                if heading_text:
                     # Get current line indentation
-                    current_indent = len(line) - len(line.lstrip())
+                    current_indent = ir_line.indent
 
                     # Remove base indentation if we're in run function
                     if in_run_function and base_indent is not None:
                         current_indent = max(0, current_indent - base_indent)
 
                     # Generate check_heading call with fast timeout (5s) for quick fail-over
-                    transformed_line = ' ' * current_indent + f'check_heading(page, ["{heading_text}"], timeout=5000)'
+                    transformed_line = ' ' * current_indent + f'check_heading(page, [{py_str(heading_text)}], timeout=5000)'
                     cleaned_lines.append(transformed_line)
                     continue
                 else:
@@ -946,9 +986,7 @@ def load_csv_data() -> List[Dict]:
         - with page.expect_popup() (критично - НЕ оборачиваем)
         - page.goto() (критично - НЕ оборачиваем)
         """
-        import re
-
-        lines = code.split('\n')
+        lines = parse_recording(code).lines
         wrapped_lines = []
         i = 0
         inside_with_block = False
@@ -958,27 +996,22 @@ def load_csv_data() -> List[Dict]:
         current_page_context = 'page'  # Track current page context (page, page1, page2, page3)
 
         while i < len(lines):
-            line = lines[i]
-            stripped = line.strip()
+            ir_line = lines[i]
+            line = ir_line.raw
+            stripped = ir_line.text
 
             # Check for inline special commands (e.g., "page.fill(...)  #pause10")
             inline_command = None
-            if '#' in stripped and not stripped.startswith('#'):
-                # Split code and comment
-                code_part, _, comment_part = stripped.partition('#')
-                code_part = code_part.strip()
-                comment_part = '#' + comment_part.strip()
-
-                # Check if comment is a special command
-                if self._is_special_command(comment_part):
-                    inline_command = comment_part
-                    stripped = code_part  # Continue processing with code only
+            if ir_line.code and ir_line.comment:
+                comment = analyze(ir_line.comment)
+                if comment.command:
+                    inline_command = comment
+                    stripped = ir_line.code  # Continue processing with code only
                     # Recreate line with proper indentation
-                    indent = len(line) - len(line.lstrip())
-                    line = ' ' * indent + code_part
+                    line = ' ' * ir_line.indent + stripped
 
             # Check for #optional marker
-            if stripped.lower() == '#optional':
+            if ir_line.command == 'optional' and ir_line.command_args == (None,):
                 next_action_optional = True
                 # Calculate correct indentation (accounting for 'with' blocks)
                 indent = len(line) - len(line.lstrip())
@@ -990,7 +1023,7 @@ def load_csv_data() -> List[Dict]:
                 continue
 
             # Check for #scroll_search marker
-            if stripped.lower() == '#scroll_search':
+            if ir_line.command == 'scroll_search':
                 next_action_scroll_search = True
                 # Calculate correct indentation (accounting for 'with' blocks)
                 indent = len(line) - len(line.lstrip())
@@ -1002,13 +1035,13 @@ def load_csv_data() -> List[Dict]:
                 continue
 
             # Skip empty lines
-            if not stripped:
+            if ir_line.kind == BLANK:
                 wrapped_lines.append(line)
                 i += 1
                 continue
 
             # Handle special command comments BEFORE treating as regular comments
-            if stripped.startswith('#'):
+            if ir_line.kind in (COMMAND, COMMENT):
                 # Calculate correct indentation (accounting for 'with' blocks)
                 indent = len(line) - len(line.lstrip())
 
@@ -1019,7 +1052,7 @@ def load_csv_data() -> List[Dict]:
                     indent = with_block_indent + 4
 
                 indent_str = ' ' * indent
-                command_handled = self._handle_special_command(stripped, indent_str, wrapped_lines, current_page_context)
+                command_handled = self._handle_special_command(ir_line, indent_str, wrapped_lines, current_page_context)
                 if command_handled:
                     # Special command was processed, continue to next line
                     i += 1
@@ -1031,26 +1064,18 @@ def load_csv_data() -> List[Dict]:
                     continue
 
             # Get current indentation
-            indent = len(line) - len(line.lstrip())
+            indent = ir_line.indent
             indent_str = ' ' * indent
+            is_with = ir_line.kind == WITH
 
             # Track if we're inside a 'with' block (page, page1, page2, page3)
-            if any(pattern in stripped for pattern in [
-                'with page.expect_popup(',
-                'with page.expect_navigation(',
-                'with page1.expect_popup(',
-                'with page1.expect_navigation(',
-                'with page2.expect_popup(',
-                'with page2.expect_navigation(',
-                'with page3.expect_popup(',
-                'with page3.expect_navigation(',
-            ]):
+            if is_with and ir_line.with_method in ('expect_popup', 'expect_navigation') and ir_line.with_receiver in _PAGE_VARS:
                 inside_with_block = True
                 with_block_indent = indent
 
             # Fix indentation if code inside 'with' block has no indent (BEFORE checking exit!)
             # This MUST be done before "exited with block" check
-            if inside_with_block and indent <= with_block_indent and stripped and not stripped.startswith('with'):
+            if inside_with_block and indent <= with_block_indent and not is_with:
                 # We're inside a with block but line has same/less indent - FIX IT
                 # This happens when code is copy-pasted and loses indentation
                 print(f"[GENERATOR] [WARNING] Fixed indentation inside 'with' block for: {stripped[:50]}")
@@ -1059,35 +1084,22 @@ def load_csv_data() -> List[Dict]:
                 stripped = line.strip()  # Keep stripped version updated
                 indent = with_block_indent + 4  # Update indent for further processing
                 indent_str = ' ' * indent
-            elif inside_with_block and indent <= with_block_indent and not stripped.startswith('with'):
+            elif inside_with_block and indent <= with_block_indent and not is_with:
                 # Only exit 'with' block if we didn't just fix indentation
                 # and this is not the 'with' statement itself
                 inside_with_block = False
 
             # Check if this is a critical action that should NOT be wrapped (must succeed)
-            is_critical = any(pattern in stripped for pattern in [
-                'page.goto(',
-                'with page.expect_popup(',
-                'with page.expect_navigation(',
-                'check_heading(',  # Already has resilience built-in
-                '= page',  # Variable assignments (page1 = ...)
-                'wait_for_navigation(',
-                'page1.',  # Actions on popup windows (page1, page2, etc.) - critical
-                'page2.',
-                'page3.',
-            ])
+            is_popup_page = ir_line.page_var is not None and ir_line.page_var != 'page'
+            is_critical = (
+                is_with
+                or ir_line.kind == ASSIGN  # Variable assignments (page1 = ...)
+                or is_popup_page  # Actions on popup windows (page1, page2, etc.) - critical
+                or bool(ir_line.calls & _CRITICAL_CALLS)  # goto, check_heading (already has resilience built-in)
+            )
 
             # Check if this is a resilient action (click, fill, etc.)
-            is_action = any(pattern in stripped for pattern in [
-                '.click(',
-                '.fill(',
-                '.select_option(',
-                '.check(',
-                '.uncheck(',
-                '.set_checked(',
-                '.press(',
-                '.type(',
-            ])
+            is_action = ir_line.action is not None
 
             # Actions inside 'with' blocks are critical (must succeed to open popup/navigate)
             # BUT: if #optional marker was set, respect it even inside with blocks
@@ -1101,11 +1113,11 @@ def load_csv_data() -> List[Dict]:
                 next_action_optional = False  # Reset marker ONLY after processing an action
 
             # Check if this is a popup page action (page1/page2/page3) that needs retry logic
-            is_popup_action = is_action and any(f'page{n}.' in stripped for n in [1, 2, 3])
+            is_popup_action = is_action and is_popup_page
 
             # If #scroll_search marker was set, generate aggressive scroll search code
             if next_action_scroll_search and is_action:
-                action_desc = self._extract_action_description(stripped)
+                action_desc = self._extract_action_description(ir_line)
                 action_desc = action_desc.replace("'", "'").replace("'", "'").replace('"', '\\"')
                 sanitized_code = stripped.replace("'", "'").replace("'", "'")
                 sanitized_code = self._replace_fill_with_typing(sanitized_code)
@@ -1120,10 +1132,8 @@ def load_csv_data() -> List[Dict]:
                 # Add explicit timeout to the action
                 sanitized_code = self._add_timeout_to_action(sanitized_code, timeout_ms=scroll_timeout)
 
-                # Extract page variable (page, page1, page2, page3)
-                import re
-                match = re.search(r'(page\d*)\.', stripped)
-                page_var = match.group(1) if match else 'page'
+                # Page variable (page, page1, page2, page3)
+                page_var = ir_line.page_var or 'page'
 
                 # Extract element selector for logging
                 selector_part = stripped.split(f'{page_var}.')[1] if f'{page_var}.' in stripped else stripped
@@ -1173,7 +1183,7 @@ def load_csv_data() -> List[Dict]:
             # Wrap action in try-except if it's resilient (not critical)
             if is_action and not is_critical:
                 # Extract action description for logging (sanitize quotes)
-                action_desc = self._extract_action_description(stripped)
+                action_desc = self._extract_action_description(ir_line)
                 # Replace curly quotes for safe f-string usage in logs
                 action_desc = action_desc.replace("'", "'").replace("'", "'").replace('"', '\\"')
 
@@ -1196,21 +1206,16 @@ def load_csv_data() -> List[Dict]:
                 wrapped_lines.append(f"{indent_str}    pass  # Continue execution")
             elif is_popup_action and is_critical:
                 # Popup page actions need retry logic with extended timeout
-                action_desc = self._extract_action_description(stripped)
+                action_desc = self._extract_action_description(ir_line)
                 action_desc = action_desc.replace("'", "'").replace("'", "'").replace('"', '\\"')
                 sanitized_code = stripped.replace("'", "'").replace("'", "'")
 
                 # 🔥 Replace .fill() with .press_sequentially() for human typing simulation
                 sanitized_code = self._replace_fill_with_typing(sanitized_code)
 
-                # Extract page variable and selector for smart handling
-                import re
-                match = re.search(r'(page\d+)\.', stripped)
-                page_var = match.group(1) if match else 'page1'
-
-                # Extract selector information for element checking
-                selector_match = re.search(r'\.get_by_\w+\([^)]+\)', stripped) or re.search(r'\.locator\([^)]+\)', stripped)
-                has_selector = bool(selector_match)
+                # Page variable and selector for smart handling
+                page_var = ir_line.page_var
+                has_selector = ir_line.locator is not None
 
                 wrapped_lines.append(f"{indent_str}# Retry logic for popup page action with progressive delays and smart scrolling")
                 wrapped_lines.append(f"{indent_str}max_retries = 5")
@@ -1279,82 +1284,37 @@ def load_csv_data() -> List[Dict]:
                 # 🔥 Replace .fill() with .press_sequentially() for human typing simulation
                 sanitized_line = self._replace_fill_with_typing(sanitized_line)
 
-                # Check for special command comments (e.g., #pause10, #scrolldown)
-                if stripped.startswith('#'):
-                    command_handled = self._handle_special_command(stripped, indent_str, wrapped_lines, current_page_context)
-                    if command_handled:
-                        i += 1
-                        continue
-
                 wrapped_lines.append(sanitized_line)
 
                 # If this is a popup page assignment, add scroll verification code
                 # This helps verify page control and loads elements at the bottom
-                if '= page1_info.value' in sanitized_line or '= page2_info.value' in sanitized_line or '= page3_info.value' in sanitized_line:
-                    # Extract page variable name (page1, page2, etc.)
-                    import re
-                    match = re.search(r'(\w+)\s*=\s*page\d+_info\.value', sanitized_line)
-                    if match:
-                        page_var = match.group(1)
-                        # Update current page context for special commands
-                        current_page_context = page_var
-                        wrapped_lines.append(f"{indent_str}# Wait for popup page to load and stabilize")
-                        wrapped_lines.append(f"{indent_str}time.sleep(1.5)  # Extended wait for popup to fully load")
-                        wrapped_lines.append(f"{indent_str}{page_var}.wait_for_load_state('domcontentloaded')")
-                        wrapped_lines.append(f"{indent_str}try:")
-                        wrapped_lines.append(f"{indent_str}    {page_var}.wait_for_load_state('networkidle', timeout=10000)")
-                        wrapped_lines.append(f'{indent_str}    print(f"[POPUP] Network stabilized on {page_var}", flush=True)')
-                        wrapped_lines.append(f"{indent_str}except:")
-                        wrapped_lines.append(f'{indent_str}    print(f"[POPUP] Network idle timeout - continuing anyway", flush=True)')
-                        wrapped_lines.append(f"{indent_str}    pass")
-                        wrapped_lines.append(f'{indent_str}print(f"[POPUP] [OK] {page_var} page loaded - use #scrolldown/#scrollmid for manual scroll control", flush=True)')
+                if ir_line.popup_info in ('page1_info', 'page2_info', 'page3_info') and ir_line.target:
+                    page_var = ir_line.target
+                    # Update current page context for special commands
+                    current_page_context = page_var
+                    wrapped_lines.append(f"{indent_str}# Wait for popup page to load and stabilize")
+                    wrapped_lines.append(f"{indent_str}time.sleep(1.5)  # Extended wait for popup to fully load")
+                    wrapped_lines.append(f"{indent_str}{page_var}.wait_for_load_state('domcontentloaded')")
+                    wrapped_lines.append(f"{indent_str}try:")
+                    wrapped_lines.append(f"{indent_str}    {page_var}.wait_for_load_state('networkidle', timeout=10000)")
+                    wrapped_lines.append(f'{indent_str}    print(f"[POPUP] Network stabilized on {page_var}", flush=True)')
+                    wrapped_lines.append(f"{indent_str}except:")
+                    wrapped_lines.append(f'{indent_str}    print(f"[POPUP] Network idle timeout - continuing anyway", flush=True)')
+                    wrapped_lines.append(f"{indent_str}    pass")
+                    wrapped_lines.append(f'{indent_str}print(f"[POPUP] [OK] {page_var} page loaded - use #scrolldown/#scrollmid for manual scroll control", flush=True)')
 
             # Process inline special command if found
             if inline_command:
                 indent_str = ' ' * (len(line) - len(line.lstrip()))
                 command_handled = self._handle_special_command(inline_command, indent_str, wrapped_lines, current_page_context)
                 if not command_handled:
-                    print(f"[GENERATOR] [WARNING] Inline command not recognized: {inline_command}")
+                    print(f"[GENERATOR] [WARNING] Inline command not recognized: {inline_command.text}")
 
             i += 1
 
         return '\n'.join(wrapped_lines)
 
-    def _is_special_command(self, comment: str) -> bool:
-        """
-        Проверить, является ли комментарий специальной командой
-
-        Args:
-            comment: Комментарий для проверки
-
-        Returns:
-            True если это специальная команда, False если обычный комментарий
-        """
-        import re
-        comment_lower = comment.lower().strip()
-
-        # Check for pause command
-        if re.match(r'#\s*pause\s*\d+', comment_lower):
-            return True
-
-        # Check for other special commands
-        special_commands = [
-            '#toggle_switches',
-            '#optional',
-            '#scroll_search',
-            '#scrolldown',
-            '#scroll',
-            '#scrollup',
-            '#scrollmid'
-        ]
-
-        for cmd in special_commands:
-            if comment_lower == cmd or comment_lower.replace(' ', '') == cmd:
-                return True
-
-        return False
-
-    def _handle_special_command(self, comment: str, indent_str: str, wrapped_lines: list, page_context: str = 'page') -> bool:
+    def _handle_special_command(self, command: Statement, indent_str: str, wrapped_lines: list, page_context: str = 'page') -> bool:
         """
         Обработать специальные команды в комментариях
 
@@ -1368,19 +1328,17 @@ def load_csv_data() -> List[Dict]:
         - #scroll_search - агрессивный поиск элемента по всей странице (скролл вверх-вниз-середина)
 
         Args:
+            command: Разобранный комментарий (recorder_ir.Statement)
             page_context: Текущий контекст страницы (page, page1, page2, page3)
 
         Returns:
             True если команда обработана, False если это обычный комментарий
         """
-        import re
-
-        comment_lower = comment.lower().strip()
+        name = command.command
 
         # #pause5, #pause10, #pause20 - пауза N секунд (поддерживает пробелы: "# pause10")
-        pause_match = re.match(r'#\s*pause\s*(\d+)', comment_lower)
-        if pause_match:
-            seconds = pause_match.group(1)
+        if name == 'pause':
+            seconds = command.command_args[0]
             wrapped_lines.append(f"{indent_str}# User command: pause {seconds} seconds")
             wrapped_lines.append(f"{indent_str}print(f'[PAUSE] Waiting {seconds} seconds...', flush=True)")
             wrapped_lines.append(f"{indent_str}time.sleep({seconds})")
@@ -1388,7 +1346,7 @@ def load_csv_data() -> List[Dict]:
             return True
 
         # #toggle_switches - переключить switches (первый checked -> uncheck, первый unchecked -> check)
-        if comment_lower == '#toggle_switches':
+        if name == 'toggle_switches':
             wrapped_lines.append(f"{indent_str}# User command: toggle switches")
             wrapped_lines.append(f"{indent_str}print(f'[SWITCHES] Toggling switches on {page_context}...')")
             wrapped_lines.append(f"{indent_str}try:")
@@ -1418,13 +1376,13 @@ def load_csv_data() -> List[Dict]:
             return True
 
         # #optional - следующее действие опционально (будет обработано в основном коде)
-        if comment_lower == '#optional':
+        if name == 'optional':
             # This is a marker - will be handled in the main wrapping logic
             # Just preserve the comment for now
             return False
 
         # #scrolldown or #scroll - скролл вниз
-        if comment_lower in ['#scrolldown', '#scroll']:
+        if name in ['scrolldown', 'scroll']:
             wrapped_lines.append(f"{indent_str}# User command: scroll down")
             wrapped_lines.append(f"{indent_str}print(f'[SCROLL] Scrolling down on {page_context}...')")
             wrapped_lines.append(f"{indent_str}{page_context}.evaluate('window.scrollTo(0, document.body.scrollHeight)')")
@@ -1432,7 +1390,7 @@ def load_csv_data() -> List[Dict]:
             return True
 
         # #scrollup - скролл вверх
-        if comment_lower == '#scrollup':
+        if name == 'scrollup':
             wrapped_lines.append(f"{indent_str}# User command: scroll up")
             wrapped_lines.append(f"{indent_str}print(f'[SCROLL] Scrolling up on {page_context}...')")
             wrapped_lines.append(f"{indent_str}{page_context}.evaluate('window.scrollTo(0, 0)')")
@@ -1440,7 +1398,7 @@ def load_csv_data() -> List[Dict]:
             return True
 
         # #scrollmid - скролл к середине
-        if comment_lower == '#scrollmid':
+        if name == 'scrollmid':
             wrapped_lines.append(f"{indent_str}# User command: scroll to middle")
             wrapped_lines.append(f"{indent_str}print(f'[SCROLL] Scrolling to middle on {page_context}...')")
             wrapped_lines.append(f"{indent_str}{page_context}.evaluate('window.scrollTo(0, document.body.scrollHeight / 2)')")
@@ -1450,50 +1408,36 @@ def load_csv_data() -> List[Dict]:
         # Not a special command, just a regular comment
         return False
 
-    def _extract_action_description(self, line: str) -> str:
+    def _extract_action_description(self, stmt: Statement) -> str:
         """Извлечь описание действия для логирования"""
-        import re
-
-        # Try to extract element description from various patterns
+        action = stmt.action
 
         # page.get_by_role("button", name="Next").click()
-        match = re.search(r'get_by_role\(["\'](\w+)["\']\s*,\s*name=["\']([^"\']+)["\']', line)
-        if match:
-            role, name = match.groups()
-            action = 'click' if '.click(' in line else 'fill' if '.fill(' in line else 'action'
-            return f"{action} {role} '{name}'"
+        if stmt.role and stmt.name:
+            verb = action if action in ('click', 'fill') else 'action'
+            return f"{verb} {stmt.role} '{stmt.name}'"
 
         # page.get_by_text("Continue").click()
-        match = re.search(r'get_by_text\(["\']([^"\']+)["\']', line)
-        if match:
-            text = match.group(1)
-            action = 'click' if '.click(' in line else 'action'
-            return f"{action} text '{text}'"
+        if stmt.locator == 'get_by_text' and stmt.locator_arg:
+            verb = 'click' if action == 'click' else 'action'
+            return f"{verb} text '{stmt.locator_arg}'"
 
         # page.get_by_placeholder("Enter name").fill(value)
-        match = re.search(r'get_by_placeholder\(["\']([^"\']+)["\']', line)
-        if match:
-            placeholder = match.group(1)
-            return f"fill placeholder '{placeholder}'"
+        if stmt.locator == 'get_by_placeholder' and stmt.locator_arg:
+            return f"fill placeholder '{stmt.locator_arg}'"
 
         # page.locator("#id").click()
-        match = re.search(r'locator\(["\']([^"\']+)["\']', line)
-        if match:
-            selector = match.group(1)
-            action = 'click' if '.click(' in line else 'fill' if '.fill(' in line else 'action'
-            return f"{action} '{selector}'"
+        if stmt.selector:
+            verb = action if action in ('click', 'fill') else 'action'
+            return f"{verb} '{stmt.selector}'"
 
         # Default: show the method being called
-        if '.click(' in line:
-            return "click element"
-        elif '.fill(' in line:
-            return "fill field"
-        elif '.select_option(' in line:
-            return "select option"
-        elif '.check(' in line:
-            return "check checkbox"
-
-        return "action"
+        return {
+            'click': "click element",
+            'fill': "fill field",
+            'select_option': "select option",
+            'check': "check checkbox",
+        }.get(action, "action")
 
     def _generate_main_iteration(self, user_code: str, network_capture_patterns: List = None) -> str:
         # Clean user code from Playwright Recorder boilerplate
@@ -0,0 +1,15 @@
+"""
+Runtime сгенерированных скриптов
+
+Общий код, который раньше встраивался в каждый сгенерированный скрипт
+(Octobrowser API, прокси, 9Proxy, CSV, поиск ответов, worker и main).
+Скрипт импортирует его из проекта, поэтому Python берет скомпилированный
+.pyc из __pycache__, а исправление в runtime сразу действует для всех
+уже сгенерированных скриптов.
+
+RUNTIME_VERSION увеличивается при несовместимом изменении интерфейса
+(имена настроек configure(), сигнатура run_iteration) - скрипт, собранный
+под другую версию, останавливается с просьбой перегенерировать его.
+"""
+
+RUNTIME_VERSION = 1
@@ -5,9 +5,13 @@
 from .base_provider import BaseSMSProvider
 from .daisy_sms_provider import DaisySMSProvider
 from .provider_manager import ProviderManager
+from .otp_poller import OTPPoller
+from .number_pool import PhoneNumberPool
 
 __all__ = [
     'BaseSMSProvider',
     'DaisySMSProvider',
-    'ProviderManager'
+    'ProviderManager',
+    'OTPPoller',
+    'PhoneNumberPool'
 ]
@@ -2,6 +2,7 @@
 Базовый абстрактный класс для SMS провайдеров
 """
 from abc import ABC, abstractmethod
+import threading
 from typing import Dict, Optional, List
 from enum import Enum
 
@@ -22,6 +23,11 @@ class BaseSMSProvider(ABC):
     Все провайдеры должны наследоваться от этого класса и реализовывать его методы.
     """
 
+    # Интервал опроса одной активации в OTPPoller (секунды)
+    POLL_INTERVAL = 3.0
+    # Минимальная пауза между любыми запросами статуса провайдера (секунды)
+    MIN_REQUEST_GAP = 0.0
+
     def __init__(self, api_key: str, **kwargs):
         """
         Инициализация провайдера
@@ -33,6 +39,15 @@ class BaseSMSProvider(ABC):
         self.api_key = api_key
         self.config = kwargs
         self._active_activations = {}  # {activation_id: {...}}
+        self._otp_poller = None
+        self._otp_poller_lock = threading.Lock()
+
+        # Статистика для маршрутизации ProviderManager: 'number' - аренда номера, 'code' - доставка кода
+        self._call_stats_lock = threading.Lock()
+        self._call_stats = {
+            kind: {'calls': 0, 'failures': 0, 'latency': None, 'failure_rate': 0.0}
+            for kind in ('number', 'code')
+        }
 
     @abstractmethod
     def get_balance(self) -> Dict:
@@ -141,6 +156,76 @@ class BaseSMSProvider(ABC):
         """
         pass
 
+    def check_status(self, activation_id: str) -> Dict:
+        """
+        Один запрос статуса активации (без ожидания)
+
+        Используется OTPPoller. Провайдеры с getStatus-подобным API переопределяют метод;
+        по умолчанию - статус ERROR, и OTPPoller сразу завершает ожидание с ошибкой.
+
+        Returns:
+            Dict: {
+                'status': SMSStatus (WAITING - кода еще нет),
+                'code': Optional[str],
+                'full_text': Optional[str],
+                'error': Optional[str]
+            }
+        """
+        return {
+            'status': SMSStatus.ERROR,
+            'code': None,
+            'full_text': None,
+            'error': f"{self.get_provider_name()} не поддерживает check_status"
+        }
+
+    def get_otp_poller(self):
+        """
+        Общий опросчик OTP этого провайдера (создается при первом вызове)
+
+        Returns:
+            OTPPoller
+        """
+        with self._otp_poller_lock:
+            if self._otp_poller is None:
+                from .otp_poller import OTPPoller
+                self._otp_poller = OTPPoller(self)
+            return self._otp_poller
+
+    def _forget_otp(self, activation_id: str, status: SMSStatus = SMSStatus.CANCELLED, error: str = 'Активация отменена'):
+        """Снять активацию с опроса OTP (после отмены/завершения)"""
+        if self._otp_poller is not None:
+            self._otp_poller.forget(activation_id, status, error)
+
+    def record_call(self, kind: str, success: bool, seconds: Optional[float] = None, decay: float = 0.3):
+        """
+        Записать результат вызова (скользящие латентность и доля ошибок)
+
+        Args:
+            kind: 'number' (аренда номера) или 'code' (доставка SMS кода)
+            success: Успешен ли вызов
+            seconds: Длительность успешного вызова
+            decay: Вес нового результата в скользящей оценке
+        """
+        with self._call_stats_lock:
+            entry = self._call_stats.setdefault(kind, {'calls': 0, 'failures': 0, 'latency': None, 'failure_rate': 0.0})
+            entry['calls'] += 1
+            entry['failure_rate'] += decay * ((0.0 if success else 1.0) - entry['failure_rate'])
+            if success and seconds is not None:
+                entry['latency'] = seconds if entry['latency'] is None else entry['latency'] + decay * (seconds - entry['latency'])
+            elif not success:
+                entry['failures'] += 1
+
+    def get_call_stats(self) -> Dict:
+        """
+        Статистика вызовов провайдера
+
+        Returns:
+            Dict: {'number': {...}, 'code': {...}} с полями calls, failures,
+            latency (скользящая, секунды или None), failure_rate
+        """
+        with self._call_stats_lock:
+            return {kind: dict(entry) for kind, entry in self._call_stats.items()}
+
     def get_provider_name(self) -> str:
         """
         Получить название провайдера
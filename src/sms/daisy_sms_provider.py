@@ -16,6 +16,11 @@ class DaisySMSProvider(BaseSMSProvider):
 
     BASE_URL = "https://daisysms.com/stubs/handler_api.php"
 
+    # Минимум 3 секунды между запросами статуса одной активации (по документации),
+    # общий поток опроса делает не больше 5 запросов getStatus в секунду
+    POLL_INTERVAL = 3.0
+    MIN_REQUEST_GAP = 0.2
+
     def __init__(self, api_key: str, **kwargs):
         """
         Инициализация DaisySMS провайдера
@@ -180,6 +185,9 @@ class DaisySMSProvider(BaseSMSProvider):
         """
         Получить SMS код
 
+        Ожидание идет через общий OTPPoller провайдера: все ожидающие активации
+        опрашиваются одним потоком, вызывающий поток только ждет результат.
+
         Args:
             activation_id: ID активации
             timeout: Максимальное время ожидания (секунды)
@@ -193,63 +201,56 @@ class DaisySMSProvider(BaseSMSProvider):
                 'error': Optional[str]
             }
         """
-        start_time = time.time()
-        poll_interval = 3  # Минимум 3 секунды между запросами (по документации)
+        return self.get_otp_poller().wait_code(activation_id, timeout=timeout)
 
-        while (time.time() - start_time) < timeout:
-            response = self._make_request('getStatus', id=activation_id)
-
-            # STATUS_OK:CODE - SMS получено
-            if response.startswith('STATUS_OK:'):
-                code = response.split(':')[1]
-                self._remove_activation(activation_id)
+    def check_status(self, activation_id: str) -> Dict:
+        """
+        Один запрос getStatus
 
-                return {
-                    'code': code,
-                    'full_text': response,
-                    'status': SMSStatus.RECEIVED,
-                    'success': True,
-                    'error': None
-                }
+        Args:
+            activation_id: ID активации
 
-            # STATUS_WAIT_CODE - ожидание
-            elif response == 'STATUS_WAIT_CODE':
-                time.sleep(poll_interval)
-                continue
+        Returns:
+            Dict: {'status': SMSStatus, 'code': Optional[str], 'full_text': Optional[str], 'error': Optional[str]}
+        """
+        response = self._make_request('getStatus', id=activation_id)
 
-            # STATUS_CANCEL - отменено
-            elif response == 'STATUS_CANCEL':
-                self._remove_activation(activation_id)
-                return {
-                    'code': None,
-                    'full_text': response,
-                    'status': SMSStatus.CANCELLED,
-                    'success': False,
-                    'error': 'Активация отменена'
-                }
+        # STATUS_OK:CODE - SMS получено
+        if response.startswith('STATUS_OK:'):
+            self._remove_activation(activation_id)
+            return {
+                'status': SMSStatus.RECEIVED,
+                'code': response.split(':')[1],
+                'full_text': response,
+                'error': None
+            }
 
-            # NO_ACTIVATION - неверный ID
-            elif response == 'NO_ACTIVATION':
-                self._remove_activation(activation_id)
-                return {
-                    'code': None,
-                    'full_text': response,
-                    'status': SMSStatus.ERROR,
-                    'success': False,
-                    'error': 'Активация не найдена'
-                }
+        # STATUS_CANCEL - отменено
+        if response == 'STATUS_CANCEL':
+            self._remove_activation(activation_id)
+            return {
+                'status': SMSStatus.CANCELLED,
+                'code': None,
+                'full_text': response,
+                'error': 'Активация отменена'
+            }
 
-            # Другие ошибки
-            else:
-                time.sleep(poll_interval)
+        # NO_ACTIVATION - неверный ID
+        if response == 'NO_ACTIVATION':
+            self._remove_activation(activation_id)
+            return {
+                'status': SMSStatus.ERROR,
+                'code': None,
+                'full_text': response,
+                'error': 'Активация не найдена'
+            }
 
-        # Timeout
+        # STATUS_WAIT_CODE и временные ошибки - продолжаем ждать
         return {
+            'status': SMSStatus.WAITING,
             'code': None,
-            'full_text': None,
-            'status': SMSStatus.TIMEOUT,
-            'success': False,
-            'error': f'Превышено время ожидания ({timeout}s)'
+            'full_text': response,
+            'error': None if response == 'STATUS_WAIT_CODE' else response
         }
 
     def cancel_activation(self, activation_id: str) -> Dict:
@@ -266,6 +267,7 @@ class DaisySMSProvider(BaseSMSProvider):
 
         if response == 'ACCESS_CANCEL':
             self._remove_activation(activation_id)
+            self._forget_otp(activation_id)
             return {
                 'success': True,
                 'error': None
@@ -290,6 +292,7 @@ class DaisySMSProvider(BaseSMSProvider):
 
         if response == 'ACCESS_ACTIVATION':
             self._remove_activation(activation_id)
+            self._forget_otp(activation_id, SMSStatus.ERROR, 'Активация завершена')
             return {
                 'success': True,
                 'error': None
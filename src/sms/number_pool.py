@@ -0,0 +1,267 @@
+"""
+Пул заранее арендованных номеров (prefetch) для SMS сценариев
+
+Номер запрашивается не в момент, когда форма дошла до поля телефона,
+а заранее в фоне:
+- держит до size готовых активаций впереди спроса
+- выдает их итерациям через acquire() (без ожидания API, если номер готов)
+- номера, не выданные дольше max_age, автоматически отменяются (деньги возвращаются)
+- считает задержку аренды номера у провайдера и ожидание в acquire()
+
+Не зависит от других модулей проекта - встраивается в сгенерированные скрипты.
+Провайдер - любой объект с get_number(service, **params) и cancel_activation(id),
+возвращающими словари как у BaseSMSProvider.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class PhoneNumberPool:
+    """Фоновая аренда номеров впереди спроса"""
+
+    def __init__(self, provider, service: str, size: int = 2, max_age: float = 600.0,
+                 max_backoff: float = 60.0, **number_params):
+        """
+        Args:
+            provider: SMS провайдер (get_number / cancel_activation)
+            service: Код сервиса для get_number
+            size: Сколько готовых номеров держать заранее
+            max_age: Сколько секунд номер может ждать в пуле до автоотмены
+            max_backoff: Максимальная пауза после ошибок аренды
+            **number_params: Параметры get_number (max_price, areas, carriers, ...)
+        """
+        self.provider = provider
+        self.service = service
+        self.size = max(0, size)
+        self.max_age = max_age
+        self.max_backoff = max_backoff
+        self.number_params = number_params
+
+        self._cond = threading.Condition()
+        self._ready: List[Dict] = []  # [{'activation_id', 'phone_number', ..., 'rented_at'}]
+        self._waiters = 0
+        self._stopped = True
+        self._thread: Optional[threading.Thread] = None
+        self._failures_in_row = 0
+        self._retry_at = 0.0
+
+        self._stats = {
+            'rented': 0,
+            'acquired': 0,
+            'hits': 0,  # Номер был готов в момент acquire()
+            'misses': 0,
+            'expired': 0,
+            'rent_failures': 0,
+            'rent_seconds': 0.0,
+            'rent_max': 0.0,
+            'wait_seconds': 0.0,
+            'wait_max': 0.0,
+        }
+
+    # ==================== УПРАВЛЕНИЕ ====================
+
+    def start(self):
+        """Запустить фоновую аренду"""
+        with self._cond:
+            if not self._stopped:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='PhoneNumberPool', daemon=True)
+            self._thread.start()
+
+    def stop(self, cancel_unused: bool = True) -> int:
+        """
+        Остановить пул
+
+        Args:
+            cancel_unused: Отменить невыданные номера
+
+        Returns:
+            Сколько номеров отменено
+        """
+        with self._cond:
+            self._stopped = True
+            unused = self._ready
+            self._ready = []
+            self._cond.notify_all()
+
+        if not cancel_unused:
+            return 0
+        return sum(1 for number in unused if self._cancel(number))
+
+    def acquire(self, timeout: float = 120.0) -> Dict:
+        """
+        Получить номер
+
+        Если готового номера нет - ждет фоновую аренду (при остановленном
+        пуле арендует сам).
+
+        Returns:
+            Dict как у get_number (+ 'waited' - сколько секунд ждали):
+            {'activation_id', 'phone_number', 'service', 'success', 'error', 'waited'}
+        """
+        started = time.monotonic()
+
+        with self._cond:
+            stopped = self._stopped
+            self._stats['hits' if self._ready and not stopped else 'misses'] += 1
+            if not stopped:
+                self._waiters += 1
+                self._cond.notify_all()
+                try:
+                    deadline = started + timeout
+                    while not self._ready and not self._stopped:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(timeout=remaining)
+                    number = self._ready.pop(0) if self._ready else None
+                finally:
+                    self._waiters -= 1
+                    self._cond.notify_all()
+
+        if stopped:
+            number = self._rent()
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self._stats['wait_seconds'] += waited
+            self._stats['wait_max'] = max(self._stats['wait_max'], waited)
+            if number is not None:
+                self._stats['acquired'] += 1
+
+        if number is None:
+            return {
+                'activation_id': None,
+                'phone_number': None,
+                'service': self.service,
+                'success': False,
+                'error': f'Номер не получен за {timeout:.0f}s',
+                'waited': waited
+            }
+
+        result = {key: value for key, value in number.items() if key != 'rented_at'}
+        result['waited'] = waited
+        return result
+
+    def get_stats(self) -> Dict:
+        """
+        Статистика пула
+
+        Returns:
+            ready, rented, acquired, hits, misses, expired, rent_failures,
+            avg_rent / max_rent (задержка аренды у провайдера),
+            avg_wait / max_wait (ожидание в acquire)
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats['ready'] = len(self._ready)
+
+        rent_calls = stats['rented'] + stats['rent_failures']
+        calls = stats['hits'] + stats['misses']
+        return {
+            'ready': stats['ready'],
+            'rented': stats['rented'],
+            'acquired': stats['acquired'],
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'expired': stats['expired'],
+            'rent_failures': stats['rent_failures'],
+            'avg_rent': round(stats['rent_seconds'] / rent_calls, 2) if rent_calls else 0.0,
+            'max_rent': round(stats['rent_max'], 2),
+            'avg_wait': round(stats['wait_seconds'] / calls, 2) if calls else 0.0,
+            'max_wait': round(stats['wait_max'], 2),
+        }
+
+    # ==================== ФОНОВАЯ АРЕНДА ====================
+
+    def _rent(self) -> Optional[Dict]:
+        """Один вызов get_number с учетом статистики"""
+        started = time.monotonic()
+        try:
+            result = self.provider.get_number(self.service, **self.number_params)
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        elapsed = time.monotonic() - started
+
+        with self._cond:
+            self._stats['rent_seconds'] += elapsed
+            self._stats['rent_max'] = max(self._stats['rent_max'], elapsed)
+            if result.get('success'):
+                self._stats['rented'] += 1
+            else:
+                self._stats['rent_failures'] += 1
+
+        if not result.get('success'):
+            print(f"[SMS POOL] Не удалось арендовать номер: {result.get('error')}")
+            return None
+
+        number = dict(result)
+        number['rented_at'] = time.monotonic()
+        return number
+
+    def _cancel(self, number: Dict) -> bool:
+        try:
+            result = self.provider.cancel_activation(number['activation_id'])
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        if not result.get('success'):
+            print(f"[SMS POOL] Не удалось отменить {number['activation_id']}: {result.get('error')}")
+        return bool(result.get('success'))
+
+    def _take_expired(self, now: float) -> List[Dict]:
+        """Убрать из пула просроченные номера (вызывается под _cond)"""
+        expired = [number for number in self._ready if now - number['rented_at'] > self.max_age]
+        if expired:
+            self._ready = [number for number in self._ready if now - number['rented_at'] <= self.max_age]
+            self._stats['expired'] += len(expired)
+        return expired
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    now = time.monotonic()
+                    expired = self._take_expired(now)
+                    if expired:
+                        break
+
+                    need = self.size + self._waiters - len(self._ready)
+                    if need > 0 and now >= self._retry_at:
+                        break
+
+                    # Спим до истечения старейшего номера, окончания паузы или нового спроса
+                    wake = [n['rented_at'] + self.max_age - now for n in self._ready]
+                    if need > 0:
+                        wake.append(self._retry_at - now)
+                    self._cond.wait(timeout=max(0.05, min(wake)) if wake else None)
+
+            if expired:
+                for number in expired:
+                    print(f"[SMS POOL] Номер {number.get('phone_number')} не востребован {self.max_age:.0f}s - отмена")
+                    self._cancel(number)
+                continue
+
+            number = self._rent()
+
+            with self._cond:
+                if number is not None:
+                    self._failures_in_row = 0
+                    self._retry_at = 0.0
+                    if self._stopped:
+                        leftover = number
+                    else:
+                        leftover = None
+                        self._ready.append(number)
+                        self._cond.notify_all()
+                else:
+                    leftover = None
+                    self._failures_in_row += 1
+                    delay = min(2 ** self._failures_in_row, self.max_backoff)
+                    self._retry_at = time.monotonic() + delay
+
+            if leftover is not None:
+                self._cancel(leftover)
@@ -0,0 +1,205 @@
+"""
+Общий опросчик SMS кодов (OTP) для провайдера
+
+Вместо отдельного цикла getStatus в каждом ожидающем потоке один фоновый
+поток владеет всеми ожидающими активациями:
+- опрашивает их по единому расписанию через сессию провайдера
+- соблюдает минимальный интервал провайдера глобально (а не на поток)
+- будит ожидающих через Future, как только код пришел или активация закрыта
+"""
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Dict, Optional
+
+from .base_provider import SMSStatus
+
+
+class OTPPoller:
+    """Один поток опроса getStatus на все активации провайдера"""
+
+    # Запас к timeout в wait_code: опрос сам закрывает активацию по deadline,
+    # ожидающий не должен повиснуть, если поток опроса пропал
+    WAIT_MARGIN = 10
+
+    def __init__(self, provider, poll_interval: Optional[float] = None, request_gap: Optional[float] = None):
+        """
+        Args:
+            provider: SMS провайдер (должен реализовывать check_status)
+            poll_interval: Интервал опроса одной активации (по умолчанию provider.POLL_INTERVAL)
+            request_gap: Минимальная пауза между любыми запросами опроса (по умолчанию provider.MIN_REQUEST_GAP)
+        """
+        self.provider = provider
+        self.poll_interval = poll_interval if poll_interval is not None else provider.POLL_INTERVAL
+        self.request_gap = request_gap if request_gap is not None else provider.MIN_REQUEST_GAP
+
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Dict] = {}  # activation_id -> {future, deadline, next_poll, started}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._generation = 0  # номер текущего потока опроса: старый поток после stop() завершается сам
+        self._last_request = 0.0
+
+        self._stats = {
+            'watched': 0,
+            'received': 0,
+            'timeouts': 0,
+            'failed': 0,
+            'status_requests': 0,
+        }
+
+    def watch(self, activation_id: str, timeout: float = 180) -> Future:
+        """
+        Поставить активацию на опрос
+
+        Повторный вызов для той же активации возвращает тот же Future.
+
+        Returns:
+            Future с результатом в формате get_sms_code
+        """
+        with self._cond:
+            entry = self._pending.get(activation_id)
+            if entry is not None:
+                entry['deadline'] = max(entry['deadline'], time.monotonic() + timeout)
+                return entry['future']
+
+            now = time.monotonic()
+            entry = {
+                'future': Future(),
+                'deadline': now + timeout,
+                'next_poll': now,
+                'started': now,
+                'timeout': timeout,
+            }
+            self._pending[activation_id] = entry
+            self._stats['watched'] += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+            return entry['future']
+
+    def wait_code(self, activation_id: str, timeout: float = 180) -> Dict:
+        """Дождаться кода (блокирует только вызывающий поток, опрос идет в общем)"""
+        future = self.watch(activation_id, timeout)
+        try:
+            return future.result(timeout=timeout + self.poll_interval + self.WAIT_MARGIN)
+        except FutureTimeout:
+            self.forget(activation_id, SMSStatus.TIMEOUT, f"Превышено время ожидания ({timeout}s)")
+            return future.result()
+
+    def forget(self, activation_id: str, status: SMSStatus = SMSStatus.CANCELLED, error: str = 'Активация отменена'):
+        """Снять активацию с опроса (например, после cancel_activation) и разбудить ожидающих"""
+        with self._cond:
+            entry = self._pending.pop(activation_id, None)
+        if entry is not None:
+            self._resolve(entry, self._result(None, None, status, error))
+
+    def pending_count(self) -> int:
+        """Сколько активаций сейчас ожидает код"""
+        with self._cond:
+            return len(self._pending)
+
+    def stop(self):
+        """Остановить опрос, ожидающие получают ERROR"""
+        with self._cond:
+            self._stopped = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._cond.notify_all()
+        for entry in pending:
+            self._resolve(entry, self._result(None, None, SMSStatus.ERROR, 'Опрос остановлен'))
+
+    def get_stats(self) -> Dict:
+        """watched, received, timeouts, failed, status_requests, pending"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        return stats
+
+    # ==================== ЦИКЛ ОПРОСА ====================
+
+    def _ensure_thread(self):
+        """Запустить поток опроса (вызывается под _cond)"""
+        # После stop() старый поток может быть еще жив (в check_status) - он завершится
+        # по смене поколения, а новые активации опрашивает новый поток
+        if self._stopped or self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._generation += 1
+            self._thread = threading.Thread(target=self._run, args=(self._generation,), name='OTPPoller', daemon=True)
+            self._thread.start()
+
+    def _next_due(self, now: float) -> tuple:
+        """Ближайшая к опросу активация: (activation_id, через сколько секунд) или (None, None)"""
+        activation_id = None
+        wait = None
+        for key, entry in self._pending.items():
+            due = min(entry['next_poll'], entry['deadline']) - now
+            if wait is None or due < wait:
+                activation_id, wait = key, due
+        return activation_id, wait
+
+    def _run(self, generation: int):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped or generation != self._generation:
+                        return
+                    if not self._pending:
+                        # Пусто - поток засыпает до следующего watch (и завершается при простое)
+                        if not self._cond.wait(timeout=30) and not self._pending:
+                            if generation == self._generation:
+                                self._thread = None
+                            return
+                        continue
+
+                    now = time.monotonic()
+                    activation_id, wait = self._next_due(now)
+                    wait = max(wait, self._last_request + self.request_gap - now)
+                    if wait <= 0:
+                        break
+                    self._cond.wait(timeout=wait)
+
+                entry = self._pending[activation_id]
+                if now >= entry['deadline']:
+                    del self._pending[activation_id]
+                    self._stats['timeouts'] += 1
+                    expired = True
+                else:
+                    entry['next_poll'] = now + self.poll_interval
+                    self._last_request = now
+                    self._stats['status_requests'] += 1
+                    expired = False
+
+            if expired:
+                self._resolve(entry, self._result(
+                    None, None, SMSStatus.TIMEOUT, f"Превышено время ожидания ({entry['timeout']}s)"))
+                continue
+
+            try:
+                status = self.provider.check_status(activation_id)
+            except Exception as e:
+                status = {'status': SMSStatus.WAITING, 'code': None, 'full_text': None, 'error': str(e)}
+
+            if status['status'] == SMSStatus.WAITING:
+                continue
+
+            with self._cond:
+                entry = self._pending.pop(activation_id, None)
+                if entry is not None:
+                    self._stats['received' if status['status'] == SMSStatus.RECEIVED else 'failed'] += 1
+            if entry is not None:
+                self._resolve(entry, self._result(status['code'], status['full_text'], status['status'], status['error']))
+
+    @staticmethod
+    def _result(code, full_text, status: SMSStatus, error: Optional[str]) -> Dict:
+        return {
+            'code': code,
+            'full_text': full_text,
+            'status': status,
+            'success': status == SMSStatus.RECEIVED,
+            'error': error
+        }
+
+    @staticmethod
+    def _resolve(entry: Dict, result: Dict):
+        if not entry['future'].done():
+            entry['future'].set_result(result)
@@ -1,9 +1,17 @@
 """
 Менеджер для управления SMS провайдерами
+
+Несколько подключенных провайдеров работают одновременно: новая активация
+уходит провайдеру с лучшей скользящей оценкой (латентность аренды номера +
+доставки кода с поправкой на долю ошибок), при ошибке или таймауте аренды -
+следующему по оценке.
 """
+import threading
+import time
 from typing import Dict, Optional, Type, List
-from .base_provider import BaseSMSProvider
+from .base_provider import BaseSMSProvider, SMSStatus
 from .daisy_sms_provider import DaisySMSProvider
+from .number_pool import PhoneNumberPool
 
 
 class ProviderManager:
@@ -12,6 +20,10 @@ class ProviderManager:
 
     Позволяет регистрировать провайдеры, создавать их экземпляры
     и управлять активными подключениями.
+
+    Сам менеджер реализует get_number / get_sms_code / cancel_activation /
+    finish_activation с маршрутизацией между подключенными провайдерами,
+    поэтому его можно передавать вместо провайдера (DynamicField, PhoneNumberPool).
     """
 
     # Реестр доступных провайдеров
@@ -23,10 +35,19 @@ class ProviderManager:
         # и т.д.
     }
 
+    # Штраф в рейтинге за ошибку/таймаут, в секундах ожидаемого времени
+    FAILURE_PENALTY = 30.0
+
     def __init__(self):
         """Инициализация менеджера"""
         self._active_provider: Optional[BaseSMSProvider] = None
         self._provider_name: Optional[str] = None
+        self._number_pool: Optional[PhoneNumberPool] = None
+
+        # Подключенные провайдеры для маршрутизации: имя -> экземпляр
+        self._connected: Dict[str, BaseSMSProvider] = {}
+        self._activation_owner: Dict[str, str] = {}  # activation_id -> имя провайдера
+        self._lock = threading.Lock()
 
     @classmethod
     def register_provider(cls, name: str, provider_class: Type[BaseSMSProvider]):
@@ -83,8 +104,190 @@ class ProviderManager:
         self._active_provider = provider
         self._provider_name = provider_name
 
+        with self._lock:
+            self._connected[provider_name] = provider
+
+        return provider
+
+    def add_provider(self, provider_name: str, api_key: str, **kwargs) -> BaseSMSProvider:
+        """
+        Подключить еще один провайдер для маршрутизации (активный провайдер не меняется)
+
+        Args:
+            provider_name: Имя провайдера (например, 'daisysms')
+            api_key: API ключ
+            **kwargs: Дополнительные параметры для провайдера
+
+        Returns:
+            Экземпляр провайдера
+        """
+        if not self._active_provider:
+            return self.create_provider(provider_name, api_key, **kwargs)
+
+        provider_name = provider_name.lower()
+        if provider_name not in self._providers:
+            available = ', '.join(self._providers.keys())
+            raise ValueError(
+                f"Провайдер '{provider_name}' не найден. "
+                f"Доступные провайдеры: {available}"
+            )
+
+        provider = self._providers[provider_name](api_key, **kwargs)
+        with self._lock:
+            self._connected[provider_name] = provider
         return provider
 
+    def remove_provider(self, provider_name: str):
+        """Отключить провайдер от маршрутизации"""
+        provider_name = provider_name.lower()
+        with self._lock:
+            self._connected.pop(provider_name, None)
+        if self._provider_name == provider_name:
+            with self._lock:
+                fallback = next(iter(self._connected.items()), (None, None))
+            self._provider_name, self._active_provider = fallback
+
+    def get_connected_providers(self) -> List[str]:
+        """
+        Получить имена подключенных провайдеров
+
+        Returns:
+            Список имен в порядке текущего рейтинга маршрутизации
+        """
+        return self.rank_providers()
+
+    # ==================== МАРШРУТИЗАЦИЯ ====================
+
+    @staticmethod
+    def _provider_score(provider: BaseSMSProvider) -> float:
+        """
+        Ожидаемое время до кода (секунды) с поправкой на ошибки; меньше - лучше
+
+        Провайдер без статистики получает 0 и пробуется первым.
+        """
+        stats = provider.get_call_stats()
+        number, code = stats['number'], stats['code']
+        expected = (number['latency'] or 0.0) + (code['latency'] or 0.0)
+        success = (1.0 - number['failure_rate']) * (1.0 - code['failure_rate'])
+        # Ошибка стоит как FAILURE_PENALTY секунд ожидания (иначе провайдер без успешных вызовов оценивался бы в 0)
+        return (expected + ProviderManager.FAILURE_PENALTY * (1.0 - success)) / max(0.05, success)
+
+    def rank_providers(self) -> List[str]:
+        """
+        Подключенные провайдеры от лучшего к худшему
+
+        Returns:
+            Список имен провайдеров
+        """
+        with self._lock:
+            connected = list(self._connected.items())
+        return [name for name, provider in sorted(connected, key=lambda item: self._provider_score(item[1]))]
+
+    def _owner(self, activation_id: str) -> Optional[BaseSMSProvider]:
+        with self._lock:
+            name = self._activation_owner.get(activation_id)
+            return self._connected.get(name) if name else self._active_provider
+
+    def get_number(self, service: str, **params) -> Dict:
+        """
+        Арендовать номер у лучшего провайдера, при ошибке - у следующего
+
+        Returns:
+            Dict как у BaseSMSProvider.get_number + 'provider' (имя провайдера)
+        """
+        errors = []
+        for name in self.rank_providers():
+            with self._lock:
+                provider = self._connected.get(name)
+            if provider is None:
+                continue
+
+            started = time.monotonic()
+            try:
+                result = provider.get_number(service, **params)
+            except Exception as e:
+                result = {'activation_id': None, 'phone_number': None, 'service': service,
+                          'success': False, 'error': str(e)}
+            provider.record_call('number', result['success'], time.monotonic() - started)
+
+            if result['success']:
+                with self._lock:
+                    self._activation_owner[result['activation_id']] = name
+                result['provider'] = name
+                return result
+
+            errors.append(f"{name}: {result.get('error')}")
+            print(f"[SMS ROUTER] {name} не выдал номер ({result.get('error')}), пробую следующий провайдер")
+
+        return {
+            'activation_id': None,
+            'phone_number': None,
+            'service': service,
+            'success': False,
+            'error': '; '.join(errors) if errors else 'Провайдер не подключен',
+            'provider': None
+        }
+
+    def get_sms_code(self, activation_id: str, timeout: int = 180) -> Dict:
+        """
+        Получить SMS код у провайдера, выдавшего номер
+
+        Время доставки и таймауты учитываются в рейтинге провайдера
+        (активацию нельзя перенести к другому провайдеру - следующие номера
+        уйдут более быстрому).
+        """
+        provider = self._owner(activation_id)
+        if provider is None:
+            return {'code': None, 'full_text': None, 'status': SMSStatus.ERROR,
+                    'success': False, 'error': 'Провайдер не подключен'}
+
+        started = time.monotonic()
+        result = provider.get_sms_code(activation_id, timeout=timeout)
+        if result['success'] or result['status'] == SMSStatus.TIMEOUT:
+            provider.record_call('code', result['success'], time.monotonic() - started)
+
+        if result['status'] != SMSStatus.WAITING:
+            with self._lock:
+                self._activation_owner.pop(activation_id, None)
+        return result
+
+    def cancel_activation(self, activation_id: str) -> Dict:
+        """Отменить активацию у провайдера, выдавшего номер"""
+        provider = self._owner(activation_id)
+        if provider is None:
+            return {'success': False, 'error': 'Провайдер не подключен'}
+        result = provider.cancel_activation(activation_id)
+        if result['success']:
+            with self._lock:
+                self._activation_owner.pop(activation_id, None)
+        return result
+
+    def finish_activation(self, activation_id: str) -> Dict:
+        """Завершить активацию у провайдера, выдавшего номер"""
+        provider = self._owner(activation_id)
+        if provider is None:
+            return {'success': False, 'error': 'Провайдер не подключен'}
+        result = provider.finish_activation(activation_id)
+        with self._lock:
+            self._activation_owner.pop(activation_id, None)
+        return result
+
+    def get_routing_stats(self) -> Dict:
+        """
+        Статистика маршрутизации
+
+        Returns:
+            Dict: {имя провайдера: {'score', 'number': {...}, 'code': {...}}}
+        """
+        with self._lock:
+            connected = list(self._connected.items())
+        stats = {}
+        for name, provider in connected:
+            entry = provider.get_call_stats()
+            entry['score'] = round(self._provider_score(provider), 2)
+            stats[name] = entry
+        return stats
+
     def get_active_provider(self) -> Optional[BaseSMSProvider]:
         """
         Получить активный провайдер
@@ -103,10 +306,62 @@ class ProviderManager:
         """
         return self._provider_name
 
+    def start_number_pool(self, service: str, size: int = 2, max_age: float = 600.0,
+                          **number_params) -> PhoneNumberPool:
+        """
+        Запустить пул заранее арендованных номеров для активного провайдера
+
+        Args:
+            service: Код сервиса (например, 'ds' для Discord)
+            size: Сколько номеров держать готовыми впереди спроса
+            max_age: Через сколько секунд невыданный номер отменяется
+            **number_params: Параметры get_number (max_price, areas, carriers, ...)
+
+        Returns:
+            Запущенный PhoneNumberPool
+
+        Raises:
+            ValueError: Если провайдер не подключен
+        """
+        if not self._active_provider:
+            raise ValueError('Провайдер не подключен')
+
+        self.stop_number_pool()
+        # Номера арендуются через маршрутизацию менеджера (лучший из подключенных провайдеров)
+        self._number_pool = PhoneNumberPool(self, service, size=size, max_age=max_age, **number_params)
+        self._number_pool.start()
+        return self._number_pool
+
+    def get_number_pool(self) -> Optional[PhoneNumberPool]:
+        """
+        Получить пул номеров
+
+        Returns:
+            PhoneNumberPool или None, если пул не запущен
+        """
+        return self._number_pool
+
+    def stop_number_pool(self) -> int:
+        """
+        Остановить пул номеров и отменить невыданные номера
+
+        Returns:
+            Сколько номеров отменено
+        """
+        if not self._number_pool:
+            return 0
+        cancelled = self._number_pool.stop(cancel_unused=True)
+        self._number_pool = None
+        return cancelled
+
     def disconnect(self):
         """Отключить активный провайдер"""
+        self.stop_number_pool()
         self._active_provider = None
         self._provider_name = None
+        with self._lock:
+            self._connected.clear()
+            self._activation_owner.clear()
 
     def test_connection(self) -> Dict:
         """
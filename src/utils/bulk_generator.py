@@ -0,0 +1,166 @@
+"""
+🏭 Bulk Data Generator - массовая генерация тестовых данных
+
+SmartDataParser.generate_value выдает значения по одному через if/elif,
+а для нагрузочных прогонов нужны сотни тысяч строк. Здесь:
+- колонка генерируется целиком за один вызов генератора из VALUE_GENERATORS
+  (таблица тип -> генератор, без разбора типа на каждую ячейку)
+- строки делятся на блоки фиксированного размера, у каждого блока свой seed
+  (от seed генератора и номера блока) - результат воспроизводим и не зависит
+  от числа процессов
+- блоки можно раздать ProcessPoolExecutor (workers > 1) и писать в CSV по мере
+  готовности, не держа весь набор в памяти
+
+Спецификация колонки - кортеж (вид, параметр), чтобы ее можно было передать в процесс:
+    ('type', 'email')              - генератор по типу поля
+    ('choice', ('Yes', 'No'))      - случайный выбор из вариантов
+    ('range', (18, 80))            - случайное целое в диапазоне
+    ('smart', 'car_year')          - generator умного ответа SmartDataParser (без seed)
+    ('const', 'value')             - постоянное значение
+"""
+
+import csv
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from .data_parser import DEFAULT_VALUE_GENERATOR, FAKER_FREE_TYPES, VALUE_GENERATORS, SmartDataParser
+
+
+ColumnSpec = Tuple[str, Any]
+
+# Строк в блоке: единица seed и работы для процесса
+DEFAULT_CHUNK_SIZE = 5000
+
+# Faker процесса для bulk генерации (свой экземпляр: seed_instance не трогает общий Faker GUI)
+_chunk_faker = None
+_chunk_faker_loaded = False
+
+
+def _get_chunk_faker():
+    global _chunk_faker, _chunk_faker_loaded
+    if not _chunk_faker_loaded:
+        _chunk_faker_loaded = True
+        try:
+            from faker import Faker
+            _chunk_faker = Faker('en_US')
+        except ImportError:
+            print("[WARNING] Faker не установлен. Установите: pip install faker")
+    return _chunk_faker
+
+
+def _generate_column(spec: ColumnSpec, faker, rng: random.Random, count: int) -> List[str]:
+    """Значения одной колонки блока"""
+    kind, param = spec
+
+    if kind == 'type':
+        if faker is None and param not in FAKER_FREE_TYPES:
+            return [f"<{param}>"] * count
+        generator = VALUE_GENERATORS.get(param, DEFAULT_VALUE_GENERATOR)
+        try:
+            return [str(value) for value in generator(faker, rng, count)]
+        except Exception as e:
+            print(f"[ERROR] Ошибка генерации {param}: {e}")
+            return [f"<{param}>"] * count
+
+    if kind == 'choice':
+        return rng.choices(param, k=count)
+
+    if kind == 'range':
+        low, high = param
+        randint = rng.randint
+        return [str(randint(low, high)) for _ in range(count)]
+
+    if kind == 'smart':
+        generator = SmartDataParser().smart_qa_patterns[param]['generator']
+        return [generator() for _ in range(count)]
+
+    if kind == 'const':
+        return [param] * count
+
+    raise ValueError(f"Неизвестная спецификация колонки: {spec!r}")
+
+
+def _generate_chunk(specs: Sequence[ColumnSpec], seed: int, chunk_index: int, count: int) -> List[List[str]]:
+    """
+    Строки одного блока (функция модуля - вызывается и в процессах пула)
+
+    Колонки генерируются по очереди, затем транспонируются в строки.
+    """
+    rng = random.Random(seed * 1_000_003 + chunk_index)
+    faker = _get_chunk_faker()
+    if faker is not None:
+        faker.seed_instance(rng.getrandbits(64))
+
+    columns = [_generate_column(spec, faker, rng, count) for spec in specs]
+    return [list(row) for row in zip(*columns)] if columns else [[] for _ in range(count)]
+
+
+class BulkDataGenerator:
+    """Генерация строк блоками: seeded, воспроизводимо, опционально в нескольких процессах"""
+
+    def __init__(self, specs: Sequence[ColumnSpec], seed: Optional[int] = None, workers: int = 1,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            specs: Спецификации колонок (см. docstring модуля)
+            seed: Seed набора данных (None - случайный, доступен в self.seed)
+            workers: Процессов для генерации (1 - в текущем процессе)
+            chunk_size: Строк в блоке (входит в seed блока - меняет результат)
+        """
+        self.specs = [tuple(spec) for spec in specs]
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+
+    def _chunks(self, num_rows: int) -> List[Tuple[int, int]]:
+        """[(номер блока, строк в блоке)]"""
+        return [(index, min(self.chunk_size, num_rows - start))
+                for index, start in enumerate(range(0, num_rows, self.chunk_size))]
+
+    def iter_chunks(self, num_rows: int) -> Iterator[List[List[str]]]:
+        """
+        Блоки строк по порядку
+
+        С workers > 1 в пуле одновременно не больше workers * 2 блоков,
+        так что память не растет с num_rows.
+        """
+        chunks = self._chunks(num_rows)
+
+        if self.workers == 1 or len(chunks) == 1:
+            for index, count in chunks:
+                yield _generate_chunk(self.specs, self.seed, index, count)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = deque()
+            for index, count in chunks:
+                in_flight.append(executor.submit(_generate_chunk, self.specs, self.seed, index, count))
+                if len(in_flight) >= self.workers * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def generate(self, num_rows: int) -> List[List[str]]:
+        """Все строки списком (для таблицы GUI; большие наборы - write_csv)"""
+        rows = []
+        for chunk in self.iter_chunks(num_rows):
+            rows.extend(chunk)
+        return rows
+
+    def write_csv(self, filepath: str, headers: Sequence[str], num_rows: int) -> int:
+        """
+        Записать набор в CSV по мере генерации блоков
+
+        Returns:
+            Количество записанных строк
+        """
+        written = 0
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            for chunk in self.iter_chunks(num_rows):
+                writer.writerows(chunk)
+                written += len(chunk)
+        return written
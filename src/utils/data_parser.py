@@ -12,9 +12,144 @@ from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 import random
 import csv
+import threading
 from pathlib import Path
 
 
+# ============================================================
+# ГЕНЕРАТОРЫ ЗНАЧЕНИЙ ПО ТИПУ ПОЛЯ
+# ============================================================
+
+# Генератор: (faker, rng, count) -> список из count строк. rng - random.Random
+# (или модуль random): bulk генерация передает свой seeded экземпляр.
+
+def _faker_values(method: str, *args, **kwargs):
+    def generate(faker, rng, count):
+        provider = getattr(faker, method)
+        return [provider(*args, **kwargs) for _ in range(count)]
+    return generate
+
+
+def _random_ints(low: int, high: int, template: str = '{}'):
+    def generate(faker, rng, count):
+        randint = rng.randint
+        return [template.format(randint(low, high)) for _ in range(count)]
+    return generate
+
+
+# 🔥 Faker выбирает имя из взвешенной таблицы заново на каждое значение (~100-200 мкс).
+# Для имен/логинов/email берем таблицу провайдера один раз и выбираем сразу count
+# значений через rng.choices; если таблицы нет (другая локаль/версия) - по одному через Faker.
+_provider_tables: Dict[Tuple[int, str], Optional[Tuple[list, list]]] = {}
+
+
+def _provider_table(faker, attr: str) -> Optional[Tuple[list, list]]:
+    """(значения, накопленные веса) атрибута провайдера Faker или None"""
+    key = (id(faker), attr)
+    if key not in _provider_tables:
+        table = None
+        for factory in getattr(faker, 'factories', [faker]):
+            for provider in getattr(factory, 'providers', []):
+                data = getattr(provider, attr, None)
+                if data:
+                    values = list(data)
+                    weights = list(data.values()) if isinstance(data, dict) else [1] * len(values)
+                    cumulative, total = [], 0.0
+                    for weight in weights:
+                        total += weight
+                        cumulative.append(total)
+                    table = (values, cumulative)
+                    break
+            if table:
+                break
+        _provider_tables[key] = table
+    return _provider_tables[key]
+
+
+def _weighted_values(attr: str, method: str):
+    fallback = _faker_values(method)
+
+    def generate(faker, rng, count):
+        table = _provider_table(faker, attr)
+        if table is None:
+            return fallback(faker, rng, count)
+        values, cumulative = table
+        return rng.choices(values, cum_weights=cumulative, k=count)
+    return generate
+
+
+_first_names = _weighted_values('first_names', 'first_name')
+_last_names = _weighted_values('last_names', 'last_name')
+_USER_NAME_CLEAN_RE = re.compile(r'[^a-z0-9._]')
+
+
+def _full_names(faker, rng, count):
+    return [f"{first} {last}" for first, last in
+            zip(_first_names(faker, rng, count), _last_names(faker, rng, count))]
+
+
+def _user_names(faker, rng, count):
+    """Логины по форматам internet провайдера en_US: last.first, first.last, first##, ?last"""
+    firsts = _first_names(faker, rng, count)
+    lasts = _last_names(faker, rng, count)
+    randrange, letters = rng.randrange, 'abcdefghijklmnopqrstuvwxyz'
+    names = []
+    for first, last in zip(firsts, lasts):
+        form = randrange(4)
+        if form == 0:
+            name = f"{last}.{first}"
+        elif form == 1:
+            name = f"{first}.{last}"
+        elif form == 2:
+            name = f"{first}{randrange(100):02d}"
+        else:
+            name = f"{letters[randrange(26)]}{last}"
+        names.append(_USER_NAME_CLEAN_RE.sub('', name.lower()))
+    return names
+
+
+def _emails(faker, rng, count):
+    domains = _provider_table(faker, 'safe_domain_names')
+    if domains is None:
+        return _faker_values('email')(faker, rng, count)
+    return [f"{user}@{domain}" for user, domain in
+            zip(_user_names(faker, rng, count), rng.choices(domains[0], k=count))]
+
+
+def _birth_dates(faker, rng, count):
+    date_of_birth = faker.date_of_birth
+    return [date_of_birth(minimum_age=18, maximum_age=80).strftime('%m/%d/%Y') for _ in range(count)]
+
+
+VALUE_GENERATORS = {
+    'email': _emails,
+    'phone': _faker_values('phone_number'),
+    'name': _full_names,
+    'first_name': _first_names,
+    'last_name': _last_names,
+    'address': _faker_values('street_address'),
+    'city': _faker_values('city'),
+    'state': _faker_values('state_abbr'),
+    'zip_code': _faker_values('zipcode'),
+    'ssn': _faker_values('ssn'),
+    'date': _birth_dates,
+    'credit_card': _faker_values('credit_card_number'),
+    'cvv': _faker_values('credit_card_security_code'),
+    'url': _faker_values('url'),
+    'username': _user_names,
+    'password': _faker_values('password', length=12),
+    'company': _faker_values('company'),
+    'job_title': _faker_values('job'),
+    'age': _random_ints(18, 80),
+    'income': _random_ints(30000, 150000, '${:,}'),
+    'year': _random_ints(2015, 2025),
+}
+# Неизвестный тип - случайное слово
+DEFAULT_VALUE_GENERATOR = _faker_values('word')
+# Типы, которым Faker не нужен
+FAKER_FREE_TYPES = frozenset({'age', 'income', 'year'})
+
+
 class SmartDataParser:
     """
     Умный парсер данных с автоматической детекцией типов полей
@@ -27,16 +162,13 @@ class SmartDataParser:
     - Экспортировать/импортировать CSV
     """
 
-    def __init__(self):
-        try:
-            from faker import Faker
-            self.faker = Faker('en_US')
-            self.faker_available = True
-        except ImportError:
-            self.faker = None
-            self.faker_available = False
-            print("[WARNING] Faker не установлен. Установите: pip install faker")
+    # 🔥 Faker общий для всех экземпляров и создается при первой генерации значения:
+    # импорт faker + загрузка локали заметно задерживают старт GUI
+    _faker = None
+    _faker_loaded = False
+    _faker_lock = threading.Lock()
 
+    def __init__(self):
         # База данных паттернов для детекции типов
         self.patterns = {
             'email': [
@@ -120,7 +252,8 @@ class SmartDataParser:
             },
             'car_year': {
                 'keywords': ['car', 'vehicle', 'year', 'model year'],
-                'generator': lambda: str(random.randint(2015, 2025))
+                'generator': lambda: str(random.randint(2015, 2025)),
+                'range': (2015, 2025)  # для bulk генерации (seeded rng вместо generator)
             },
             'education': {
                 'keywords': ['education', 'degree', 'school'],
@@ -144,6 +277,25 @@ class SmartDataParser:
             }
         }
 
+    @property
+    def faker(self):
+        """Faker('en_US') или None, если faker не установлен (импорт при первом обращении)"""
+        cls = SmartDataParser
+        if not cls._faker_loaded:
+            with cls._faker_lock:
+                if not cls._faker_loaded:
+                    try:
+                        from faker import Faker
+                        cls._faker = Faker('en_US')
+                    except ImportError:
+                        print("[WARNING] Faker не установлен. Установите: pip install faker")
+                    cls._faker_loaded = True
+        return cls._faker
+
+    @property
+    def faker_available(self) -> bool:
+        return self.faker is not None
+
     def detect_field_type(self, value: str, question: Optional[str] = None) -> str:
         """
         Определяет тип поля по значению и контексту вопроса
@@ -198,6 +350,24 @@ class SmartDataParser:
         # По умолчанию - текст
         return 'text'
 
+    def detect_field_type_by_label(self, label: str) -> str:
+        """
+        Тип поля только по заголовку/лейблу (контекстные паттерны .*слово.*)
+
+        detect_field_type('', header) всегда возвращает 'text' из-за пустого значения,
+        а передача заголовка как значения ловит паттерны значений (username на "age").
+        """
+        # Заголовок, совпадающий с типом (first_name, username, zip_code), - сразу этот тип
+        normalized = re.sub(r'[\s-]+', '_', label.strip().lower())
+        if normalized in VALUE_GENERATORS:
+            return normalized
+
+        for field_type, patterns in self.patterns.items():
+            for pattern in patterns:
+                if pattern.startswith('.*') and re.search(pattern, label, re.IGNORECASE):
+                    return field_type
+        return 'text'
+
     def detect_smart_answer_type(self, question: str) -> Optional[Dict]:
         """
         Определяет тип умного ответа на вопрос
@@ -219,7 +389,8 @@ class SmartDataParser:
                     return {
                         'type': qa_type,
                         'options': config.get('options'),
-                        'generator': config.get('generator')
+                        'generator': config.get('generator'),
+                        'range': config.get('range')
                     }
 
         return None
@@ -238,59 +409,12 @@ class SmartDataParser:
         if not self.faker_available:
             return [f"<{field_type}>"] * count
 
-        values = []
-
-        for _ in range(count):
-            try:
-                if field_type == 'email':
-                    values.append(self.faker.email())
-                elif field_type == 'phone':
-                    values.append(self.faker.phone_number())
-                elif field_type == 'name':
-                    values.append(self.faker.name())
-                elif field_type == 'first_name':
-                    values.append(self.faker.first_name())
-                elif field_type == 'last_name':
-                    values.append(self.faker.last_name())
-                elif field_type == 'address':
-                    values.append(self.faker.street_address())
-                elif field_type == 'city':
-                    values.append(self.faker.city())
-                elif field_type == 'state':
-                    values.append(self.faker.state_abbr())
-                elif field_type == 'zip_code':
-                    values.append(self.faker.zipcode())
-                elif field_type == 'ssn':
-                    values.append(self.faker.ssn())
-                elif field_type == 'date':
-                    values.append(self.faker.date_of_birth(minimum_age=18, maximum_age=80).strftime('%m/%d/%Y'))
-                elif field_type == 'credit_card':
-                    values.append(self.faker.credit_card_number())
-                elif field_type == 'cvv':
-                    values.append(self.faker.credit_card_security_code())
-                elif field_type == 'url':
-                    values.append(self.faker.url())
-                elif field_type == 'username':
-                    values.append(self.faker.user_name())
-                elif field_type == 'password':
-                    values.append(self.faker.password(length=12))
-                elif field_type == 'company':
-                    values.append(self.faker.company())
-                elif field_type == 'job_title':
-                    values.append(self.faker.job())
-                elif field_type == 'age':
-                    values.append(str(random.randint(18, 80)))
-                elif field_type == 'income':
-                    values.append(f"${random.randint(30000, 150000):,}")
-                elif field_type == 'year':
-                    values.append(str(random.randint(2015, 2025)))
-                else:
-                    values.append(self.faker.word())
-            except Exception as e:
-                values.append(f"<{field_type}>")
-                print(f"[ERROR] Ошибка генерации {field_type}: {e}")
-
-        return values
+        generator = VALUE_GENERATORS.get(field_type, DEFAULT_VALUE_GENERATOR)
+        try:
+            return generator(self.faker, random, count)
+        except Exception as e:
+            print(f"[ERROR] Ошибка генерации {field_type}: {e}")
+            return [f"<{field_type}>"] * count
 
     def parse_fill_actions(self, code: str) -> List[Dict]:
         """
@@ -400,30 +524,11 @@ class SmartDataParser:
                 field_counter += 1
             headers.append(header)
 
-        # Генерировать строки
-        rows = []
-        for _ in range(num_rows):
-            row = []
-            for field in fields:
-                if field['is_random'] and field['smart_answer']:
-                    # Случайный выбор из опций
-                    if field['smart_answer'].get('options'):
-                        value = random.choice(field['smart_answer']['options'])
-                    elif field['smart_answer'].get('generator'):
-                        value = field['smart_answer']['generator']()
-                    else:
-                        value = field['value']
-                elif field['is_random'] and field['random_range']:
-                    # Генерировать случайное число
-                    min_val, max_val = field['random_range']
-                    value = str(random.randint(min_val, max_val))
-                else:
-                    # Генерировать по типу
-                    generated = self.generate_value(field['type'], count=1)
-                    value = generated[0] if generated else field['value']
+        # Генерировать строки (bulk: по колонкам, без if/elif на каждую ячейку)
+        from .bulk_generator import BulkDataGenerator
 
-                row.append(value)
-            rows.append(row)
+        specs = [self.column_spec_for_field(field) for field in fields]
+        rows = BulkDataGenerator(specs).generate(num_rows)
 
         return headers, rows
 
@@ -500,3 +605,73 @@ class SmartDataParser:
             row.append(value)
 
         return row
+
+    # ==================== BULK ГЕНЕРАЦИЯ ====================
+
+    @staticmethod
+    def _smart_answer_spec(smart_answer: Dict, fallback: Tuple[str, Any]) -> Tuple[str, Any]:
+        if smart_answer.get('options'):
+            return ('choice', tuple(smart_answer['options']))
+        if smart_answer.get('range'):
+            return ('range', tuple(smart_answer['range']))
+        if smart_answer.get('generator'):
+            return ('smart', smart_answer['type'])
+        return fallback
+
+    def column_spec_for_field(self, field: Dict) -> Tuple[str, Any]:
+        """
+        Спецификация колонки для BulkDataGenerator по полю из parse_fill_actions
+
+        Те же правила, что и у generate_csv_data: #random с умным ответом, #random[min-max], тип поля
+        """
+        if field['is_random'] and field['smart_answer']:
+            return self._smart_answer_spec(field['smart_answer'], ('const', field['value']))
+        if field['is_random'] and field['random_range']:
+            return ('range', tuple(field['random_range']))
+        return ('type', field['type'])
+
+    def column_spec_for_header(self, header: str) -> Tuple[str, Any]:
+        """Спецификация колонки по заголовку (правила smart_fill_row, тип - по тексту заголовка)"""
+        field_type = self.detect_field_type_by_label(header)
+        smart_answer = self.detect_smart_answer_type(header)
+        if smart_answer:
+            return self._smart_answer_spec(smart_answer, ('type', field_type))
+        return ('type', field_type)
+
+    def generate_rows(self, headers: List[str], num_rows: int, seed: Optional[int] = None) -> List[List[str]]:
+        """
+        Сгенерировать num_rows строк для заголовков (bulk аналог smart_fill_row)
+
+        Args:
+            headers: Заголовки столбцов
+            num_rows: Количество строк
+            seed: Seed для воспроизводимого результата (None - случайный)
+
+        Returns:
+            Строки данных
+        """
+        from .bulk_generator import BulkDataGenerator
+
+        specs = [self.column_spec_for_header(header) for header in headers]
+        return BulkDataGenerator(specs, seed=seed).generate(num_rows)
+
+    def generate_csv_file(self, filepath: str, headers: List[str], num_rows: int,
+                          seed: Optional[int] = None, workers: int = 1) -> int:
+        """
+        Сгенерировать CSV потоково (строки не держатся в памяти целиком)
+
+        Args:
+            filepath: Путь к файлу
+            headers: Заголовки столбцов
+            num_rows: Количество строк
+            seed: Seed для воспроизводимого результата (None - случайный)
+            workers: Процессов для генерации (результат от их числа не зависит)
+
+        Returns:
+            Количество записанных строк
+        """
+        from .bulk_generator import BulkDataGenerator
+
+        specs = [self.column_spec_for_header(header) for header in headers]
+        generator = BulkDataGenerator(specs, seed=seed, workers=workers)
+        return generator.write_csv(filepath, headers, num_rows)
@@ -0,0 +1,258 @@
+"""
+🩺 Proxy Health - табло здоровья прокси и circuit breaker
+
+Функции:
+- Скользящая (экспоненциально затухающая) оценка каждого прокси:
+  доля успехов, латентность старта профиля, сбои CDP подключения
+- Circuit breaker: после серии ошибок прокси исключается из выбора,
+  по истечении паузы пропускается одна пробная задача (half-open).
+  Цепь питают только старт профиля и CDP подключение
+- Итоги сценариев (record_iteration) - отдельная метрика: ошибки сайта, селекторов
+  и ответов не зависят от прокси и цепь не размыкают
+- Взвешенный выбор: быстрые и здоровые прокси выбираются чаще
+
+Не зависит от других модулей проекта - используется runtime сгенерированных скриптов (src/runtime).
+"""
+
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+# Состояния circuit breaker
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+class ProxyScoreboard:
+    """
+    Табло здоровья прокси с circuit breaker
+
+    Ключ прокси - исходная строка из списка (как в PROXY_LIST).
+    """
+
+    def __init__(self, decay: float = 0.3, failure_threshold: int = 3, min_success_rate: float = 0.3,
+                 min_samples: int = 5, cooldown: float = 60.0, max_cooldown: float = 900.0):
+        """
+        Args:
+            decay: Вес нового результата в скользящей оценке (0..1)
+            failure_threshold: Ошибок подряд до размыкания
+            min_success_rate: Доля успехов, ниже которой прокси размыкается
+            min_samples: Минимум результатов для проверки доли успехов
+            cooldown: Пауза до пробной задачи после размыкания (секунды)
+            max_cooldown: Максимальная пауза (пауза удваивается при повторном размыкании)
+        """
+        self.decay = decay
+        self.failure_threshold = failure_threshold
+        self.min_success_rate = min_success_rate
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self._lock = threading.Lock()
+        self._proxies: Dict[str, Dict] = {}
+
+    def _entry(self, key: str) -> Dict:
+        entry = self._proxies.get(key)
+        if entry is None:
+            entry = {
+                'success_rate': 1.0,  # Оптимистичная оценка для новых прокси
+                'latency': None,  # Скользящая латентность старта профиля, секунды
+                'cdp_failure_rate': 0.0,
+                'samples': 0,
+                'successes': 0,
+                'failures': 0,
+                'consecutive_failures': 0,
+                'state': CIRCUIT_CLOSED,
+                'opened_at': 0.0,
+                'cooldown': self.cooldown,
+                'probe_in_flight': False,
+                'trips': 0,
+                'iterations': 0,
+                'iteration_failures': 0,
+                'iteration_success_rate': 1.0,
+            }
+            self._proxies[key] = entry
+        return entry
+
+    def _ewma(self, old: float, new: float) -> float:
+        return old + self.decay * (new - old)
+
+    def _available(self, entry: Dict, now: float) -> bool:
+        """Можно ли выдать прокси (half-open переход при истечении паузы)"""
+        if entry['state'] == CIRCUIT_CLOSED:
+            return True
+        if entry['state'] == CIRCUIT_OPEN and now - entry['opened_at'] >= entry['cooldown']:
+            entry['state'] = CIRCUIT_HALF_OPEN
+            entry['probe_in_flight'] = False
+        return entry['state'] == CIRCUIT_HALF_OPEN and not entry['probe_in_flight']
+
+    def _weight(self, entry: Dict, median_latency: float) -> float:
+        """Вес для выбора: здоровье в квадрате, деленное на относительную латентность"""
+        latency = entry['latency'] if entry['latency'] is not None else median_latency
+        health = entry['success_rate'] * (1.0 - 0.5 * entry['cdp_failure_rate'])
+        return max(0.01, health ** 2) / max(0.25, latency / median_latency)
+
+    def is_available(self, key: str) -> bool:
+        """Прокси не разомкнут (или готов к пробной задаче)"""
+        with self._lock:
+            return self._available(self._entry(key), time.time())
+
+    def select(self, keys: List[str]) -> Optional[str]:
+        """
+        Взвешенный выбор прокси из списка
+
+        Half-open прокси получают пробную задачу в первую очередь (по одной).
+        Если разомкнуты все - выдается тот, чья пауза истекает раньше.
+        """
+        if not keys:
+            return None
+
+        with self._lock:
+            now = time.time()
+            entries = {key: self._entry(key) for key in keys}
+
+            for key, entry in entries.items():
+                if self._available(entry, now) and entry['state'] == CIRCUIT_HALF_OPEN:
+                    entry['probe_in_flight'] = True
+                    return key
+
+            closed = [key for key, entry in entries.items() if entry['state'] == CIRCUIT_CLOSED]
+            if not closed:
+                return min(keys, key=lambda k: entries[k]['opened_at'] + entries[k]['cooldown'])
+
+            latencies = sorted(entries[key]['latency'] for key in closed if entries[key]['latency'] is not None)
+            median_latency = latencies[len(latencies) // 2] if latencies else 1.0
+            weights = [self._weight(entries[key], max(median_latency, 0.001)) for key in closed]
+
+        return random.choices(closed, weights=weights, k=1)[0]
+
+    def mark_probe(self, key: str) -> bool:
+        """
+        Зарезервировать прокси для выдачи (для round-robin/sticky выбора без select)
+
+        Returns:
+            False, если прокси разомкнут или его пробная задача уже выдана
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if not self._available(entry, time.time()):
+                return False
+            if entry['state'] == CIRCUIT_HALF_OPEN:
+                entry['probe_in_flight'] = True
+            return True
+
+    def release_probe(self, key: str):
+        """Снять резерв пробной задачи без результата (задача упала до проверки прокси)"""
+        if not key:
+            return
+        with self._lock:
+            self._entry(key)['probe_in_flight'] = False
+
+    def record_success(self, key: str, latency: Optional[float] = None):
+        """Успешный старт профиля / подключение через прокси"""
+        if not key:
+            return
+        with self._lock:
+            entry = self._entry(key)
+            entry['samples'] += 1
+            entry['successes'] += 1
+            entry['consecutive_failures'] = 0
+            entry['success_rate'] = self._ewma(entry['success_rate'], 1.0)
+            entry['cdp_failure_rate'] = self._ewma(entry['cdp_failure_rate'], 0.0)
+            if latency is not None:
+                entry['latency'] = latency if entry['latency'] is None else self._ewma(entry['latency'], latency)
+
+            if entry['state'] != CIRCUIT_CLOSED:
+                print(f"[PROXY HEALTH] [OK] Прокси восстановлен, цепь замкнута: {self._short(key)}")
+                entry['state'] = CIRCUIT_CLOSED
+                entry['cooldown'] = self.cooldown
+            entry['probe_in_flight'] = False
+
+    def record_failure(self, key: str, kind: str = 'start'):
+        """
+        Ошибка через прокси
+
+        Args:
+            key: Ключ прокси
+            kind: 'start' - профиль не стартовал, 'cdp' - не удалось подключиться по CDP
+        """
+        if not key:
+            return
+        with self._lock:
+            entry = self._entry(key)
+            entry['samples'] += 1
+            entry['failures'] += 1
+            entry['consecutive_failures'] += 1
+            entry['success_rate'] = self._ewma(entry['success_rate'], 0.0)
+            if kind == 'cdp':
+                entry['cdp_failure_rate'] = self._ewma(entry['cdp_failure_rate'], 1.0)
+
+            now = time.time()
+            if entry['state'] == CIRCUIT_HALF_OPEN:
+                # Пробная задача провалилась - размыкаем с удвоенной паузой
+                entry['cooldown'] = min(entry['cooldown'] * 2, self.max_cooldown)
+                self._trip(key, entry, now)
+            elif entry['state'] == CIRCUIT_CLOSED and (
+                    entry['consecutive_failures'] >= self.failure_threshold
+                    or (entry['samples'] >= self.min_samples and entry['success_rate'] < self.min_success_rate)):
+                self._trip(key, entry, now)
+            entry['probe_in_flight'] = False
+
+    def record_iteration(self, key: str, success: bool):
+        """Итог сценария через прокси (только статистика - на цепь и выбор не влияет)"""
+        if not key:
+            return
+        with self._lock:
+            entry = self._entry(key)
+            entry['iterations'] += 1
+            if not success:
+                entry['iteration_failures'] += 1
+            entry['iteration_success_rate'] = self._ewma(entry['iteration_success_rate'], 1.0 if success else 0.0)
+
+    def _trip(self, key: str, entry: Dict, now: float):
+        entry['state'] = CIRCUIT_OPEN
+        entry['opened_at'] = now
+        entry['trips'] += 1
+        print(f"[PROXY HEALTH] [OPEN] Прокси исключен на {entry['cooldown']:.0f}s "
+              f"(успех {entry['success_rate']:.0%}, ошибок подряд {entry['consecutive_failures']}): {self._short(key)}")
+
+    @staticmethod
+    def _short(key: str) -> str:
+        """Прокси без логина/пароля для логов"""
+        return key.rsplit('@', 1)[-1] if '@' in key else key
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Снимок табло: ключ -> success_rate, latency, state, successes, failures, trips, iterations"""
+        with self._lock:
+            return {
+                key: {
+                    'success_rate': round(entry['success_rate'], 2),
+                    'latency': round(entry['latency'], 2) if entry['latency'] is not None else None,
+                    'cdp_failure_rate': round(entry['cdp_failure_rate'], 2),
+                    'state': entry['state'],
+                    'successes': entry['successes'],
+                    'failures': entry['failures'],
+                    'trips': entry['trips'],
+                    'iterations': entry['iterations'],
+                    'iteration_failures': entry['iteration_failures'],
+                    'iteration_success_rate': round(entry['iteration_success_rate'], 2),
+                }
+                for key, entry in self._proxies.items()
+            }
+
+    def print_summary(self):
+        """Итоги по прокси в конце прогона"""
+        stats = self.get_stats()
+        if not stats:
+            return
+        print(f"[PROXY HEALTH] Прокси: {len(stats)}, "
+              f"разомкнуто сейчас: {sum(1 for s in stats.values() if s['state'] != CIRCUIT_CLOSED)}")
+        for key, s in sorted(stats.items(), key=lambda item: -item[1]['success_rate']):
+            latency = f"{s['latency']}s" if s['latency'] is not None else "-"
+            print(f"[PROXY HEALTH]   {self._short(key)}: успех {s['success_rate']:.0%} "
+                  f"({s['successes']}/{s['successes'] + s['failures']}), старт {latency}, "
+                  f"CDP сбои {s['cdp_failure_rate']:.0%}, сценарии "
+                  f"{s['iterations'] - s['iteration_failures']}/{s['iterations']}, {s['state']}")
@@ -7,6 +7,7 @@
 - Переадресация через /api/forward
 - Проверка статуса прокси
 - Поддержка фильтров (country, city, ISP, plan)
+- Фоновая подгрузка прокси при ротации, когда в пуле остается мало неиспользованных
 
 API Endpoints:
 - GET /api/proxy - Получить список прокси
@@ -18,7 +19,8 @@ API Endpoints:
 
 import requests
 import random
-from typing import List, Dict, Optional, Literal
+import threading
+from typing import List, Dict, Optional, Literal, Tuple
 from datetime import datetime
 
 
@@ -32,14 +34,16 @@ class NineProxyManager:
     - Фильтрацию по country, city, ISP, plan
     - Проверку доступности прокси
     - Retry logic при ошибках
+    - Фоновую подгрузку пула при ротации
     """
 
-    def __init__(self, api_base_url: str = "http://localhost:50000"):
+    def __init__(self, api_base_url: str = "http://localhost:50000", low_water_mark: int = 3):
         """
         Инициализация менеджера
 
         Args:
             api_base_url: Базовый URL API (default: http://localhost:50000)
+            low_water_mark: Порог неиспользованных прокси в пуле для фоновой подгрузки (0 - выкл)
         """
         self.api_base_url = api_base_url.rstrip('/')
         self.proxy_pool: List[Dict] = []
@@ -56,6 +60,13 @@ class NineProxyManager:
         self.port_proxy_map: Dict[int, Dict] = {}  # Карта порт → прокси
         self.base_port: int = 6000  # Начальный порт для переадресации
 
+        # 🔥 Фоновая подгрузка пула при ротации (по последним использованным фильтрам)
+        self.low_water_mark = low_water_mark
+        self._pool_lock = threading.RLock()
+        self._last_fetch_key: Optional[Tuple] = None
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._prefetches: int = 0
+
     def test_connection(self) -> tuple[bool, str]:
         """
         Проверить соединение с 9Proxy API
@@ -111,31 +122,56 @@ class NineProxyManager:
         Returns:
             (success: bool, message: str, proxies: List[Dict])
         """
-        try:
-            # Выбрать endpoint
-            endpoint = "/api/today_list" if today else "/api/proxy"
+        # Выбрать endpoint
+        endpoint = "/api/today_list" if today else "/api/proxy"
 
-            # Параметры запроса
-            params = {
-                't': 2  # API требует 1 или 2 (тип прокси)
-            }
+        # Параметры запроса
+        params = {
+            't': 2  # API требует 1 или 2 (тип прокси)
+        }
+
+        # Добавить фильтры
+        if country:
+            params['country'] = country.upper()
+        if state:
+            params['state'] = state
+        if city:
+            params['city'] = city
+        if zip_code:
+            params['zipcode'] = zip_code
+        if isp:
+            params['isp'] = isp
+        if plan and plan != 'all':
+            params['plan'] = '1' if plan == 'premium' else '2'
+        if num:
+            params['num'] = min(num, 100)  # Ограничение 100
+
+        key = (endpoint, tuple(sorted(params.items())))
+
+        success, message, proxies = self._request_proxies(endpoint, params)
+        if not success:
+            return success, message, proxies
+
+        with self._pool_lock:
+            self._last_fetch_key = key
+            self._set_pool(proxies)
+
+        return True, message, list(proxies)
+
+    def _set_pool(self, proxies: List[Dict]):
+        """Заменить пул ротации. Вызывается под _pool_lock"""
+        self.proxy_pool = list(proxies)
+        self.current_index = 0
+        self.last_fetch_time = datetime.now()
 
-            # Добавить фильтры
-            if country:
-                params['country'] = country.upper()
-            if state:
-                params['state'] = state
-            if city:
-                params['city'] = city
-            if zip_code:
-                params['zipcode'] = zip_code
-            if isp:
-                params['isp'] = isp
-            if plan and plan != 'all':
-                params['plan'] = '1' if plan == 'premium' else '2'
-            if num:
-                params['num'] = min(num, 100)  # Ограничение 100
+    def _request_proxies(self, endpoint: str, params: Dict) -> tuple[bool, str, List[Dict]]:
+        """
+        Запрос списка прокси к API
 
+        Returns:
+            (success: bool, message: str, proxies: List[Dict])
+        """
+        try:
             # Запрос к API
             response = requests.get(
                 f"{self.api_base_url}{endpoint}",
@@ -148,11 +184,6 @@ class NineProxyManager:
 
             data = response.json()
 
-            # 🔥 DEBUG: Посмотреть структуру ответа
-            print(f"[9PROXY DEBUG] API Response keys: {list(data.keys())}")
-            print(f"[9PROXY DEBUG] data.get('error'): {data.get('error')}")
-            print(f"[9PROXY DEBUG] data.get('data') type: {type(data.get('data'))}")
-
             # Проверить ошибки
             if data.get('error'):
                 return False, f"API Error: {data.get('message', 'Unknown error')}", []
@@ -160,11 +191,6 @@ class NineProxyManager:
             # Получить прокси
             proxies = data.get('data', [])
 
-            # 🔥 DEBUG: Проверяем тип данных
-            print(f"[9PROXY DEBUG] API вернул data: type={type(proxies)}, len={len(proxies) if isinstance(proxies, list) else 'N/A'}")
-            if proxies and len(proxies) > 0:
-                print(f"[9PROXY DEBUG] Первый элемент: type={type(proxies[0])}, value={proxies[0]}")
-
             if not proxies:
                 return False, "Прокси не найдены с указанными фильтрами", []
 
@@ -174,21 +200,13 @@ class NineProxyManager:
 
             # Проверить первый элемент и конвертировать строки в словари
             if proxies and not isinstance(proxies[0], dict):
-                print(f"[9PROXY WARNING] API вернул не словари! Первый элемент: {type(proxies[0])}")
-                print(f"[9PROXY WARNING] Примеры данных: {proxies[:3]}")
-
-                # Конвертируем строки в словари
                 if isinstance(proxies[0], str):
-                    print(f"[9PROXY] 🔧 Парсинг строк в объекты прокси...")
                     parsed_proxies = []
 
                     for idx, proxy_str in enumerate(proxies):
                         try:
-                            print(f"[9PROXY DEBUG] Парсинг строки #{idx}: '{proxy_str}' (type={type(proxy_str)})")
-
                             # Парсим строку вида "ip:port" или "ip"
                             parts = proxy_str.strip().split(':')
-                            print(f"[9PROXY DEBUG]   Части после split: {parts}")
 
                             if len(parts) >= 2:
                                 ip = parts[0]
@@ -197,8 +215,6 @@ class NineProxyManager:
                                 ip = parts[0]
                                 port = 8080  # Порт по умолчанию
 
-                            print(f"[9PROXY DEBUG]   Результат: ip='{ip}', port={port}")
-
                             # Создаем словарь прокси
                             proxy_dict = {
                                 'id': f"{ip}_{port}_{idx}",  # Генерируем ID
@@ -211,7 +227,6 @@ class NineProxyManager:
                                 'isp': None
                             }
                             parsed_proxies.append(proxy_dict)
-                            print(f"[9PROXY]   ✅ {idx+1}. {ip}:{port}")
 
                         except Exception as e:
                             print(f"[9PROXY]   ❌ Не удалось распарсить '{proxy_str}': {e}")
@@ -220,16 +235,11 @@ class NineProxyManager:
                     if not parsed_proxies:
                         return False, "Не удалось распарсить прокси из строк", []
 
-                    print(f"[9PROXY] ✅ Распарсено {len(parsed_proxies)} прокси из строк")
+                    print(f"[9PROXY] 🔧 API вернул строки - распарсено {len(parsed_proxies)} прокси")
                     proxies = parsed_proxies
                 else:
                     return False, f"API вернул неподдерживаемый тип: {type(proxies[0])}", []
 
-            # Обновить пул
-            self.proxy_pool = proxies
-            self.current_index = 0
-            self.last_fetch_time = datetime.now()
-
             return True, f"Загружено {len(proxies)} прокси", proxies
 
         except requests.exceptions.Timeout:
@@ -239,6 +249,47 @@ class NineProxyManager:
         except Exception as e:
             return False, f"Ошибка: {str(e)}", []
 
+    def _pool_depth(self) -> int:
+        """Сколько прокси пула еще не выдано в текущем проходе (sequential)"""
+        return len(self.proxy_pool) - self.current_index if self.proxy_pool else 0
+
+    def _maybe_prefetch(self):
+        """Запустить фоновую подгрузку, если пул опустился ниже low_water_mark. Вызывается под _pool_lock"""
+        if self.low_water_mark <= 0 or self._last_fetch_key is None:
+            return
+        if self._pool_depth() > self.low_water_mark:
+            return
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+
+        key = self._last_fetch_key
+        self._prefetch_thread = threading.Thread(target=self._prefetch, args=(key,), daemon=True)
+        self._prefetch_thread.start()
+
+    def _prefetch(self, key: Tuple):
+        """Фоновая загрузка свежих прокси: новые добавляются к неиспользованному остатку пула"""
+        endpoint, params = key[0], dict(key[1])
+        success, message, proxies = self._request_proxies(endpoint, params)
+        if not success:
+            print(f"[9PROXY] Фоновая подгрузка не удалась: {message}")
+            return
+
+        with self._pool_lock:
+            self._prefetches += 1
+            if self._last_fetch_key != key:
+                return  # Пока шла загрузка, пул переключили на другие фильтры
+
+            remaining = self.proxy_pool[self.current_index:]
+            known = {(p.get('ip'), p.get('port')) for p in remaining}
+            fresh = [p for p in proxies if (p.get('ip'), p.get('port')) not in known]
+            used = [p for p in self.proxy_pool[:self.current_index] if (p.get('ip'), p.get('port')) not in known]
+            # Сначала неиспользованные, затем свежие, уже выданные - в конец
+            self.proxy_pool = remaining + fresh + [p for p in used if p not in fresh]
+            self.current_index = 0
+            self.last_fetch_time = datetime.now()
+
+        print(f"[9PROXY] Фоновая подгрузка: +{len(fresh)} новых прокси, в пуле {len(self.proxy_pool)}")
+
     def forward_to_proxy(self, proxy_id: str, port: int, plan: str = "1") -> tuple[bool, str, Optional[Dict]]:
         """
         Переадресация через /api/forward
@@ -288,17 +339,20 @@ class NineProxyManager:
         Returns:
             Dict с прокси или None
         """
-        if not self.proxy_pool:
-            return None
+        with self._pool_lock:
+            if not self.proxy_pool:
+                return None
 
-        if strategy == "random":
-            proxy = random.choice(self.proxy_pool)
-        else:  # sequential
-            proxy = self.proxy_pool[self.current_index]
-            self.current_index = (self.current_index + 1) % len(self.proxy_pool)
+            if strategy == "random":
+                proxy = random.choice(self.proxy_pool)
+            else:  # sequential
+                proxy = self.proxy_pool[self.current_index]
+                self.current_index = (self.current_index + 1) % len(self.proxy_pool)
+                # Пул расходуется только при последовательной ротации
+                self._maybe_prefetch()
 
-        self.current_proxy = proxy
-        self.total_requests += 1
+            self.current_proxy = proxy
+            self.total_requests += 1
 
         return proxy
 
@@ -479,7 +533,9 @@ class NineProxyManager:
             'failed_requests': self.failed_requests,
             'success_rate': f"{((self.total_requests - self.failed_requests) / self.total_requests * 100):.1f}%" if self.total_requests > 0 else "N/A",
             'last_fetch': self.last_fetch_time.strftime("%Y-%m-%d %H:%M:%S") if self.last_fetch_time else "Never",
-            'current_proxy': f"{self.current_proxy.get('ip')}:{self.current_proxy.get('port', 8080)}" if self.current_proxy else "None"
+            'current_proxy': f"{self.current_proxy.get('ip')}:{self.current_proxy.get('port', 8080)}" if self.current_proxy else "None",
+            'pool_depth': self._pool_depth(),
+            'prefetches': self._prefetches
         }
 
     def skip_to_next_on_failure(self, strategy: Literal["sequential", "random"] = "sequential") -> Optional[Dict]:
@@ -497,9 +553,11 @@ class NineProxyManager:
 
     def clear_pool(self):
         """Очистить пул прокси"""
-        self.proxy_pool = []
-        self.current_index = 0
-        self.current_proxy = None
+        with self._pool_lock:
+            self.proxy_pool = []
+            self.current_index = 0
+            self.current_proxy = None
+            self._last_fetch_key = None
 
     def setup_ports_for_threads(self, num_threads: int) -> List[int]:
         """
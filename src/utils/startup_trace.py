@@ -0,0 +1,61 @@
+"""
+⏱️ Startup Trace - разбивка времени запуска GUI по фазам
+
+Фазы отмечаются по ходу запуска (импорт модулей, config, компоненты, каркас
+окна, первая отрисовка), итог печатается одной таблицей [STARTUP] - регрессии
+времени старта видны сразу в консоли. Вкладки, которые строятся лениво,
+печатают время своей сборки отдельной строкой при первом открытии.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+class StartupTrace:
+    """Последовательные фазы запуска: каждая длится от предыдущей отметки до своей"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: List[Tuple[str, float]] = []
+        self.reported = False
+
+    def mark(self, name: str):
+        """Закрыть фазу name: время от предыдущей отметки до текущего момента"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def total(self) -> float:
+        """Время от старта трассировки до последней отметки (секунды)"""
+        return self._last - self.started
+
+    def report(self):
+        """Напечатать разбивку по фазам (один раз)"""
+        if self.reported:
+            return
+        self.reported = True
+
+        total = self.total()
+        width = max([len(name) for name, _ in self.phases] + [20])
+        print("[STARTUP] " + "=" * (width + 22))
+        for name, elapsed in self.phases:
+            share = elapsed / total * 100 if total > 0 else 0.0
+            print(f"[STARTUP] {name:<{width}} {elapsed * 1000:9.1f} ms {share:5.1f}%")
+        print(f"[STARTUP] {'ИТОГО':<{width}} {total * 1000:9.1f} ms")
+        print("[STARTUP] " + "=" * (width + 22))
+
+    @staticmethod
+    @contextmanager
+    def timed(name: str):
+        """Отдельный замер вне последовательности фаз (ленивая сборка вкладки и т.п.)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            print(f"[STARTUP] {name}: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+# Общая трассировка процесса (старт - первый импорт модуля окна GUI)
+STARTUP_TRACE = StartupTrace()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Тест: BulkDataGenerator - один seed дает одни и те же строки при любом числе процессов
+"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.utils.bulk_generator import BulkDataGenerator, _get_chunk_faker
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+SPECS = [
+    ('type', 'age'),
+    ('type', 'income'),
+    ('type', 'year'),
+    ('choice', ('Yes', 'No', 'Maybe')),
+    ('range', (1, 10 ** 9)),
+    ('const', 'fixed'),
+]
+# С Faker проверяются и его типы (seed_instance от seed блока)
+if _get_chunk_faker() is not None:
+    SPECS += [('type', 'email'), ('type', 'name'), ('type', 'phone')]
+
+ROWS = 2500
+CHUNK = 400
+
+
+def main():
+    print("=" * 80)
+    print("ТЕСТ: BulkDataGenerator (seed и процессы)")
+    print("=" * 80)
+    print(f"    Колонок: {len(SPECS)}, Faker: {'да' if _get_chunk_faker() is not None else 'нет'}")
+    print()
+
+    print("[1] Воспроизводимость...")
+    single = BulkDataGenerator(SPECS, seed=123, workers=1, chunk_size=CHUNK).generate(ROWS)
+    check(f"строк {len(single)}, колонок {len(single[0])}", len(single) == ROWS and len(single[0]) == len(SPECS))
+    check("повтор с тем же seed - те же строки",
+          BulkDataGenerator(SPECS, seed=123, workers=1, chunk_size=CHUNK).generate(ROWS) == single)
+    check("другой seed - другие строки",
+          BulkDataGenerator(SPECS, seed=124, workers=1, chunk_size=CHUNK).generate(ROWS) != single)
+    check("значения в заданных диапазонах", all(
+        18 <= int(row[0]) <= 80 and 2015 <= int(row[2]) <= 2025 and row[3] in ('Yes', 'No', 'Maybe')
+        and row[5] == 'fixed' for row in single))
+    print()
+
+    print("[2] Число процессов не меняет результат...")
+    for workers in (2, 3):
+        parallel = BulkDataGenerator(SPECS, seed=123, workers=workers, chunk_size=CHUNK).generate(ROWS)
+        check(f"workers={workers} == workers=1", parallel == single)
+    print()
+
+    print("[3] Целые блоки не зависят от длины набора...")
+    check(f"первые {3 * CHUNK} строк (3 блока) совпадают",
+          BulkDataGenerator(SPECS, seed=123, chunk_size=CHUNK).generate(3 * CHUNK) == single[:3 * CHUNK])
+    print()
+
+    print("[4] Потоковая запись CSV...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'bulk.csv'
+        headers = [f"col{i}" for i in range(len(SPECS))]
+        written = BulkDataGenerator(SPECS, seed=123, workers=2, chunk_size=CHUNK).write_csv(str(path), headers, ROWS)
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+    check(f"записано {written} строк", written == ROWS)
+    check("CSV = generate (с заголовком)", rows[0] == headers and rows[1:] == single)
+    print()
+
+    print("=" * 80)
+    success = all(results)
+    print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+    print("=" * 80)
+    return success
+
+
+if __name__ == "__main__":
+    # Процессы пула импортируют этот модуль заново - запуск только под __main__
+    sys.exit(0 if main() else 1)
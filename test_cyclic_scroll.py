@@ -3,6 +3,8 @@
 Тест: Циклический scroll_search с временным ограничением
 """
 
+from pathlib import Path
+
 from src.providers.smart_dynamic.generator import Generator
 
 # Тестовый user_code
@@ -33,45 +35,61 @@ print()
 generator = Generator()
 script = generator.generate_script(user_code, config)
 
+# scroll_to_element живет в runtime, скрипт только импортирует и настраивает его
+runtime_source = (Path(__file__).parent / 'src' / 'runtime' / 'octobrowser_flow.py').read_text(encoding='utf-8')
+
+print("[0] Проверка подключения runtime...")
+if 'octobrowser_flow as runtime' in script and 'runtime.configure(' in script and 'runtime.main()' in script:
+    print("    ✓ Скрипт импортирует и настраивает runtime: ДА")
+else:
+    print("    ✗ Скрипт не подключает runtime")
+    exit(1)
+if 'scroll_to_element' in script:
+    print("    ✓ scroll_to_element импортирован из runtime: ДА")
+else:
+    print("    ✗ scroll_to_element не импортирован")
+    exit(1)
+
+
 print("[1] Проверка функции scroll_to_element...")
 
 # Проверяем временное ограничение
-if 'max_duration_seconds=180' in script:
+if 'max_duration_seconds=180' in runtime_source:
     print("    ✓ Временное ограничение 180 секунд (3 минуты): ДА")
 else:
     print("    ✗ Временное ограничение: НЕТ")
     exit(1)
 
 # Проверяем циклический поиск
-if 'while not is_time_expired():' in script:
+if 'while not is_time_expired():' in runtime_source:
     print("    ✓ Циклический поиск (while loop): ДА")
 else:
     print("    ✗ Циклический поиск: НЕТ")
     exit(1)
 
 # Проверяем проверку времени
-if 'def is_time_expired():' in script:
+if 'def is_time_expired():' in runtime_source:
     print("    ✓ Функция проверки времени: ДА")
 else:
     print("    ✗ Функция проверки времени: НЕТ")
     exit(1)
 
 # Проверяем логирование времени
-if 'time.time() - start_time' in script:
+if 'time.time() - start_time' in runtime_source:
     print("    ✓ Трекинг времени выполнения: ДА")
 else:
     print("    ✗ Трекинг времени: НЕТ")
     exit(1)
 
 # Проверяем скролл вниз и вверх
-if 'window.scrollBy(0, window.innerHeight * 0.8)' in script and 'window.scrollBy(0, -window.innerHeight * 0.8)' in script:
+if 'window.scrollBy(0, window.innerHeight * 0.8)' in runtime_source and 'window.scrollBy(0, -window.innerHeight * 0.8)' in runtime_source:
     print("    ✓ Скролл вниз + вверх: ДА")
 else:
     print("    ✗ Скролл вниз + вверх: НЕТ")
     exit(1)
 
 # Проверяем паузу между циклами
-if 'Пауза 2 сек перед следующим циклом' in script and 'time.sleep(2)' in script:
+if 'Пауза 2 сек перед следующим циклом' in runtime_source and 'time.sleep(2)' in runtime_source:
     print("    ✓ Пауза между циклами (2 сек): ДА")
 else:
     print("    ✗ Пауза между циклами: НЕТ")
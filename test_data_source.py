@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Тест: DataSource - обычная и ленивая (lazy) загрузка CSV дают одни и те же строки
+"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.data.data_source import DataSource
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+# BOM, CRLF, поле с переводом строки и кавычками, пустые строки, короткая и длинная строка, кириллица
+CSV_BYTES = (
+    '\ufeffemail,First Name,note\r\n'
+    'a@b.com,Анна,"многострочная\r\nзаметка, с запятой"\r\n'
+    '\r\n'
+    'c@d.com,Bob,"кавычки ""внутри"""\r\n'
+    'short@row.com,OnlyName\r\n'
+    'long@row.com,Eve,n,extra1,extra2\r\n'
+    'last@row.com,Zed,без перевода строки в конце'
+).encode('utf-8')
+
+print("=" * 80)
+print("ТЕСТ: DataSource (eager / lazy CSV)")
+print("=" * 80)
+print()
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = Path(tmp) / 'data.csv'
+    path.write_bytes(CSV_BYTES)
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        expected = list(csv.DictReader(f))
+
+    eager = DataSource(str(path))
+    lazy = DataSource(str(path), lazy=True)
+
+    print("[1] Совпадение с csv.DictReader...")
+    check("заголовки без BOM", eager.get_headers() == lazy.get_headers() == ['email', 'First Name', 'note'])
+    check(f"строк: {eager.get_row_count()} (пустые пропущены)",
+          eager.get_row_count() == lazy.get_row_count() == len(expected) == 5)
+    check("eager get_all_rows = DictReader", eager.get_all_rows() == expected)
+    check("lazy get_all_rows = DictReader", lazy.get_all_rows() == expected)
+    check("поле с переводом строки и запятой", lazy.get_row(0)['note'] == 'многострочная\r\nзаметка, с запятой')
+    check("короткая строка - None, длинная - хвост под ключом None",
+          lazy.get_row(2)['note'] is None and lazy.get_row(3)[None] == ['extra1', 'extra2'])
+    print()
+
+    print("[2] Произвольный доступ в lazy режиме...")
+    check("строки в обратном порядке по индексу смещений",
+          [lazy.get_row(i) for i in reversed(range(5))] == list(reversed(expected)))
+    check("индекс вне диапазона -> {}", lazy.get_row(5) == {} and eager.get_row(-1) == {})
+    check("lazy не держит значения в памяти", lazy._rows == [] and len(lazy._offsets) == 5)
+    print()
+
+    print("[3] Потоковый обход и колонки...")
+    check("iter_values eager = lazy", list(eager.iter_values()) == list(lazy.iter_values()))
+    check("get_column_values", lazy.get_column_values('First Name') == ['Анна', 'Bob', 'OnlyName', 'Eve', 'Zed']
+          and eager.get_column_values('note')[2] is None)
+    check("неизвестная колонка -> []", lazy.get_column_values('missing') == [])
+    print()
+
+    print("[4] Смена режима и ошибки...")
+    eager.load_data(str(path), lazy=True)
+    check("load_data(lazy=True) переключает режим", eager._offsets is not None and eager.get_all_rows() == expected)
+    empty = Path(tmp) / 'empty.csv'
+    empty.write_bytes(b'')
+    check("пустой файл - без заголовков и строк", DataSource(str(empty), lazy=True).get_row_count() == 0
+          and DataSource(str(empty)).get_headers() == [])
+    try:
+        DataSource(str(Path(tmp) / 'data.txt'))
+        check("нет файла -> FileNotFoundError", False)
+    except FileNotFoundError:
+        check("нет файла -> FileNotFoundError", True)
+    print()
+
+print("=" * 80)
+success = all(results)
+print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+print("=" * 80)
+sys.exit(0 if success else 1)
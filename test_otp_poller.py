@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Тест: OTPPoller - один поток опроса getStatus на все активации провайдера
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.sms.base_provider import SMSStatus
+from src.sms.otp_poller import OTPPoller
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+class FakeProvider:
+    """Код приходит после codes_after[activation_id] опросов этой активации"""
+
+    POLL_INTERVAL = 0.05
+    MIN_REQUEST_GAP = 0.0
+
+    def __init__(self, codes_after=None, fail_first=False):
+        self.codes_after = codes_after or {}
+        self.fail_first = fail_first
+        self.polls = {}
+        self.request_times = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def check_status(self, activation_id):
+        with self._lock:
+            self.request_times.append(time.monotonic())
+            self.threads.add(threading.current_thread().ident)
+            self.polls[activation_id] = self.polls.get(activation_id, 0) + 1
+            count = self.polls[activation_id]
+        if self.fail_first and count == 1:
+            raise ConnectionError("network glitch")
+        if activation_id == 'cancelled':
+            return {'status': SMSStatus.CANCELLED, 'code': None, 'full_text': None, 'error': 'Отменена'}
+        if count >= self.codes_after.get(activation_id, 10 ** 9):
+            return {'status': SMSStatus.RECEIVED, 'code': f'code-{activation_id}',
+                    'full_text': 'Your code', 'error': None}
+        return {'status': SMSStatus.WAITING, 'code': None, 'full_text': None, 'error': None}
+
+
+print("=" * 80)
+print("ТЕСТ: OTPPoller")
+print("=" * 80)
+print()
+
+print("[1] Несколько ожидающих - один поток опроса...")
+provider = FakeProvider(codes_after={f'a{i}': i + 1 for i in range(5)})
+poller = OTPPoller(provider)
+with ThreadPoolExecutor(max_workers=5) as executor:
+    codes = list(executor.map(lambda i: poller.wait_code(f'a{i}', timeout=5), range(5)))
+check("каждый поток получил свой код", [result['code'] for result in codes] == [f'code-a{i}' for i in range(5)])
+check("все результаты success", all(result['success'] for result in codes))
+check("опрос шел из одного потока", len(provider.threads) == 1)
+stats = poller.get_stats()
+check("статистика: 5 получено, очередь пуста", stats['received'] == 5 and stats['pending'] == 0)
+print()
+
+print("[2] Минимальный интервал провайдера соблюдается глобально...")
+provider = FakeProvider(codes_after={'g1': 3, 'g2': 3, 'g3': 3})
+poller = OTPPoller(provider, poll_interval=0.0, request_gap=0.05)
+futures = [poller.watch(key, timeout=5) for key in ('g1', 'g2', 'g3')]
+[future.result(5) for future in futures]
+gaps = [b - a for a, b in zip(provider.request_times, provider.request_times[1:])]
+check(f"между запросами >= 0.05s (минимум {min(gaps):.3f}s)", min(gaps) >= 0.045)
+print()
+
+print("[3] Таймаут, отмена, ошибки сети...")
+provider = FakeProvider(fail_first=True, codes_after={'flaky': 2})
+poller = OTPPoller(provider)
+started = time.monotonic()
+result = poller.wait_code('never', timeout=0.3)
+check("код не пришел - TIMEOUT по deadline", result['status'] == SMSStatus.TIMEOUT and not result['success'])
+check("таймаут без лишнего ожидания", time.monotonic() - started < 1.5)
+check("ошибка check_status = продолжаем ждать", poller.wait_code('flaky', timeout=5)['code'] == 'code-flaky')
+check("закрытая активация - статус провайдера", poller.wait_code('cancelled', timeout=5)['status'] == SMSStatus.CANCELLED)
+
+future = poller.watch('forgotten', timeout=30)
+check("повторный watch - тот же Future", poller.watch('forgotten', timeout=30) is future)
+poller.forget('forgotten')
+check("forget будит ожидающего (CANCELLED)", future.result(1)['status'] == SMSStatus.CANCELLED)
+print()
+
+print("[4] stop() и повторный запуск...")
+future = poller.watch('stopped', timeout=30)
+poller.stop()
+check("stop -> ожидающие получают ERROR", future.result(1)['status'] == SMSStatus.ERROR)
+provider.codes_after['after-stop'] = 1
+check("после stop новые активации опрашиваются", poller.wait_code('after-stop', timeout=5)['success'])
+print()
+
+print("=" * 80)
+success = all(results)
+print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+print("=" * 80)
+sys.exit(0 if success else 1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Тест: PhoneNumberPool - аренда номеров впереди спроса и автоотмена просроченных
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.sms.number_pool import PhoneNumberPool
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+def wait_until(condition, timeout: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class FakeProvider:
+    """get_number выдает номера по порядку, cancel_activation запоминает отмененные"""
+
+    def __init__(self, rent_delay: float = 0.0):
+        self.rent_delay = rent_delay
+        self.rented = 0
+        self.cancelled = []
+        self.params = None
+        self._lock = threading.Lock()
+
+    def get_number(self, service, **params):
+        time.sleep(self.rent_delay)
+        with self._lock:
+            self.rented += 1
+            number = self.rented
+            self.params = params
+        return {'activation_id': f'act-{number}', 'phone_number': f'+1555000{number:04d}',
+                'service': service, 'success': True, 'error': None}
+
+    def cancel_activation(self, activation_id):
+        with self._lock:
+            self.cancelled.append(activation_id)
+        return {'success': True, 'error': None}
+
+
+class EmptyProvider(FakeProvider):
+    def get_number(self, service, **params):
+        return {'success': False, 'error': 'NO_NUMBERS'}
+
+
+print("=" * 80)
+print("ТЕСТ: PhoneNumberPool")
+print("=" * 80)
+print()
+
+print("[1] Номера арендуются заранее и выдаются без ожидания...")
+provider = FakeProvider(rent_delay=0.05)
+pool = PhoneNumberPool(provider, 'ot', size=2, max_age=60, max_price=0.5)
+pool.start()
+check("пул набрал 2 номера впереди спроса", wait_until(lambda: pool.get_stats()['ready'] == 2))
+check("параметры get_number переданы", provider.params == {'max_price': 0.5})
+number = pool.acquire(timeout=5)
+check("выдан первый арендованный номер", number['activation_id'] == 'act-1' and number['success'])
+check(f"без ожидания API ({number['waited']:.3f}s)", number['waited'] < 0.04)
+check("rented_at наружу не отдается", 'rented_at' not in number)
+check("пул добрал номер после выдачи", wait_until(lambda: pool.get_stats()['ready'] == 2))
+stats = pool.get_stats()
+check("статистика: hit, задержка аренды учтена", stats['hits'] == 1 and stats['avg_rent'] >= 0.04)
+print()
+
+print("[2] stop() отменяет невыданные номера...")
+cancelled = pool.stop()
+check("отменено 2 невыданных номера", cancelled == 2 and len(provider.cancelled) == 2)
+check("выданный номер не отменен", 'act-1' not in provider.cancelled)
+number = pool.acquire(timeout=5)
+check("остановленный пул арендует сам", number['success'] and pool.get_stats()['misses'] == 1)
+print()
+
+print("[3] Невостребованные номера отменяются по max_age...")
+provider = FakeProvider()
+pool = PhoneNumberPool(provider, 'ot', size=2, max_age=0.3)
+pool.start()
+check("пул набрал 2 номера", wait_until(lambda: pool.get_stats()['ready'] == 2))
+check("через max_age оба отменены", wait_until(lambda: {'act-1', 'act-2'} <= set(provider.cancelled), timeout=2))
+stats = pool.get_stats()
+check(f"expired = {stats['expired']} (>= 2)", stats['expired'] >= 2)
+check("вместо просроченных арендованы новые", wait_until(lambda: pool.get_stats()['ready'] == 2)
+      and provider.rented >= 4)
+number = pool.acquire(timeout=5)
+check("выдается не просроченный номер", number['activation_id'] not in provider.cancelled)
+pool.stop()
+print()
+
+print("[4] Провайдер не выдает номер - acquire возвращает ошибку по таймауту...")
+pool = PhoneNumberPool(EmptyProvider(), 'ot', size=1)
+pool.start()
+number = pool.acquire(timeout=0.3)
+check("success=False и текст ошибки", not number['success'] and 'не получен' in number['error'])
+check("rent_failures учтены", pool.get_stats()['rent_failures'] >= 1)
+pool.stop()
+print()
+
+print("=" * 80)
+success = all(results)
+print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+print("=" * 80)
+sys.exit(0 if success else 1)
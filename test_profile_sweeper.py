@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Тест: ProfileSweeper.find_orphans - отбор профилей прерванных прогонов
+"""
+
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.api.profile_sweeper import ProfileSweeper, _host_id, pool_owner_tag
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+        self.text = json.dumps(data)
+        self.status_code = 200
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """GET /profiles постранично из списка профилей"""
+
+    def __init__(self, profiles, with_total=True):
+        self.profiles = profiles
+        self.with_total = with_total
+        self.pages = []
+
+    def get(self, url, params=None, **kwargs):
+        page, page_len = params['page'], params['page_len']
+        self.pages.append(page)
+        data = {'data': self.profiles[page * page_len:(page + 1) * page_len]}
+        if self.with_total:
+            data['total_count'] = len(self.profiles)
+        return FakeResponse(data)
+
+
+def iso_ago(minutes: float) -> str:
+    moment = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=minutes)
+    return moment.isoformat().replace('+00:00', 'Z')
+
+
+# PID завершенного процесса на этом хосте
+finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+finished.wait()
+now = time.time()
+
+profiles = [
+    {'uuid': 'old-auto', 'title': 'Auto Profile T1 #3', 'created_at': iso_ago(120)},
+    {'uuid': 'fresh-auto', 'title': 'Auto Profile T2 #1', 'created_at': iso_ago(5)},
+    {'uuid': 'undated-auto', 'title': 'Auto Profile T3 #2'},
+    {'uuid': 'user-title', 'title': 'Auto Profile', 'created_at': iso_ago(600)},
+    {'uuid': 'user-suffix', 'title': 'Auto Profile T1 #3 (copy)', 'created_at': iso_ago(600)},
+    {'uuid': 'tagged', 'title': 'Manual', 'tags': [{'name': 'automation'}], 'created_at': iso_ago(60)},
+    {'uuid': 'epoch-ms', 'title': 'Auto Profile T4 #1', 'created_at': int((now - 3600) * 1000)},
+    {'uuid': 'pool-alive', 'title': 'Pool Profile Slot 1', 'created_at': iso_ago(600),
+     'tags': [pool_owner_tag(now - 60)]},
+    {'uuid': 'pool-dead', 'title': 'Pool Profile Slot 2', 'created_at': iso_ago(1),
+     'tags': [f"pool-owner-{_host_id()}-{finished.pid}-{int(now - 60)}"]},
+    {'uuid': 'pool-remote-stale', 'title': 'Pool Profile Slot 3',
+     'tags': [f"pool-owner-otherhost{_host_id()}-{os.getpid()}-{int(now - 48 * 3600)}"]},
+    {'uuid': 'pool-remote-live', 'title': 'Pool Profile Slot 4',
+     'tags': [f"pool-owner-otherhost{_host_id()}-{os.getpid()}-{int(now - 3600)}"]},
+    {'uuid': 'pool-untagged', 'title': 'Pool Profile Slot 5', 'created_at': iso_ago(6000)},
+    {'title': 'Auto Profile T5 #1', 'created_at': iso_ago(600)},
+]
+
+print("=" * 80)
+print("ТЕСТ: ProfileSweeper.find_orphans")
+print("=" * 80)
+print()
+
+session = FakeSession(profiles)
+sweeper = ProfileSweeper(session, 'https://example.invalid/api/v2/automation', 'token', page_len=4)
+orphans, total = sweeper.find_orphans(min_age_minutes=30, tags=['automation'])
+found = {profile['uuid'] for profile in orphans}
+
+print("[1] Постраничный список...")
+check(f"все {len(profiles)} профилей прочитаны", total == len(profiles))
+check("по total_count запрошены страницы 0..3", sorted(session.pages) == [0, 1, 2, 3])
+no_total = FakeSession(profiles, with_total=False)
+_, total = ProfileSweeper(no_total, 'https://example.invalid', 'token', page_len=4).find_orphans()
+check("без total_count - до неполной страницы", total == len(profiles) and no_total.pages == [0, 1, 2, 3])
+print()
+
+print("[2] Одноразовые профили...")
+check("старый 'Auto Profile T1 #3' - сирота", 'old-auto' in found)
+check("время в миллисекундах разбирается", 'epoch-ms' in found)
+check("профиль моложе min_age не трогается", 'fresh-auto' not in found)
+check("профиль без даты не трогается", 'undated-auto' not in found)
+check("'Auto Profile' без T<поток> #<итерация> - профиль пользователя", 'user-title' not in found)
+check("название с хвостом не совпадает (якорь $)", 'user-suffix' not in found)
+check("отбор по тегу", 'tagged' in found)
+print()
+
+print("[3] Профили пула (решает владелец, а не возраст)...")
+check("владелец жив на этом хосте - не сирота", 'pool-alive' not in found)
+check("владелец завершен на этом хосте - сирота (даже свежий)", 'pool-dead' in found)
+check("другой хост, прогон старше 24ч - сирота", 'pool-remote-stale' in found)
+check("другой хост, прогон моложе 24ч - не сирота", 'pool-remote-live' not in found)
+check("без тега владельца - не сирота", 'pool-untagged' not in found)
+print()
+
+print("=" * 80)
+success = all(results)
+print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+print("=" * 80)
+sys.exit(0 if success else 1)
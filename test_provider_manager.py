@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Тест: ProviderManager - рейтинг провайдеров по латентности и переход к следующему при ошибке
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.sms.base_provider import BaseSMSProvider, SMSStatus
+from src.sms.provider_manager import ProviderManager
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+class FakeProvider(BaseSMSProvider):
+    """Провайдер без сети: задержка аренды (delay) и отказ (fail) задаются при создании"""
+
+    def __init__(self, api_key: str, delay: float = 0.0, fail: bool = False, **kwargs):
+        super().__init__(api_key, **kwargs)
+        self.delay = delay
+        self.fail = fail
+        self.counter = 0
+        self.cancelled = []
+
+    def get_balance(self):
+        return {'balance': 1.0, 'currency': 'USD', 'success': True, 'error': None}
+
+    def get_services(self):
+        return {'services': [], 'success': True, 'error': None}
+
+    def get_number(self, service, **params):
+        time.sleep(self.delay)
+        if self.fail:
+            return {'activation_id': None, 'phone_number': None, 'service': service,
+                    'success': False, 'error': 'NO_NUMBERS'}
+        self.counter += 1
+        return {'activation_id': f'{self.api_key}-{self.counter}', 'phone_number': '+15550000000',
+                'service': service, 'success': True, 'error': None}
+
+    def get_sms_code(self, activation_id, timeout=180):
+        return {'code': '1234', 'full_text': 'code 1234', 'status': SMSStatus.RECEIVED,
+                'success': True, 'error': None}
+
+    def cancel_activation(self, activation_id):
+        self.cancelled.append(activation_id)
+        return {'success': True, 'error': None}
+
+    def finish_activation(self, activation_id):
+        return {'success': True, 'error': None}
+
+
+class BrokenProvider(FakeProvider):
+    def get_number(self, service, **params):
+        raise ConnectionError("connection reset")
+
+
+ProviderManager.register_provider('fake-fast', FakeProvider)
+ProviderManager.register_provider('fake-slow', FakeProvider)
+ProviderManager.register_provider('fake-broken', BrokenProvider)
+
+print("=" * 80)
+print("ТЕСТ: ProviderManager (маршрутизация SMS)")
+print("=" * 80)
+print()
+
+print("[1] Рейтинг по измеренной латентности...")
+manager = ProviderManager()
+manager.create_provider('fake-slow', 'slow', delay=0.08)
+manager.add_provider('fake-fast', 'fast', delay=0.01)
+check("активный провайдер не сменился при add_provider", manager.get_provider_name() == 'fake-slow')
+providers = {name: [] for name in ('fake-slow', 'fake-fast')}
+for _ in range(4):
+    result = manager.get_number('ot')
+    providers[result['provider']].append(result['activation_id'])
+check("без статистики опробованы оба провайдера", all(providers.values()))
+check("после замеров быстрый провайдер первый", manager.rank_providers() == ['fake-fast', 'fake-slow'])
+result = manager.get_number('ot')
+check("новая аренда уходит быстрому", result['provider'] == 'fake-fast')
+stats = manager.get_routing_stats()
+check("оценка медленного хуже", stats['fake-slow']['score'] > stats['fake-fast']['score'])
+print()
+
+print("[2] Активация обслуживается провайдером, выдавшим номер...")
+slow_activation = providers['fake-slow'][0]
+manager.cancel_activation(slow_activation)
+check("отмена ушла медленному провайдеру",
+      slow_activation in manager._connected['fake-slow'].cancelled
+      and slow_activation not in manager._connected['fake-fast'].cancelled)
+code = manager.get_sms_code(result['activation_id'])
+check("код получен у владельца активации", code['success'] and code['code'] == '1234')
+print()
+
+print("[3] Ошибка аренды -> следующий провайдер...")
+manager = ProviderManager()
+manager.create_provider('fake-broken', 'broken')
+manager.add_provider('fake-slow', 'empty', fail=True)
+manager.add_provider('fake-fast', 'ok', delay=0.01)
+result = manager.get_number('ot')
+check("номер выдал единственный рабочий провайдер", result['success'] and result['provider'] == 'fake-fast')
+ranking = manager.rank_providers()
+check(f"провайдеры с ошибками опустились в рейтинге ({ranking})", ranking[0] == 'fake-fast')
+check("исключение провайдера учтено как ошибка",
+      manager.get_routing_stats()['fake-broken']['number']['failures'] == 1)
+print()
+
+print("[4] Все провайдеры отказали...")
+manager.remove_provider('fake-fast')
+result = manager.get_number('ot')
+check("success=False, ошибки всех провайдеров в тексте", not result['success']
+      and 'fake-broken' in result['error'] and 'fake-slow' in result['error'])
+check("после remove_provider активный - из оставшихся", manager.get_provider_name() in ('fake-broken', 'fake-slow'))
+print()
+
+print("=" * 80)
+success = all(results)
+print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+print("=" * 80)
+sys.exit(0 if success else 1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Тест: RateGovernor - AIMD скорость по ответам Cloud API и пауза по заголовкам
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.api.rate_governor import RateGovernor
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+print("=" * 80)
+print("ТЕСТ: RateGovernor (AIMD + Retry-After)")
+print("=" * 80)
+print()
+
+print("[1] Аддитивный рост на 2xx до max_rate...")
+governor = RateGovernor(rate=1.0, max_rate=1.2, increase_step=0.05)
+governor.feedback(200)
+check("200 -> скорость 1.05", abs(governor.rate - 1.05) < 1e-9)
+for _ in range(20):
+    governor.feedback(201)
+check("рост ограничен max_rate (1.2)", abs(governor.rate - 1.2) < 1e-9)
+governor.feedback(404)
+check("4xx (не 429) скорость не меняет", abs(governor.rate - 1.2) < 1e-9)
+print()
+
+print("[2] Мультипликативное снижение на 429 до min_rate...")
+governor = RateGovernor(rate=2.0, min_rate=0.3, decrease_factor=0.5)
+governor.feedback(429, {'Retry-After': '0'})
+check("429 -> скорость 1.0", abs(governor.rate - 1.0) < 1e-9)
+for _ in range(10):
+    governor.feedback(429, {'Retry-After': '0'})
+check("снижение ограничено min_rate (0.3)", abs(governor.rate - 0.3) < 1e-9)
+check("throttled_responses = 11", governor.get_stats()['throttled_responses'] == 11)
+print()
+
+print("[3] Пауза из заголовков...")
+check("Retry-After: 7 -> 7s", RateGovernor._pause_from_headers({'Retry-After': '7'}) == 7.0)
+check("X-RateLimit-Remaining: 0 + Reset: 3 -> 3s",
+      RateGovernor._pause_from_headers({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '3'}) == 3.0)
+reset_at = time.time() + 10
+pause = RateGovernor._pause_from_headers({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset_at)})
+check("X-RateLimit-Reset как unix timestamp -> ~10s", pause is not None and 9 <= pause <= 10)
+check("Remaining > 0 -> без паузы",
+      RateGovernor._pause_from_headers({'X-RateLimit-Remaining': '5', 'X-RateLimit-Reset': '3'}) is None)
+check("без заголовков -> без паузы", RateGovernor._pause_from_headers(None) is None)
+print()
+
+print("[4] 429 с Retry-After задерживает следующий acquire...")
+governor = RateGovernor(rate=50.0, burst=5, max_rate=50.0)
+check("acquire из полной корзины без ожидания", governor.acquire() < 0.05)
+governor.feedback(429, {'Retry-After': '0.3'})
+waited = governor.acquire('cleanup')
+check(f"acquire после 429 ждал паузу ({waited:.2f}s >= 0.25s)", waited >= 0.25)
+stats = governor.get_stats()
+check("вызовы учтены по полосам", stats['lanes']['provision']['calls'] == 1
+      and stats['lanes']['cleanup']['calls'] == 1)
+print()
+
+print("=" * 80)
+success = all(results)
+print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+print("=" * 80)
+sys.exit(0 if success else 1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Тест: recorder_ir - разбор строк Playwright Recorder и разметка вопросов
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.providers.recorder_ir import (
+    ACTION, ASSIGN, CODE, COMMAND, WITH, analyze, analyze_line, clear_caches, parse_recording
+)
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+RECORDING = '''import re
+from playwright.sync_api import Playwright, sync_playwright, expect
+
+def run(playwright: Playwright) -> None:
+    browser = playwright.chromium.launch(headless=False)
+    context = browser.new_context()
+    page = context.new_page()
+    page.goto("https://example.com/")
+    page.get_by_role("button", name="Start").click()
+    page.get_by_role("heading", name="What is your zip?")
+    page.get_by_role("textbox", name="Zip").fill("12345")
+    #pause5
+    page.get_by_role("button", name="Next").click()
+    page.get_by_role("heading", name="Do you own a home?")
+    page.get_by_role("button", name="Yes").click()
+    page.get_by_role("button", name="Finish").click()
+    with page.expect_popup() as page1_info:
+        page.get_by_role("button", name="Finish").click()
+    page1 = page1_info.value
+    page1.get_by_role("button", name="Close").click()
+    context.close()
+    browser.close()
+
+with sync_playwright() as playwright:
+    run(playwright)
+'''
+
+print("=" * 80)
+print("ТЕСТ: recorder_ir (IR записи Playwright Recorder)")
+print("=" * 80)
+print()
+
+print("[1] Разбор строк...")
+stmt = analyze('page.get_by_role("button", name="Say \\"hi\\"").click()')
+check("действие get_by_role: роль, имя с экранированными кавычками, метод",
+      stmt.kind == ACTION and stmt.role == 'button' and stmt.name == 'Say "hi"' and stmt.action == 'click')
+stmt = analyze('page.locator(\'#email\').fill(data_row["Email"])  # from CSV')
+check("'#' внутри строки - не комментарий", stmt.selector == '#email' and stmt.comment == '# from CSV')
+check("колонка CSV из fill(data_row[...])", stmt.data_key == 'Email')
+stmt = analyze('page.get_by_test_id("submit").first.click(timeout=5000)')
+check("цепочка после локатора: test_id и аргументы действия",
+      stmt.test_id == 'submit' and stmt.action_args == 'timeout=5000')
+stmt = analyze('page.get_by_role("heading", name="What is your zip?")')
+check("heading без .click() - маркер вопроса", stmt.kind == CODE and stmt.heading == 'What is your zip?')
+check("heading с .click() - обычное действие",
+      analyze('page.get_by_role("heading", name="Zip").click()').heading is None)
+check("page.goto с '#' в URL - без комментария", analyze('page.goto("https://x.com/#a")').comment is None)
+print()
+
+print("[2] Спец. команды...")
+check("#pause5", (analyze('#pause5').kind, analyze('#pause5').command_args) == (COMMAND, ('5',)))
+check("#optional:2", analyze('#optional:2').command_args == ('2',))
+check("#retry:3:50:scroll_search", analyze('#retry:3:50:scroll_search').command_args == ('3', '50', 'scroll_search'))
+check("# scroll down (с пробелами)", analyze('# scroll down').command == 'scrolldown')
+check("обычный комментарий - не команда", analyze('# просто комментарий').command is None)
+print()
+
+print("[3] Popup блок...")
+stmt = analyze('with page.expect_popup() as page1_info:')
+check("with expect_popup", stmt.kind == WITH and stmt.opens_popup and stmt.with_as == 'page1_info')
+stmt = analyze('page1 = page1_info.value')
+check("присваивание popup страницы", stmt.kind == ASSIGN and stmt.target == 'page1' and stmt.popup_info == 'page1_info')
+recording = parse_recording(RECORDING)
+opener = next(index for index, line in enumerate(recording.lines) if line.opens_popup)
+check("popup_block: кнопка и страница", recording.popup_block(opener) == {
+    'receiver': 'page', 'info_var': 'page1_info', 'button': 'Finish', 'page': 'page1'})
+print()
+
+print("[4] Разметка вопросов...")
+questions, pre_lines, post_lines = recording.sections()
+check("два вопроса по heading", list(questions) == ['What is your zip?', 'Do you own a home?'])
+check("действия первого вопроса (с #pause5)", [line.text for line in questions['What is your zip?']] == [
+    'page.get_by_role("textbox", name="Zip").fill("12345")', '#pause5',
+    'page.get_by_role("button", name="Next").click()'])
+check("дубликат клика перед popup удален из вопроса",
+      [line.text for line in questions['Do you own a home?']] == ['page.get_by_role("button", name="Yes").click()'])
+check("pre: goto и Start, без boilerplate записи", [line.strip() for line in pre_lines] == [
+    'page.goto("https://example.com/")', 'page.get_by_role("button", name="Start").click()'])
+check("post: popup блок без close()", [line.strip() for line in post_lines] == [
+    'with page.expect_popup() as page1_info:', 'page.get_by_role("button", name="Finish").click()',
+    'page1 = page1_info.value', 'page1.get_by_role("button", name="Close").click()'])
+print()
+
+print("[5] Кеши разбора...")
+check("одинаковый код - та же запись", parse_recording(RECORDING) is recording)
+line = analyze_line('        page.get_by_role("button", name="Next").click()')
+check("строка с другим отступом разбирается из кеша Statement",
+      line.indent == 8 and line.name == 'Next' and line.raw.startswith('        '))
+clear_caches()
+check("clear_caches сбрасывает кеш записей", parse_recording(RECORDING) is not recording)
+print()
+
+print("=" * 80)
+success = all(results)
+print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+print("=" * 80)
+sys.exit(0 if success else 1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Тест: SectionCache - кеш секций генерируемых скриптов и его инвалидация
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.providers.section_cache import SECTION_CACHE, SectionCache, source_fingerprint
+from src.providers.smart_dynamic.generator import Generator
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+class Builder:
+    """Сборщик секции, считающий вызовы"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.text
+
+
+USER_CODE = '''
+page.goto("https://example.com/")
+page.get_by_role("heading", name="What is your zip?")
+page.get_by_role("textbox", name="Zip").fill("12345")
+page.get_by_role("button", name="Next").click()
+'''
+
+print("=" * 80)
+print("ТЕСТ: SectionCache")
+print("=" * 80)
+print()
+
+with tempfile.TemporaryDirectory() as tmp:
+    cache_dir = Path(tmp) / 'sections'
+
+    print("[1] Ключ по входным данным...")
+    cache = SectionCache(cache_dir=cache_dir)
+    build = Builder('config A')
+    cache.get_or_build('smart_dynamic', 'config', (1, 'token'), build)
+    text = cache.get_or_build('smart_dynamic', 'config', (1, 'token'), build)
+    check("повтор с теми же входными - из памяти", text == 'config A' and build.calls == 1)
+    cache.get_or_build('smart_dynamic', 'config', (2, 'token'), Builder('config B'))
+    check("другие входные - новая сборка", cache.get_stats()['misses'] == 2)
+    other = Builder('wf config')
+    cache.get_or_build('smart_wf', 'config', (1, 'token'), other)
+    check("другой провайдер с теми же входными - своя секция", other.calls == 1)
+    print()
+
+    print("[2] Диск переживает перезапуск...")
+    restarted = SectionCache(cache_dir=cache_dir)
+    build = Builder('не должен собираться')
+    text = restarted.get_or_build('smart_dynamic', 'config', (1, 'token'), build)
+    check("секция прочитана с диска", text == 'config A' and build.calls == 0)
+    check("disk_hits = 1", restarted.get_stats()['disk_hits'] == 1)
+    restarted.clear(disk=True)
+    check("clear(disk=True) удаляет файлы", not list(cache_dir.glob('*.txt')))
+    print()
+
+    print("[3] LRU в памяти...")
+    small = SectionCache(cache_dir=None, max_memory_entries=2)
+    for index in range(3):
+        small.get_or_build('p', f's{index}', (), Builder(str(index)))
+    build = Builder('0')
+    small.get_or_build('p', 's0', (), build)
+    check("самая старая секция вытеснена", build.calls == 1 and small.get_stats()['memory_entries'] == 2)
+    print()
+
+    print("[4] Отпечаток исходников...")
+    source = Path(tmp) / 'generator.py'
+    source.write_text('v1', encoding='utf-8')
+    before = source_fingerprint(source)
+    check("отпечаток стабилен", source_fingerprint(source) == before)
+    source.write_text('v2 (другой размер)', encoding='utf-8')
+    os.utime(source, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+    check("правка файла меняет отпечаток", source_fingerprint(source) != before)
+    check("отсутствующий файл не падает", len(source_fingerprint(Path(tmp) / 'missing.py')) == 16)
+    print()
+
+    print("[5] Генератор: смена настроек пересобирает только зависимые секции...")
+    SECTION_CACHE.cache_dir = Path(tmp) / 'generator'
+    SECTION_CACHE.clear()
+    generator = Generator()
+    config = {'api_token': 'token', 'threads_count': 2}
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_script(USER_CODE, config)
+        before = SECTION_CACHE.get_stats()
+        cached_script = generator.generate_script(USER_CODE, dict(config, threads_count=5))
+        after = SECTION_CACHE.get_stats()
+        fresh_script = generator.generate_script(USER_CODE, dict(config, threads_count=5, section_cache=False))
+    check("пересобрана одна секция (config)", after['misses'] - before['misses'] == 1)
+    check("остальные 6 секций из кеша", after['memory_hits'] - before['memory_hits'] == 6)
+    check("скрипт из кеша совпадает со сборкой без кеша", cached_script == fresh_script)
+    check("новая настройка в скрипте", 'THREADS_COUNT = 5' in cached_script)
+    SECTION_CACHE.clear()
+    SECTION_CACHE.cache_dir = None
+print()
+
+print("=" * 80)
+success = all(results)
+print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+print("=" * 80)
+sys.exit(0 if success else 1)
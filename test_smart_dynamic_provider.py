@@ -134,11 +134,8 @@ def test_generator():
         ("Are you currently insured?", "Вопрос 1"),
         ("What's your car year?", "Вопрос 2"),
         ("What's your gender?", "Вопрос 3"),
-        ("button_click", "Тип действия: клик"),
-        ("textbox_fill", "Тип действия: заполнение"),
         ("Field2", "Ссылка на данные CSV"),
         ("def run_iteration", "Основная итерация"),
-        ("def process_task", "Worker функция"),
     ]
 
     all_passed = True
@@ -149,6 +146,35 @@ def test_generator():
             print(f"  ✗ {description} - НЕ НАЙДЕН!")
             all_passed = False
 
+    # Поиск ответов и worker живут в runtime, скрипт импортирует и настраивает его
+    print("\n[2.1] Проверка runtime...")
+    runtime_source = (Path(__file__).parent / 'src' / 'runtime' / 'octobrowser_flow.py').read_text(encoding='utf-8')
+
+    runtime_checks = [
+        ("button_click", "Тип действия: клик"),
+        ("textbox_fill", "Тип действия: заполнение"),
+        ("def answer_questions", "Функция поиска ответов"),
+        ("def process_task", "Worker функция"),
+    ]
+    for keyword, description in runtime_checks:
+        if keyword in runtime_source:
+            print(f"  ✓ {description}")
+        else:
+            print(f"  ✗ {description} - НЕ НАЙДЕН В RUNTIME!")
+            all_passed = False
+
+    script_checks = [
+        ("octobrowser_flow as runtime", "Импорт runtime"),
+        ("runtime.configure(", "Настройка runtime"),
+        ("runtime.main()", "Запуск runtime"),
+    ]
+    for keyword, description in script_checks:
+        if keyword in script:
+            print(f"  ✓ {description}")
+        else:
+            print(f"  ✗ {description} - НЕ НАЙДЕН!")
+            all_passed = False
+
     # Сохранение для ручной проверки
     output_file = Path(__file__).parent / "test_generated_dynamic_script.py"
     print(f"\n[3] Сохранение скрипта в {output_file}...")
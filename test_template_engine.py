@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Тест: CompiledTemplate - тот же результат, что у прежнего replace_variables (re.sub по каждой переменной)
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.data.template_engine import CompiledTemplate, TemplateEngine, compile_template
+
+results = []
+
+
+def check(name: str, condition: bool):
+    print(f"    {'✓' if condition else '✗'} {name}")
+    results.append(condition)
+
+
+def legacy_replace_variables(text, variables):
+    """replace_variables до CompiledTemplate (эталон для сравнения)"""
+    result = text
+    for var_name, var_value in variables.items():
+        pattern = r'\{\{' + var_name + r'\}\}'
+        value_str = str(var_value) if var_value is not None else ''
+        result = re.sub(pattern, value_str, result)
+    return result
+
+
+engine = TemplateEngine()
+
+print("=" * 80)
+print("ТЕСТ: TemplateEngine / CompiledTemplate")
+print("=" * 80)
+print()
+
+print("[1] Совпадение с прежним replace_variables...")
+cases = [
+    ('page.fill("{{email}}")', {'email': 'a@b.com'}),
+    ('{{a}}{{b}}{{a}}', {'a': 1, 'b': 2.5}),
+    ('{{First Name}} {{Last Name}}', {'First Name': 'Bob', 'Last Name': 'Smith'}),
+    ('{{missing}} и {{x}}', {'x': 'X'}),
+    ('{{ x }} {x} {{{x}}}', {'x': 'X'}),
+    ('{{none}}!', {'none': None}),
+    ('без переменных', {'x': 'X'}),
+    ('', {}),
+]
+for text, variables in cases:
+    expected = legacy_replace_variables(text, variables)
+    actual = engine.replace_variables(text, variables)
+    check(f"{text!r} -> {actual!r}", actual == expected)
+
+rng = random.Random(42)
+names = ['email', 'phone', 'First Name', 'zip_code', 'city']
+mismatches = 0
+for _ in range(500):
+    parts = []
+    for _ in range(rng.randint(0, 8)):
+        parts.append(rng.choice(['text ', '{{', '}}', ' {{' + rng.choice(names + ['other']) + '}} ', '"', '\n']))
+    text = ''.join(parts)
+    variables = {name: rng.choice(['v', 'value 1', '', None, 42]) for name in names if rng.random() < 0.7}
+    if engine.replace_variables(text, variables) != legacy_replace_variables(text, variables):
+        mismatches += 1
+check(f"500 случайных шаблонов: расхождений {mismatches}", mismatches == 0)
+print()
+
+print("[2] Отличия, исправленные намеренно...")
+check("значение с '\\' вставляется как есть (re.sub его искажал)",
+      engine.replace_variables('{{path}}', {'path': 'C:\\new\\table'}) == 'C:\\new\\table')
+check("{{var}} внутри значения повторно не заменяется",
+      engine.replace_variables('{{a}} {{b}}', {'a': '{{b}}', 'b': 'B'}) == '{{b}} B')
+check("ключ с '.' - только точное совпадение (не regex)",
+      engine.replace_variables('{{a.b}} {{axb}}', {'a.b': 1}) == '1 {{axb}}')
+print()
+
+print("[3] Поиск и проверка переменных (только \\w+)...")
+text = '{{email}} {{First Name}} {{email}} {{zip}}'
+check("find_variables: уникальные \\w+ в порядке появления", engine.find_variables(text) == ['email', 'zip'])
+check("validate_variables: недостающие", engine.validate_variables(text, ['email']) == (False, ['zip']))
+check("get_variable_usage_count", engine.get_variable_usage_count(text) == {'email': 2, 'zip': 1})
+print()
+
+print("[4] Разбор один раз, рендер пачкой...")
+check("compile_template кеширует по тексту", compile_template(text) is compile_template(text))
+template = CompiledTemplate('Hi {{name}}!')
+rows = [{'name': 'A'}, {'name': 'B'}, {}]
+check("render_many по строкам", template.render_many(rows) == ['Hi A!', 'Hi B!', 'Hi {{name}}!'])
+check("replace_variables_batch = render для каждой строки",
+      engine.replace_variables_batch('Hi {{name}}!', rows) == [engine.replace_variables('Hi {{name}}!', row) for row in rows])
+check("шаблон без переменных", CompiledTemplate('static').render_many([{}, {}]) == ['static', 'static'])
+print()
+
+print("=" * 80)
+success = all(results)
+print("✓ ТЕСТ ПРОЙДЕН!" if success else f"✗ ТЕСТ ПРОВАЛЕН: {results.count(False)} проверок")
+print("=" * 80)
+sys.exit(0 if success else 1)